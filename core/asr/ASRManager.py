@@ -1,3 +1,4 @@
+import os
 from importlib import import_module, reload
 from pathlib import Path
 from typing import Dict
@@ -8,6 +9,7 @@ from langdetect import detect
 
 from core.asr.model import Asr
 from core.asr.model.ASRResult import ASRResult
+from core.asr.model.AsrPool import AsrPool
 from core.asr.model.Recorder import Recorder
 from core.base.model.Manager import Manager
 from core.commons import constants
@@ -15,12 +17,16 @@ from core.dialog.model.DialogSession import DialogSession
 
 
 class ASRManager(Manager):
+
+	START_DEPENDENCIES = ['AudioManager', 'MqttManager', 'InternetManager', 'LanguageManager']
+
 	NAME = 'ASRManager'
 
 
 	def __init__(self):
 		super().__init__(self.NAME)
 		self._asr = None
+		self._pool = AsrPool(list())
 		self._streams: Dict[str, Recorder] = dict()
 		self._translator = Translator()
 		self._usingFallback = False
@@ -29,16 +35,21 @@ class ASRManager(Manager):
 	def onStart(self):
 		super().onStart()
 		self._startASREngine()
+		self._startDecoderPool()
 
 
 	def onStop(self):
-		if self._asr:
+		for engine in self._pool.engines:
+			engine.onStop()
+
+		if self._asr and self._asr not in self._pool.engines:
 			self._asr.onStop()
 
 
 	def restartEngine(self):
-		self._asr.onStop()
+		self.onStop()
 		self._startASREngine()
+		self._startDecoderPool()
 
 
 	def _startASREngine(self, forceAsr = None):
@@ -98,11 +109,49 @@ class ASRManager(Manager):
 			self._startASREngine(forceAsr=fallback)
 
 
+	def _startDecoderPool(self):
+		"""
+		Starts more instances of the Asr engine, so that many devices can be decoded at the same time
+		"""
+		engines = [self._asr] if self._asr else list()
+
+		if self._asr and self._asr.POOLABLE:
+			try:
+				size = int(self.ConfigManager.getAliceConfigByName('asrDecoders') or 1)
+			except ValueError:
+				size = 1
+
+			size = max(1, min(size, os.cpu_count() or 1))
+			while len(engines) < size:
+				try:
+					engine = type(self._asr)()
+					engine.onStart()
+					engines.append(engine)
+				except Exception as e:
+					self.logWarning(f'Failed starting another Asr decoder, running with {len(engines)}: {e}')
+					break
+
+		try:
+			maxWaiting = int(self.ConfigManager.getAliceConfigByName('asrDecodersQueue') or 0)
+			waitTimeout = int(self.ConfigManager.getAliceConfigByName('asrTimeout') or 10)
+		except ValueError:
+			maxWaiting, waitTimeout = 0, 10
+
+		self._pool = AsrPool(engines, maxWaiting=maxWaiting, waitTimeout=waitTimeout)
+		if len(engines) > 1:
+			self.logInfo(f'Started **{len(engines)}** Asr decoders')
+
+
 	@property
 	def asr(self) -> Asr:
 		return self._asr
 
 
+	@property
+	def pool(self) -> AsrPool:
+		return self._pool
+
+
 	def onInternetConnected(self):
 		if self.ConfigManager.getAliceConfigByName('stayCompletlyOffline') or self.ConfigManager.getAliceConfigByName('keepASROffline') or \
 				self.ConfigManager.getAliceConfigByName('asrFallback') == self.ConfigManager.getAliceConfigByName('asr'):
@@ -120,7 +169,10 @@ class ASRManager(Manager):
 
 
 	def onStartListening(self, session: DialogSession):
-		self._asr.onStartListening(session)
+		# Audio is buffered from now on, even if the session has to wait for a free decoder
+		recorder = Recorder(self.ThreadManager.newEvent(f'asrTimeout_{session.deviceUid}'), session.user, session.deviceUid)
+		recorder.startRecording()
+		self.addRecorder(session.deviceUid, recorder)
 		self.ThreadManager.newThread(name=f'streamdecode_{session.deviceUid}', target=self.decodeStream, args=[session])
 
 
@@ -135,8 +187,40 @@ class ASRManager(Manager):
 		self.logDebug(f'Capturing {text}')
 
 
+	def sessionRecorder(self, session: DialogSession) -> Recorder:
+		"""
+		Returns the recorder buffering the session audio, creating it if needed
+		"""
+		recorder = self._streams.get(session.deviceUid)
+		if not recorder:
+			recorder = Recorder(self.ThreadManager.newEvent(f'asrTimeout_{session.deviceUid}'), session.user, session.deviceUid)
+			self.addRecorder(session.deviceUid, recorder)
+
+		return recorder
+
+
 	def decodeStream(self, session: DialogSession):
-		result: ASRResult = self._asr.decodeStream(session)
+		asr = self._pool.acquire(session.deviceUid)
+		if not asr:
+			self.logWarning(f'All Asr decoders are busy, could not decode speech from device **{session.deviceUid}**')
+			recorder = self._streams.pop(session.deviceUid, None)
+			if recorder:
+				recorder.stopRecording()
+			self._notCaptured(session)
+			return
+
+		try:
+			if session.hasEnded:
+				return
+
+			asr.onStartListening(session)
+			result: ASRResult = asr.decodeStream(session)
+			recorder = asr.recorder
+		finally:
+			self._pool.release(asr)
+
+		if result and recorder and recorder.recordedSeconds:
+			self.MetricsManager.observe('alice_asr_real_time_factor', result.processingTime / recorder.recordedSeconds, asr.NAME)
 
 		if result and result.text:
 			if session.hasEnded:
@@ -153,12 +237,16 @@ class ASRManager(Manager):
 
 			self.MqttManager.publish(topic=constants.TOPIC_TEXT_CAPTURED, payload={'sessionId': session.sessionId, 'text': text, 'device': session.deviceUid, 'likelihood': result.likelihood, 'seconds': result.processingTime})
 		else:
-			self.MqttManager.playSound(
-				soundFilename='error',
-				location=Path(f'system/sounds/{self.LanguageManager.activeLanguage}'),
-				deviceUid=session.deviceUid,
-				sessionId=session.sessionId
-			)
+			self._notCaptured(session)
+
+
+	def _notCaptured(self, session: DialogSession):
+		self.MqttManager.playSound(
+			soundFilename='error',
+			location=Path(f'system/sounds/{self.LanguageManager.activeLanguage}'),
+			deviceUid=session.deviceUid,
+			sessionId=session.sessionId
+		)
 
 
 	def onAudioFrame(self, message: mqtt.MQTTMessage, deviceUid: str):
@@ -177,25 +265,32 @@ class ASRManager(Manager):
 
 
 	def onSessionEnded(self, session: DialogSession):
-		if not self._asr or session.deviceUid not in self._streams or not self._streams[session.deviceUid].isRecording:
+		if session.deviceUid not in self._streams or not self._streams[session.deviceUid].isRecording:
 			return
 
-		self._asr.end()
+		asr = self._pool.engineFor(session.deviceUid)
+		if asr:
+			asr.end()
+		else:
+			self._streams[session.deviceUid].stopRecording()
+
 		self._streams.pop(session.deviceUid, None)
 
 
 	def onVadUp(self, deviceUid: str):
-		if not self._asr or deviceUid not in self._streams or not self._streams[deviceUid].isRecording:
+		asr = self._pool.engineFor(deviceUid)
+		if not asr or deviceUid not in self._streams or not self._streams[deviceUid].isRecording:
 			return
 
-		self._asr.onVadUp()
+		asr.onVadUp()
 
 
 	def onVadDown(self, deviceUid: str):
-		if not self._asr or deviceUid not in self._streams or not self._streams[deviceUid].isRecording:
+		asr = self._pool.engineFor(deviceUid)
+		if not asr or deviceUid not in self._streams or not self._streams[deviceUid].isRecording:
 			return
 
-		self._asr.onVadDown()
+		asr.onVadDown()
 
 
 	def addRecorder(self, deviceUid: str, recorder: Recorder):
@@ -1,26 +1,29 @@
 import json
-import threading
 from pathlib import Path
 from typing import Optional
 
+from core.asr.model.PartialScheduler import PartialScheduler
 from core.asr.model.Recorder import Recorder
 from core.base.model.ProjectAliceObject import ProjectAliceObject
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
 from core.util.model.AliceEvent import AliceEvent
+from core.util.model.ThreadTimer import ThreadTimer
 
 
 class Asr(ProjectAliceObject):
 	NAME = 'Generic Asr'
 	DEPENDENCIES = dict()
+	POOLABLE = True  # If more than one instance of this Asr can decode at the same time
 
 
 	def __init__(self):
 		self._capableOfArbitraryCapture = False
 		self._isOnlineASR = False
 		self._timeout: AliceEvent = self.ThreadManager.newEvent('asrTimeout')
-		self._timeoutTimer: Optional[threading.Timer] = None
+		self._timeoutTimer: Optional[ThreadTimer] = None
 		self._recorder: Optional[Recorder] = None
+		self._partials = PartialScheduler(mode='off')
 		super().__init__()
 
 
@@ -34,6 +37,11 @@ class Asr(ProjectAliceObject):
 		return self._isOnlineASR
 
 
+	@property
+	def recorder(self) -> Optional[Recorder]:
+		return self._recorder
+
+
 	def onStart(self):
 		self.logInfo(f'Starting {self.NAME}')
 
@@ -49,8 +57,27 @@ class Asr(ProjectAliceObject):
 
 
 	def decodeStream(self, session: DialogSession):
+		# The recorder and its timeout belong to the session, pooled engines decode one session after the other
+		self._recorder = self.ASRManager.sessionRecorder(session)
+		self._timeout = self._recorder.timeoutFlag
 		self._timeout.clear()
 		self._timeoutTimer = self.ThreadManager.newTimer(interval=int(self.ConfigManager.getAliceConfigByName('asrTimeout')), func=self.timeout)
+		self._partials = self.newPartialScheduler()
+
+
+	def newPartialScheduler(self) -> PartialScheduler:
+		try:
+			interval = int(self.ConfigManager.getAliceConfigByName('asrPartialsInterval') or 500) / 1000
+			budget = int(self.ConfigManager.getAliceConfigByName('asrPartialsBudget') or 10) / 100
+		except ValueError:
+			interval, budget = 0.5, 0.1
+
+		return PartialScheduler(
+			mode=self.ConfigManager.getAliceConfigByName('asrPartials') or 'budget',
+			interval=interval,
+			budget=budget,
+			sampleRate=self.AudioServer.SAMPLERATE
+		)
 
 
 	def end(self):
@@ -0,0 +1,89 @@
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+from core.asr.model.Asr import Asr
+
+
+class AsrPool:
+	"""
+	Started Asr engines, each one decoding a single session at a time, so that several devices can be listened to at once.
+	When all engines are busy, sessions wait for one to be released, up to a limited number of waiting sessions and a limited time.
+	"""
+
+	def __init__(self, engines: List[Asr], maxWaiting: int = 4, waitTimeout: float = 10):
+		"""
+		:param engines: list of started Asr engines
+		:param maxWaiting: int, how many sessions can wait for an engine, further sessions are rejected right away
+		:param waitTimeout: float, how long, in seconds, a session waits for an engine before being rejected
+		"""
+		self._engines = list(engines)
+		self._free = deque(self._engines)
+		self._leases: Dict[str, Asr] = dict()
+		self._maxWaiting = max(0, maxWaiting)
+		self._waitTimeout = waitTimeout
+		self._waiting = 0
+		self._rejected = 0
+		self._condition = threading.Condition()
+
+
+	def acquire(self, deviceUid: str) -> Optional[Asr]:
+		"""
+		Leases an engine to the given device, waiting for one if they are all busy
+		:param deviceUid: str
+		:return: Asr, None if no engine could be leased
+		"""
+		with self._condition:
+			if not self._free:
+				if self._waiting >= self._maxWaiting:
+					self._rejected += 1
+					return None
+
+				self._waiting += 1
+				try:
+					self._condition.wait_for(lambda: self._free, timeout=self._waitTimeout)
+				finally:
+					self._waiting -= 1
+
+				if not self._free:
+					self._rejected += 1
+					return None
+
+			engine = self._free.popleft()
+			self._leases[deviceUid] = engine
+			return engine
+
+
+	def release(self, engine: Asr):
+		with self._condition:
+			if engine in self._free:
+				return
+
+			for deviceUid, leased in list(self._leases.items()):
+				if leased is engine:
+					self._leases.pop(deviceUid)
+
+			self._free.append(engine)
+			self._condition.notify()
+
+
+	def engineFor(self, deviceUid: str) -> Optional[Asr]:
+		"""
+		Returns the engine leased to the given device, if any
+		"""
+		return self._leases.get(deviceUid)
+
+
+	@property
+	def engines(self) -> List[Asr]:
+		return self._engines
+
+
+	@property
+	def stats(self) -> dict:
+		return {
+			'engines' : len(self._engines),
+			'busy'    : len(self._engines) - len(self._free),
+			'waiting' : self._waiting,
+			'rejected': self._rejected
+		}
@@ -5,7 +5,6 @@ import numpy as np
 
 from core.asr.model.ASRResult import ASRResult
 from core.asr.model.Asr import Asr
-from core.asr.model.Recorder import Recorder
 from core.dialog.model.DialogSession import DialogSession
 from core.util.Stopwatch import Stopwatch
 
@@ -93,13 +92,9 @@ class DeepSpeechAsr(Asr):
 
 	def decodeStream(self, session: DialogSession) -> Optional[ASRResult]:
 		super().decodeStream(session)
-		result = None
-		previous = ''
 
 		with Stopwatch() as processingTime:
-			with Recorder(self._timeout, session.user, session.deviceUid) as recorder:
-				self.ASRManager.addRecorder(session.deviceUid, recorder)
-				self._recorder = recorder
+			with self._recorder as recorder:
 				streamContext = self._model.createStream()
 				for chunk in recorder:
 					if not chunk:
@@ -107,10 +102,13 @@ class DeepSpeechAsr(Asr):
 
 					self._model.feedAudioContent(streamContext, np.frombuffer(chunk, np.int16))
 
-					result = self._model.intermediateDecode(streamContext)
-					if result and result != previous:
-						previous = result
-						self.partialTextCaptured(session=session, text=result, likelihood=1, seconds=0)
+					# Each intermediate decode runs the beam search over the whole utterance, hence the throttling
+					if self._partials.feed(chunk):
+						with self._partials.measure():
+							partial = self._model.intermediateDecode(streamContext)
+
+						if self._partials.changed(partial):
+							self.partialTextCaptured(session=session, text=partial, likelihood=1, seconds=0)
 
 			text = self._model.finishStream(streamContext)
 			self._triggerFlag.clear()
@@ -121,7 +119,7 @@ class DeepSpeechAsr(Asr):
 			session=session,
 			likelihood=1.0,
 			processingTime=processingTime.time
-		) if result else None
+		) if text else None
 
 
 	def _checkResponses(self, session: DialogSession, responses: Generator) -> Optional[tuple]:
@@ -6,7 +6,6 @@ from typing import Generator, Optional
 
 from core.asr.model.ASRResult import ASRResult
 from core.asr.model.Asr import Asr
-from core.asr.model.Recorder import Recorder
 from core.dialog.model.DialogSession import DialogSession
 from core.util.Stopwatch import Stopwatch
 
@@ -65,12 +64,9 @@ class GoogleAsr(Asr):
 	def decodeStream(self, session: DialogSession) -> Optional[ASRResult]:
 		super().decodeStream(session)
 
-		recorder = Recorder(self._timeout, session.user, session.deviceUid)
-		self.ASRManager.addRecorder(session.deviceUid, recorder)
-		self._recorder = recorder
 		result = None
 		with Stopwatch() as processingTime:
-			with recorder as stream:
+			with self._recorder as stream:
 				audioStream = stream.audioStream()
 				# noinspection PyUnresolvedReferences
 				try:
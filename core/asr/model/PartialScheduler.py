@@ -0,0 +1,115 @@
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class PartialScheduler:
+	"""
+	Decides when an Asr should compute a partial hypothesis, instead of doing it for every audio chunk.
+	Times are counted in seconds of audio fed, so that a slow device doesn't end up decoding more partials.
+	One scheduler serves one utterance, Asr.decodeStream creates a new one, with the current settings, for every session.
+
+	Modes:
+		- interval: at most one partial every interval
+		- budget: same, and only while partials took less than the given share of the audio duration to decode
+		- pause: one partial whenever the user pauses after speaking
+		- off: no partials
+	"""
+
+	MODES = ['interval', 'budget', 'pause', 'off']
+
+	def __init__(self, mode: str = 'interval', interval: float = 0.5, budget: float = 0.1, sampleRate: int = 16000, silenceThreshold: int = 500):
+		"""
+		:param mode: str, one of MODES, defaults to interval if unknown
+		:param interval: float, minimum seconds of audio between two partials
+		:param budget: float, the share of the audio duration partials are allowed to take to decode, 0.1 for 10%
+		:param sampleRate: int, the sample rate of the 16 bits mono audio fed
+		:param silenceThreshold: int, the rms under which a chunk is considered silent, for pause mode
+		"""
+		self._mode = mode if mode in self.MODES else 'interval'
+		self._bytesPerSecond = sampleRate * 2
+		self._interval = int(max(0.0, interval) * self._bytesPerSecond)
+		self._budget = max(0.0, budget)
+		self._silenceThreshold = silenceThreshold
+
+		# Audio is counted in bytes, summing up chunk durations would drift
+		self._audioBytes = 0
+		self._lastPartial = 0
+		self._decodeSeconds = 0.0
+		self._spokeSinceLastPartial = False
+		self._lastText = ''
+		self._partials = 0
+		self._published = 0
+
+
+	def feed(self, chunk: bytes) -> bool:
+		"""
+		Accounts for an audio chunk fed to the decoder
+		:param chunk: bytes, 16 bits mono audio
+		:return: bool, whether a partial hypothesis should be computed now
+		"""
+		self._audioBytes += len(chunk)
+
+		if self._mode == 'off':
+			return False
+
+		if self._mode == 'pause':
+			if not self.isSilent(chunk):
+				self._spokeSinceLastPartial = True
+				return False
+
+			due = self._spokeSinceLastPartial
+		else:
+			due = self._audioBytes - self._lastPartial >= self._interval
+			if due and self._mode == 'budget':
+				due = self._decodeSeconds <= self._budget * self._audioBytes / self._bytesPerSecond
+
+		if due:
+			self._lastPartial = self._audioBytes
+			self._spokeSinceLastPartial = False
+			self._partials += 1
+
+		return due
+
+
+	@contextmanager
+	def measure(self):
+		"""
+		Times a partial decoding, counted against the budget
+		"""
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self._decodeSeconds += time.perf_counter() - start
+
+
+	def changed(self, text: str) -> bool:
+		"""
+		Whether a partial hypothesis differs from the last one published, in which case it's remembered as published
+		"""
+		if not text or text == self._lastText:
+			return False
+
+		self._lastText = text
+		self._published += 1
+		return True
+
+
+	def isSilent(self, chunk: bytes) -> bool:
+		samples = np.frombuffer(chunk[:len(chunk) - len(chunk) % 2], np.int16)
+		if not samples.size:
+			return True
+
+		return np.sqrt(np.mean(samples.astype(np.float32) ** 2)) < self._silenceThreshold
+
+
+	@property
+	def stats(self) -> dict:
+		return {
+			'audioSeconds' : round(self._audioBytes / self._bytesPerSecond, 3),
+			'decodeSeconds': round(self._decodeSeconds, 3),
+			'partials'     : self._partials,
+			'published'    : self._published
+		}
@@ -6,7 +6,6 @@ import tarfile
 
 from core.asr.model.ASRResult import ASRResult
 from core.asr.model.Asr import Asr
-from core.asr.model.Recorder import Recorder
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
 from core.util.Stopwatch import Stopwatch
@@ -110,24 +109,22 @@ class PocketSphinxAsr(Asr):
 		super().decodeStream(session)
 
 		result = None
-		counter = 0
 		with Stopwatch() as processingTime:
-			with Recorder(self._timeout, session.user, session.deviceUid) as recorder:
-				self.ASRManager.addRecorder(session.deviceUid, recorder)
-				self._recorder = recorder
+			with self._recorder as recorder:
 				self._decoder.start_utt()
 				inSpeech = False
 				for chunk in recorder:
 					if self._timeout.isSet():
 						break
 
-					self._decoder.process_raw(chunk, False, False)
-					hypothesis = self._decoder.hyp()
-					if hypothesis:
-						counter += 1
-						if counter == 10:
+					self._decoder.process_raw(bytes(chunk), False, False)
+					if self._partials.feed(chunk):
+						with self._partials.measure():
+							hypothesis = self._decoder.hyp()
+
+						if hypothesis and self._partials.changed(hypothesis.hypstr):
 							self.partialTextCaptured(session, hypothesis.hypstr, hypothesis.prob, processingTime.time)
-							counter = 0
+
 					if self._decoder.get_in_speech() != inSpeech:
 						inSpeech = self._decoder.get_in_speech()
 						if not inSpeech:
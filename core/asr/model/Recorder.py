@@ -1,12 +1,11 @@
-import io
 import queue
-import wave
 from typing import Optional
 
 import paho.mqtt.client as mqtt
 
 from core.base.model.ProjectAliceObject import ProjectAliceObject
 from core.dialog.model.DialogSession import DialogSession
+from core.server.model.AudioFrame import AudioFrame
 from core.util.model.AliceEvent import AliceEvent
 from core.voice.WakewordRecorder import WakewordRecorderState
 
@@ -20,6 +19,7 @@ class Recorder(ProjectAliceObject):
 		self._recording = False
 		self._timeoutFlag = timeoutFlag
 		self._buffer = queue.Queue()
+		self._recordedSeconds = 0.0
 
 
 	def __enter__(self):
@@ -36,6 +36,16 @@ class Recorder(ProjectAliceObject):
 		return self._recording
 
 
+	@property
+	def timeoutFlag(self) -> AliceEvent:
+		return self._timeoutFlag
+
+
+	@property
+	def recordedSeconds(self) -> float:
+		return self._recordedSeconds
+
+
 	def onSessionError(self, session: DialogSession):
 		self.stopRecording()
 
@@ -50,20 +60,19 @@ class Recorder(ProjectAliceObject):
 
 
 	def onAudioFrame(self, message: mqtt.MQTTMessage, deviceUid: str):
-		with io.BytesIO(message.payload) as buffer:
-			try:
-				with wave.open(buffer, 'rb') as wav:
-					frame = wav.readframes(512)
-					while frame:
-						self._buffer.put(frame)
+		try:
+			frame, audioFormat = AudioFrame.decode(message.payload)
+			if not frame:
+				return
 
-						if self.ConfigManager.getAliceConfigByName('recordAudioAfterWakeword') or self.WakewordRecorder.state == WakewordRecorderState.RECORDING:
-							self.AudioServer.recordFrame(deviceUid, frame)
+			self._buffer.put(frame)
+			self._recordedSeconds += len(frame) / (audioFormat.sampleRate * audioFormat.channels * audioFormat.sampleWidth)
 
-						frame = wav.readframes(512)
+			if self.ConfigManager.getAliceConfigByName('recordAudioAfterWakeword') or self.WakewordRecorder.state == WakewordRecorderState.RECORDING:
+				self.AudioServer.recordFrame(deviceUid, frame)
 
-			except Exception as e:
-				self.logError(f'Error recording user speech: {e}')
+		except Exception as e:
+			self.logError(f'Error recording user speech: {e}')
 
 
 	def __iter__(self):
@@ -11,6 +11,7 @@ from core.dialog.model.DialogSession import DialogSession
 class SnipsAsr(Asr):
 
 	NAME = 'Snips Asr'
+	POOLABLE = False
 	DEPENDENCIES = {
 		'internal': {
 			'snips-kaldi-atlas': 'system/snips/snips-kaldi-atlas_0.26.1_armhf.deb',
@@ -4,22 +4,27 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Generator
 
+from core.base.model.AssistantFragments import AssistantFragments
 from core.base.model.Manager import Manager
 from core.base.model.StateType import StateType
 
 
 class AssistantManager(Manager):
+
+	START_DEPENDENCIES = ['SkillManager', 'DialogTemplateManager', 'NluManager']
+
 	STATE = 'projectalice.core.training'
 
 	def __init__(self):
 		super().__init__()
 
+		self._fragments = AssistantFragments(Path(self.Commons.rootDir(), 'var/cache/assistant'), self.Commons.fileChecksum)
 		self._assistantPath = Path(self.Commons.rootDir(), f'assistant/assistant.json')
 		if not self._assistantPath.exists():
 			self.logInfo('Assistant not found, generating')
 			self.linkAssistant()
 			self._assistantPath = Path(self.Commons.rootDir(), f'assistant/assistant.json')
-			self._assistantPath.write_text(json.dumps(self.newAssistant()))
+			self.clearAssistant()
 
 
 	def onStart(self):
@@ -28,7 +33,9 @@ class AssistantManager(Manager):
 
 
 	def clearAssistant(self):
+		# The signature belongs to the assistant file, an empty assistant has to be trained again
 		self._assistantPath.write_text(json.dumps(self.newAssistant()))
+		self._fragments.writeSignature(self.LanguageManager.activeLanguage)
 
 
 	def checkAssistant(self, forceRetrain: bool = False):
@@ -36,6 +43,7 @@ class AssistantManager(Manager):
 
 		if forceRetrain:
 			self.logInfo('Forced assistant training')
+			self._fragments.drop()
 			self.train()
 			self.DialogTemplateManager.clearCache(rebuild=False)
 			self.DialogTemplateManager.train()
@@ -43,6 +51,7 @@ class AssistantManager(Manager):
 			self.NluManager.train()
 		elif not self._assistantPath.exists():
 			self.logInfo('Assistant not found')
+			self._fragments.writeSignature(self.LanguageManager.activeLanguage)
 			self.train()
 		elif not self.checkConsistency():
 			self.logInfo('Assistant is not consistent, it needs training')
@@ -56,72 +65,44 @@ class AssistantManager(Manager):
 
 
 	def checkConsistency(self) -> bool:
-		existingIntents: Dict[str, dict] = dict()
-		existingSlots: Dict[str, set] = dict()
+		"""
+		The assistant is consistent if it was trained with the dialog templates the skills have now
+		"""
+		fragments = self.loadFragments()
+		self._registerIntents(fragments)
+
+		passed = self._fragments.readSignature(self.LanguageManager.activeLanguage) == self._fragments.signature(fragments)
+		if passed:
+			self.logInfo('Assistant seems consistent')
+		else:
+			self.logInfo('Found some inconsistencies in assistant')
+
+		return passed
+
 
+	def loadFragments(self) -> Dict[str, dict]:
+		"""
+		The assistant fragment of every working skill, only the changed dialog templates are parsed
+		:return: dict, skill name to its fragment
+		"""
+		fragments = dict()
+		language = self.LanguageManager.activeLanguage
 		for skillResource in self.skillResource():
-			data = json.loads(skillResource.read_text())
+			fragment = self._fragments.load(skillName=skillResource.parent.parent.name, language=language, file=skillResource)
+			if fragment:
+				fragments[skillResource.parent.parent.name] = fragment
 
-			if 'intents' not in data:
-				continue
+		return fragments
 
-			for intent in data['intents']:
-				existingIntents[intent['name']] = intent
 
+	def _registerIntents(self, fragments: Dict[str, dict]):
+		for fragment in fragments.values():
+			for intent in fragment['intents']:
 				if not intent['enabledByDefault']:
 					self.DialogManager.addDisabledByDefaultIntent(intent['name'])
 				else:
 					self.DialogManager.addEnabledByDefaultIntent(intent['name'])
 
-				if 'slots' not in intent or not intent['slots']:
-					continue
-
-				for slot in intent['slots']:
-					existingSlots.setdefault(intent['name'], set())
-					existingSlots[intent['name']].add(slot['name'])
-
-		declaredIntents = dict()
-		declaredSlots = dict()
-		passed = True
-		with self._assistantPath.open() as fp:
-			data = json.load(fp)
-			for intent in data['intents']:
-				declaredIntents[intent['name']] = intent
-
-				if intent['name'] not in existingIntents:
-					passed = False
-
-				for slot in intent['slots']:
-					declaredSlots.setdefault(intent['name'], dict())
-					declaredSlots[intent['name']][slot['name']] = slot
-
-					if intent['name'] not in existingSlots or slot['name'] not in existingSlots[intent['name']]:
-						passed = False
-
-		for intentName, intent in existingIntents.items():
-			if intentName not in declaredIntents:
-				passed = False
-				break
-
-			if 'slots' not in intent or not intent['slots']:
-				continue
-
-			for slot in intent['slots']:
-				if intentName not in declaredSlots:
-					passed = False
-					break
-
-				if slot['name'] not in declaredSlots[intentName]:
-					passed = False
-					break
-
-		if passed:
-			self.logInfo('Assistant seems consistent')
-		else:
-			self.logInfo('Found some inconsistencies in assistant')
-
-		return passed
-
 
 	def train(self):
 		self.logInfo('Training assistant')
@@ -136,89 +117,30 @@ class AssistantManager(Manager):
 		self.StateManager.setState(self.STATE, newState=StateType.RUNNING)
 
 		try:
+			fragments = self.loadFragments()
+			self._registerIntents(fragments)
+
+			intents, duplicates = self._fragments.assemble(fragments)
+			for intentName in duplicates:
+				self.logWarning(f'Intent "{intentName}" is duplicated')
+
 			assistant = self.newAssistant()
-			intents = dict()
-			slots = dict()
-			randoms = set()
-
-			# When slots of the same entity id (type) wear the same name, their id is identical, so we need to
-			# keep a track about entity ids, names and type
-			entityVSType = dict()
-
-			for skillResource in self.skillResource():
-
-				with skillResource.open() as fp:
-					data = json.load(fp)
-
-				if 'intents' not in data:
-					self.logDebug(f'Skill has no intent')
-					continue
-
-				for intent in data['intents']:
-					if intent['name'] in intents:
-						self.logWarning(f'Intent "{intent["name"]}" is duplicated')
-						continue
-
-					if not intent['enabledByDefault']:
-						self.DialogManager.addDisabledByDefaultIntent(intent['name'])
-					else:
-						self.DialogManager.addEnabledByDefaultIntent(intent['name'])
-
-					intents[intent['name']] = {
-						'id'              : intent['name'],
-						'type'            : 'registry',
-						'version'         : '0.1.0',
-						'language'        : self.LanguageManager.activeLanguage,
-						'slots'           : list(),
-						'name'            : intent['name'],
-						'enabledByDefault': intent['enabledByDefault']
-					}
-
-					if 'slots' not in intent or not intent['slots']:
-						continue
-
-					for slot in intent['slots']:
-						rand9 = self.Commons.randomString(9)
-						while rand9 in randoms:
-							rand9 = self.Commons.randomString(9)
-						randoms.add(rand9)
-
-						rand11 = self.Commons.randomString(11)
-						while rand11 in randoms:
-							rand11 = self.Commons.randomString(11)
-						randoms.add(rand11)
-
-						if slot['type'] not in slots:
-							intentSlot = {
-								'name'           : slot['name'],
-								'id'             : rand9,
-								'entityId'       : f'entity_{rand11}',
-								'missingQuestion': slot['missingQuestion'],
-								'required'       : slot['required']
-							}
-							slots[slot['type']] = intentSlot
-							entityVSType[f'{slot["type"]}_{slot["name"]}'] = f'{rand9}'
-						else:
-
-							# Check if a slot with same type and name already exists and use its id else use the new random
-							slotId = entityVSType.get(f'{slot["type"]}_{slot["name"]}', rand9)
-
-							intentSlot = {
-								'name'           : slot['name'],
-								'id'             : slotId,
-								'entityId'       : slots[slot['type']]['entityId'],
-								'missingQuestion': slot['missingQuestion'],
-								'required'       : slot['required']
-							}
-
-						intents[intent['name']]['slots'].append(intentSlot)
-
-			assistant['intents'] = [intent for intent in intents.values()]
+			assistant['intents'] = intents
+
+			# Keep the assistant identity, so that the same skills always give the same assistant
+			try:
+				existing = json.loads(self._assistantPath.read_text())
+				assistant['id'] = existing.get('id', assistant['id'])
+				assistant['createdAt'] = existing.get('createdAt', assistant['createdAt'])
+			except (OSError, ValueError):
+				pass
 
 			self._assistantPath.write_text(json.dumps(assistant, ensure_ascii=False, indent='\t', sort_keys=True))
+			self._fragments.writeSignature(self.LanguageManager.activeLanguage, self._fragments.signature(fragments))
 			self.linkAssistant()
 
 			self.broadcast(method='snipsAssistantInstalled', exceptions=[self.name], propagateToSkills=True)
+			slots = {slot['entityId'] for intent in intents for slot in intent['slots']}
 			self.logInfo(f'Assistant trained with {len(intents)} intents and a total of {len(slots)} slots')
 		except Exception as e:
 			self.broadcast(method='snipsAssistantFailedTraining', exceptions=[self.name], propagateToSkills=True)
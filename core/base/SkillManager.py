@@ -7,7 +7,7 @@ import sqlite3
 import threading
 import traceback
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 
 import requests
 import typing
@@ -16,7 +16,11 @@ from core.ProjectAliceExceptions import AccessLevelTooLow, GithubNotFound, Githu
 from core.base.SuperManager import SuperManager
 from core.base.model import Intent
 from core.base.model.AliceSkill import AliceSkill
+from core.base.model.EventRegistry import EventRegistry
 from core.base.model.FailedAliceSkill import FailedAliceSkill
+from core.base.model.IntentRouter import IntentRouter
+from core.base.model.LazyAliceSkill import LazyAliceSkill
+from core.base.model.SkillManifest import SkillManifest
 from core.base.model.GithubCloner import GithubCloner
 from core.base.model.Manager import Manager
 from core.base.model.Version import Version
@@ -27,6 +31,31 @@ from core.util.Decorators import IfSetting, Online
 
 class SkillManager(Manager):
 
+	# Skills use about every manager, so they are started once everything else is
+	START_DEPENDENCIES = [
+		'LanguageManager',
+		'LocationManager',
+		'AudioManager',
+		'InternetManager',
+		'UserManager',
+		'MqttManager',
+		'ThreadManager',
+		'TimeManager',
+		'MultiIntentManager',
+		'TelemetryManager',
+		'MetricsManager',
+		'AsrManager',
+		'TtsManager',
+		'WakewordManager',
+		'WebUiManager',
+		'ApiManager',
+		'SkillStoreManager',
+		'AliceWatchManager',
+		'DialogManager',
+		'TalkManager',
+		'NluManager'
+	]
+
 	NEEDED_SKILLS = [
 		'AliceCore',
 		'ContextSensitive',
@@ -57,6 +86,16 @@ class SkillManager(Manager):
 		self._deactivatedSkills: Dict[str, AliceSkill] = dict()
 		self._failedSkills: Dict[str, FailedAliceSkill] = dict()
 
+		# Event name: handlers of the active skills, rebuilt whenever the active skills change
+		self._eventRegistry = EventRegistry(fallback='onEvent')
+
+		# Intent topic: skills supporting it, rebuilt on first dispatch after the active skills or their intents change
+		self._intentRouter = IntentRouter(lambda: self._activeSkills)
+
+		# Skills not needed at boot can be imported on their first intent, see LazyAliceSkill
+		self._skillManifest = SkillManifest(self.Commons.rootDir())
+		self._lazyLoadLock = threading.RLock()
+
 		self._postBootSkillActions = dict()
 
 
@@ -240,9 +279,14 @@ class SkillManager(Manager):
 
 
 	def dispatchMessage(self, session: DialogSession) -> bool:
-		for skillName, skillInstance in self._activeSkills.items():
+		for skillName, skillInstance, intent in self._intentRouter.route(session.message.topic):
 			try:
-				consumed = skillInstance.onMessageDispatch(session)
+				if not intent:
+					consumed = skillInstance.onMessageDispatch(session)
+				elif skillInstance.active:
+					consumed = skillInstance.dispatchIntent(session, intent)
+				else:
+					consumed = False
 			except AccessLevelTooLow:
 				# The command was recognized but required higher access level
 				return True
@@ -263,6 +307,10 @@ class SkillManager(Manager):
 				self.logDebug(f'The intent "{session.intentName.split("/")[-1]}" was consumed by {skillName}')
 				return True
 
+		if self.MultiIntentManager.isProcessing(session.sessionId):
+			self.MultiIntentManager.processNextIntent(session.sessionId)
+			return True
+
 		return False
 
 
@@ -287,7 +335,16 @@ class SkillManager(Manager):
 				if data['active']:
 					self.checkSkillConditions(self._skillList[skillName]['installer'])
 
-				skillInstance = self.instanciateSkill(skillName=skillName, reload=reload)
+				skillInstance = None
+				if not reload and skillName not in self.NEEDED_SKILLS and self.ConfigManager.getAliceConfigByName('lazySkillLoading'):
+					manifest = self._skillManifest.load(skillName, data['installer'])
+					if manifest and not manifest['eager']:
+						skillInstance = LazyAliceSkill(data['installer'], manifest)
+
+				if not skillInstance:
+					skillInstance = self.instanciateSkill(skillName=skillName, reload=reload)
+					self.updateSkillManifest(skillInstance)
+
 				if skillInstance:
 					if skillName in self.NEEDED_SKILLS:
 						skillInstance.required = True
@@ -312,6 +369,8 @@ class SkillManager(Manager):
 				self._failedSkills[skillName] = FailedAliceSkill(data['installer'])
 				continue
 
+		self.indexSkills()
+
 
 	# noinspection PyTypeChecker
 	def instanciateSkill(self, skillName: str, skillResource: str = '', reload: bool = False) -> AliceSkill:
@@ -364,6 +423,7 @@ class SkillManager(Manager):
 		supportedIntents = list(set(supportedIntents))
 
 		self._supportedIntents = supportedIntents
+		self.invalidateIntentRoutes()
 
 		self.logInfo(f'Skills started. {len(supportedIntents)} intents supported')
 
@@ -376,12 +436,14 @@ class SkillManager(Manager):
 			skillInstance = self.instanciateSkill(skillName=skillName)
 			if skillInstance:
 				self.activeSkills[skillName] = skillInstance
+				self.indexSkills()
 			else:
 				return dict()
 		elif skillName in self._failedSkills:
 			skillInstance = self.instanciateSkill(skillName=skillName)
 			if skillInstance:
 				self.activeSkills[skillName] = skillInstance
+				self.indexSkills()
 			else:
 				return dict()
 		else:
@@ -411,6 +473,7 @@ class SkillManager(Manager):
 				self._deactivatedSkills.pop(skillName, None)
 
 			self._failedSkills[skillName] = FailedAliceSkill(self._skillList[skillName]['installer'])
+			self.indexSkills()
 
 		return skillInstance.supportedIntents
 
@@ -442,30 +505,112 @@ class SkillManager(Manager):
 		if not method.startswith('on'):
 			method = f'on{method[0].capitalize() + method[1:]}'
 
-		for skillName, skillInstance in self._activeSkills.items():
+		# Audio frames are already off the network thread and must reach the skills in order
+		fanOut = method != 'onAudioFrame' and self.ConfigManager.getAliceConfigByName('asyncSkillBroadcast')
+
+		for skillName, skillInstance, func, isFallback in self._eventRegistry.handlers(method):
 
 			if filterOut and skillName in filterOut:
 				continue
 
-			try:
-				func = getattr(skillInstance, method, None)
-				if func:
-					func(**kwargs)
+			if self._activeSkills.get(skillName) is not skillInstance:
+				continue
+
+			if fanOut:
+				self.ThreadManager.submit('background', self._callSkillHandler, skillName, method, func, isFallback, kwargs)
+			else:
+				self._callSkillHandler(skillName, method, func, isFallback, kwargs)
+
+
+	def _callSkillHandler(self, skillName: str, method: str, func: Callable, isFallback: bool, kwargs: dict):
+		try:
+			if isFallback:
+				func(event=method, **kwargs)
+			else:
+				func(**kwargs)
+
+		except TypeError as e:
+			self.logWarning(f'Failed to broadcast event {method} to {skillName}: {e}')
+
+
+	def loadLazySkill(self, skillName: str) -> Optional[AliceSkill]:
+		"""
+		Imports a skill that was not loaded at boot, swaps it in place of its stand in and starts it if it was active
+		:param skillName: str
+		:return: the skill instance, None if it failed loading
+		"""
+		with self._lazyLoadLock:
+			placeholder = self.allWorkingSkills.get(skillName, None)
+			if not isinstance(placeholder, LazyAliceSkill):
+				return placeholder
+
+			self.logInfo(f'Loading skill **{skillName}** on first use')
+			skillInstance = self.instanciateSkill(skillName=skillName)
+
+			if not skillInstance:
+				self._activeSkills.pop(skillName, None)
+				self._deactivatedSkills.pop(skillName, None)
+				self._failedSkills[skillName] = FailedAliceSkill(self._skillList[skillName]['installer'])
+				self.indexSkills()
+				return None
+
+			skillInstance.required = placeholder.required
+			skillInstance.updateAvailable = placeholder.updateAvailable
+			self.updateSkillManifest(skillInstance)
+
+			if skillName not in self._activeSkills:
+				self._deactivatedSkills[skillName] = skillInstance
+				return skillInstance
+
+			self._activeSkills[skillName] = skillInstance
+			self.indexSkills()
+
+			if placeholder.active:
+				try:
+					skillInstance.onStart()
+					if self.ProjectAlice.isBooted:
+						skillInstance.onBooted()
+				except Exception as e:
+					self.logError(f'- Couldn\'t start skill "{skillName}". Error: {e}')
+					traceback.print_exc()
+
+			return skillInstance
 
-				func = getattr(skillInstance, 'onEvent', None)
-				if func:
-					func(event=method, **kwargs)
 
-			except TypeError as e:
-				self.logWarning(f'Failed to broadcast event {method} to {skillName}: {e}')
+	def updateSkillManifest(self, skillInstance: Optional[AliceSkill]):
+		if not skillInstance or not self.ConfigManager.getAliceConfigByName('lazySkillLoading'):
+			return
+
+		if self._skillManifest.load(skillInstance.name, {'version': skillInstance.version}):
+			return
+
+		try:
+			self._skillManifest.write(skillInstance)
+		except Exception as e:
+			self.logWarning(f'Failed writing manifest for skill **{skillInstance.name}**: {e}')
+
+
+	def indexSkills(self):
+		"""
+		Rebuilds the event name to skill handlers index and drops the intent routes. Has to be called whenever the active skills change
+		"""
+		self._eventRegistry.index(self._activeSkills)
+		self.invalidateIntentRoutes()
+
+
+	def invalidateIntentRoutes(self):
+		self._intentRouter.invalidate()
 
 
 	def deactivateSkill(self, skillName: str, persistent: bool = False):
 		if skillName in self._activeSkills:
 			skillInstance = self._activeSkills.pop(skillName)
 			self._deactivatedSkills[skillName] = skillInstance
+			self.indexSkills()
 			skillInstance.onStop()
 			self.broadcast(method=constants.EVENT_SKILL_STOPPED, exceptions=[self.name], propagateToSkills=True, skill=self)
+			if self.WidgetManager:
+				self.WidgetManager.skillStopped(skillName=skillName)
 
 			if persistent:
 				self.changeSkillStateInDB(skillName=skillName, newState=False)
@@ -544,7 +689,7 @@ class SkillManager(Manager):
 	def _checkForSkillInstall(self):
 		# Don't start the install timer from the main thread in case it's the first start
 		if self._skillInstallThread:
-			self.ThreadManager.newTimer(interval=10, func=self._checkForSkillInstall, autoStart=True)
+			self.ThreadManager.newTimer(interval=10, func=self._checkForSkillInstall, autoStart=True, background=True)
 
 		root = Path(self.Commons.rootDir(), constants.SKILL_INSTALL_TICKET_PATH)
 		files = [f for f in root.iterdir() if f.suffix == '.install']
@@ -591,6 +736,7 @@ class SkillManager(Manager):
 					pass
 
 			if info['update']:
+				self.WidgetManager.skillUpdated(skillName=skillName)
 				self.allSkills[skillName].onSkillUpdated(skill=skillName)
 				self.MqttManager.mqttBroadcast(
 					topic=constants.TOPIC_SKILL_UPDATED,
@@ -818,6 +964,8 @@ class SkillManager(Manager):
 				skills[skillName].subscribeIntents()
 			else:
 				skills[skillName].unsubscribeIntents()
+
+			self.invalidateIntentRoutes()
 		except Exception as e:
 			self.logWarning(f'Intent configuration failed: {e}')
 
@@ -848,7 +996,9 @@ class SkillManager(Manager):
 		self._activeSkills.pop(skillName, None)
 		self._deactivatedSkills.pop(skillName, None)
 		self._failedSkills.pop(skillName, None)
+		self.indexSkills()
 
+		self._skillManifest.delete(skillName)
 		self.removeSkillFromDB(skillName=skillName)
 		shutil.rmtree(Path(self.Commons.rootDir(), 'skills', skillName))
 
@@ -911,6 +1061,7 @@ class SkillManager(Manager):
 		self._activeSkills = dict()
 		self._deactivatedSkills = dict()
 		self._failedSkills = dict()
+		self.indexSkills()
 		self._loadSkills()
 
 
@@ -1,11 +1,10 @@
-import difflib
-from random import shuffle
 from typing import Optional
 
 import requests
 
 from core.ProjectAliceExceptions import GithubNotFound
 from core.base.model.Manager import Manager
+from core.base.model.SuggestionIndex import SuggestionIndex
 from core.base.model.Version import Version
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
@@ -14,12 +13,15 @@ from core.util.Decorators import Online
 
 class SkillStoreManager(Manager):
 
+	START_DEPENDENCIES = ['InternetManager', 'LanguageManager']
+
 	SUGGESTIONS_DIFF_LIMIT = 0.75
 
 	def __init__(self):
 		super().__init__()
 		self._skillStoreData = dict()
 		self._skillSamplesData = dict()
+		self._suggestionIndex = SuggestionIndex()
 
 
 	@property
@@ -69,8 +71,14 @@ class SkillStoreManager(Manager):
 		if not data:
 			return
 
+		added = False
 		for skillName, skill in data.items():
-			self._skillSamplesData.setdefault(skillName, skill.get(self.LanguageManager.activeLanguage, list()))
+			if skillName not in self._skillSamplesData:
+				self._skillSamplesData[skillName] = skill.get(self.LanguageManager.activeLanguage, list())
+				added = True
+
+		if added:
+			self._suggestionIndex.build(self._skillSamplesData)
 
 
 	def _getSkillUpdateVersion(self, skillName: str) -> Optional[tuple]:
@@ -115,41 +123,15 @@ class SkillStoreManager(Manager):
 
 
 	def findSkillSuggestion(self, session: DialogSession, string: str = None) -> set:
-		suggestions = set()
 		if not self._skillSamplesData or not self.InternetManager.online:
-			return suggestions
+			return set()
 
 		userInput = session.input if not string else string
 		if not userInput:
-			return suggestions
-
-		for skillName, samples in self._skillSamplesData.items():
-			for sample in samples:
-				diff = difflib.SequenceMatcher(None, userInput, sample).ratio()
-				if diff >= self.SUGGESTIONS_DIFF_LIMIT:
-					suggestions.add(skillName)
-					break
-
-		userInputs = list()
-		userInput = userInput.split()
-
-		if len(userInput) == 1:
-			userInputs.append(userInput.copy())
-
-		for _ in range(max(len(userInput), 8)):
-			shuffle(userInput)
-			userInputs.append(userInput.copy())
-
-		for skillName, samples in self._skillSamplesData.items():
-			for sample in samples:
-				for userInput in userInputs:
-					diff = difflib.SequenceMatcher(None, userInput, sample).ratio()
-					if diff >= self.SUGGESTIONS_DIFF_LIMIT:
-						suggestions.add(skillName)
-						break
+			return set()
 
 		ret = set()
-		for suggestedSkillName in suggestions:
+		for suggestedSkillName in self._suggestionIndex.search(userInput, self.SUGGESTIONS_DIFF_LIMIT):
 			speakableName = self._skillStoreData.get(suggestedSkillName, dict()).get('speakableName', '')
 
 			if not speakableName:
@@ -1,16 +1,45 @@
 from __future__ import annotations
 
+import time
 import traceback
+from typing import Dict, TYPE_CHECKING
 
 from core.commons import constants
 from core.device.model.DeviceAbility import DeviceAbility
 from core.util.model.Logger import Logger
 
+if TYPE_CHECKING:
+	from core.base.model.EventRegistry import EventRegistry
+
 
 class SuperManager:
 	NAME = 'SuperManager'
 	_INSTANCE = None
 
+	# Started one after the other, before any other manager
+	BOOTSTRAP = ['CommonsManager', 'StateManager', 'ConfigManager']
+
+	# Put back at the end of the managers, under their name, once all are started
+	REKEYED = [
+		'ConfigManager',
+		'AudioManager',
+		'LanguageManager',
+		'LocationManager',
+		'DeviceManager',
+		'TalkManager',
+		'DatabaseManager',
+		'UserManager',
+		'MqttManager',
+		'SkillManager',
+		'WidgetManager',
+		'DialogTemplateManager',
+		'AssistantManager',
+		'NluManager',
+		'InternetManager',
+		'NodeRedManager',
+		'StateManager'
+	]
+
 
 	def __new__(cls, *args, **kwargs):
 		if not isinstance(SuperManager._INSTANCE, SuperManager):
@@ -20,13 +49,18 @@ class SuperManager:
 
 
 	def __init__(self, mainClass):
+		from core.base.model.EventRegistry import EventRegistry
+
 		SuperManager._INSTANCE = self
 		self._managers = dict()
+		self._eventRegistry = EventRegistry()
+		self._bootTimings: Dict[str, float] = dict()
 
 		self.projectAlice = mainClass
 		self.commons = None
 		self.commonsManager = None
 		self.configManager = None
+		self.metricsManager = None
 		self.databaseManager = None
 		self.languageManager = None
 		self.asrManager = None
@@ -60,76 +94,35 @@ class SuperManager:
 
 
 	def onStart(self):
-		try:
-			commons = self._managers.pop('CommonsManager')
-			commons.onStart()
-
-			stateManager = self._managers.pop('StateManager')
-			stateManager.onStart()
-
-			configManager = self._managers.pop('ConfigManager')
-			configManager.onStart()
+		from core.base.model.StartScheduler import StartScheduler
 
-			languageManager = self._managers.pop('LanguageManager')
-			languageManager.onStart()
-
-			locationManager = self._managers.pop('LocationManager')
-			locationManager.onStart()
+		try:
+			bootTime = time.perf_counter()
+			managers = self._managers
+			self._bootTimings = dict()
 
-			audioServer = self._managers.pop('AudioManager')
-			audioServer.onStart()
+			# Until everything is started, the rekeyed managers are not reachable by broadcasts, and Commons never is
+			self._managers = {name: manager for name, manager in managers.items() if name not in self.REKEYED and name != 'CommonsManager'}
 
-			internetManager = self._managers.pop('InternetManager')
-			internetManager.onStart()
+			for name in self.BOOTSTRAP:
+				startTime = time.perf_counter()
+				managers[name].onStart()
+				self._bootTimings[name] = time.perf_counter() - startTime
 
-			databaseManager = self._managers.pop('DatabaseManager')
-			databaseManager.onStart()
+			others = {name: manager for name, manager in managers.items() if name not in self.BOOTSTRAP and manager}
+			scheduler = StartScheduler(
+				managers=others,
+				dependencies={name: manager.startDependencies for name, manager in others.items()},
+				workers=int(self.configManager.getAliceConfigByName('managerStartWorkers') or 1)
+			)
+			self._bootTimings.update(scheduler.run())
 
-			userManager = self._managers.pop('UserManager')
-			userManager.onStart()
+			for name in self.REKEYED:
+				self._managers[managers[name].name] = managers[name]
 
-			mqttManager = self._managers.pop('MqttManager')
-			mqttManager.onStart()
+			self._eventRegistry.index(self._managers)
 
-			talkManager = self._managers.pop('TalkManager')
-			skillManager = self._managers.pop('SkillManager')
-			deviceManager = self._managers.pop('DeviceManager')
-			widgetManager = self._managers.pop('WidgetManager')
-			assistantManager = self._managers.pop('AssistantManager')
-			dialogTemplateManager = self._managers.pop('DialogTemplateManager')
-			nluManager = self._managers.pop('NluManager')
-			nodeRedManager = self._managers.pop('NodeRedManager')
-
-			for manager in self._managers.values():
-				if manager:
-					manager.onStart()
-
-			talkManager.onStart()
-			nluManager.onStart()
-			skillManager.onStart()
-			deviceManager.onStart()
-			widgetManager.onStart()
-			dialogTemplateManager.onStart()
-			assistantManager.onStart()
-			nodeRedManager.onStart()
-
-			self._managers[configManager.name] = configManager
-			self._managers[audioServer.name] = audioServer
-			self._managers[languageManager.name] = languageManager
-			self._managers[locationManager.name] = locationManager
-			self._managers[deviceManager.name] = deviceManager
-			self._managers[talkManager.name] = talkManager
-			self._managers[databaseManager.name] = databaseManager
-			self._managers[userManager.name] = userManager
-			self._managers[mqttManager.name] = mqttManager
-			self._managers[skillManager.name] = skillManager
-			self._managers[widgetManager.name] = widgetManager
-			self._managers[dialogTemplateManager.name] = dialogTemplateManager
-			self._managers[assistantManager.name] = assistantManager
-			self._managers[nluManager.name] = nluManager
-			self._managers[internetManager.name] = internetManager
-			self._managers[nodeRedManager.name] = nodeRedManager
-			self._managers[stateManager.name] = stateManager
+			self.logBootTimings(time.perf_counter() - bootTime)
 		except Exception as e:
 			import traceback
 
@@ -137,6 +130,17 @@ class SuperManager:
 			Logger().logFatal(f'Error while starting managers: {e}')
 
 
+	def logBootTimings(self, elapsed: float):
+		cumulated = sum(self._bootTimings.values())
+		slowest = sorted(self._bootTimings.items(), key=lambda timing: timing[1], reverse=True)[:5]
+
+		logger = Logger(prepend='[SuperManager]')
+		logger.logInfo(f'Managers started in **{elapsed:.2f}s**, {cumulated:.2f}s if started one after the other')
+		logger.logInfo(f'Slowest starts: {", ".join(f"{name} {timing:.2f}s" for name, timing in slowest)}')
+		for name, timing in self._bootTimings.items():
+			logger.logDebug(f'{name} started in {timing * 1000:.0f}ms')
+
+
 	def onBooted(self):
 		manager = None
 		try:
@@ -167,6 +171,7 @@ class SuperManager:
 		from core.user.UserManager import UserManager
 		from core.util.DatabaseManager import DatabaseManager
 		from core.util.InternetManager import InternetManager
+		from core.util.MetricsManager import MetricsManager
 		from core.util.TelemetryManager import TelemetryManager
 		from core.util.ThreadManager import ThreadManager
 		from core.util.TimeManager import TimeManager
@@ -192,6 +197,7 @@ class SuperManager:
 		self.commons = self.commonsManager
 		self.stateManager = StateManager()
 		self.configManager = ConfigManager()
+		self.metricsManager = MetricsManager()
 		self.databaseManager = DatabaseManager()
 		self.skillManager = SkillManager()
 		self.widgetManager = WidgetManager()
@@ -222,6 +228,7 @@ class SuperManager:
 		self.wakewordManager = WakewordManager()
 
 		self._managers = {name[0].upper() + name[1:]: manager for name, manager in self.__dict__.items() if name.endswith('Manager')}
+		self._eventRegistry.index(self._managers)
 
 
 	def onStop(self):
@@ -256,3 +263,13 @@ class SuperManager:
 	@property
 	def managers(self) -> dict:
 		return self._managers
+
+
+	@property
+	def eventRegistry(self) -> EventRegistry:
+		return self._eventRegistry
+
+
+	@property
+	def bootTimings(self) -> Dict[str, float]:
+		return self._bootTimings
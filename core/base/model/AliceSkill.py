@@ -3,7 +3,6 @@ from __future__ import annotations
 import importlib
 import inspect
 import json
-import re
 import sqlite3
 from copy import copy
 from pathlib import Path
@@ -20,6 +19,7 @@ from core.base.model.Version import Version
 from core.commons import constants
 from core.device.model.Device import Device
 from core.dialog.model.DialogSession import DialogSession
+from core.dialog.model.UtteranceCache import UtteranceCache
 from core.user.model.AccessLevels import AccessLevel
 
 
@@ -60,13 +60,13 @@ class AliceSkill(ProjectAliceObject):
 		self._widgets = list()
 		self._deviceTypes = list()
 		self._intentsDefinitions = dict()
+		self._intentsSegments = dict()
 		self._scenarioPackageName = ''
 		self._scenarioPackageVersion = Version(mainVersion=0, updateVersion=0, hotfix=0)
 
 		self._supportedIntents: Dict[str, Intent] = self.buildIntentList(supportedIntents)
 		self.loadIntentsDefinition()
 
-		self._utteranceSlotCleaner = re.compile('{(.+?):=>.+?}')
 		self._myDevicesTemplates = dict()
 		self._myDevices: Dict[str, Device] = dict()
 
@@ -137,18 +137,15 @@ class AliceSkill(ProjectAliceObject):
 		for lang in self.LanguageManager.supportedLanguages:
 			try:
 				path = dialogTemplate / f'{lang}.json'
-				if not path.exists():
+				data = self.DialogTemplateManager.utteranceCache.load(skillName=self._name, language=lang, file=path)
+				if not data or 'intents' not in data:
 					continue
 
-				with path.open('r') as fp:
-					data = json.load(fp)
-
-					if 'intents' not in data:
-						continue
-
-					self._intentsDefinitions[lang] = dict()
-					for intent in data['intents']:
-						self._intentsDefinitions[lang][intent['name']] = intent['utterances']
+				self._intentsDefinitions[lang] = dict()
+				self._intentsSegments[lang] = dict()
+				for intent in data['intents']:
+					self._intentsDefinitions[lang][intent['name']] = intent['utterances']
+					self._intentsSegments[lang][intent['name']] = intent['segments']
 			except Exception as e:
 				self.logWarning(f'Something went wrong loading intent definition for skill **{self._name}**, language **{lang}**: {e}')
 
@@ -252,8 +249,8 @@ class AliceSkill(ProjectAliceObject):
 		if not cleanSlots:
 			return list(self._intentsDefinitions[lang][check])
 
-		return [re.sub(self._utteranceSlotCleaner, '\\1', utterance.lower() if forceLowerCase else utterance)
-		        for utterance in self._intentsDefinitions[lang][check]]
+		utterances = [UtteranceCache.clean(segments) for segments in self._intentsSegments[lang][check]]
+		return [utterance.lower() for utterance in utterances] if forceLowerCase else utterances
 
 
 	def supportedIntentsWithUtterances(self) -> dict:
@@ -340,6 +337,11 @@ class AliceSkill(ProjectAliceObject):
 		self._required = value
 
 
+	@property
+	def databaseSchema(self) -> Optional[dict]:
+		return self._databaseSchema
+
+
 	@property
 	def supportedIntents(self) -> dict:
 		return self._supportedIntents
@@ -348,6 +350,7 @@ class AliceSkill(ProjectAliceObject):
 	@supportedIntents.setter
 	def supportedIntents(self, value: list):
 		self._supportedIntents = value
+		self.SkillManager.invalidateIntentRoutes()
 
 
 	@property
@@ -452,6 +455,10 @@ class AliceSkill(ProjectAliceObject):
 		if not intent:
 			return False
 
+		return self.dispatchIntent(session, intent)
+
+
+	def dispatchIntent(self, session: DialogSession, intent: Intent) -> bool:
 		if intent.authLevel != AccessLevel.ZERO:
 			try:
 				self.authenticateIntent(session)
@@ -500,7 +507,7 @@ class AliceSkill(ProjectAliceObject):
 	def onBooted(self) -> bool:
 		if self.delayed:
 			self.logInfo('Delayed start')
-			self.ThreadManager.doLater(interval=5, func=self.onStart)
+			self.ThreadManager.doLater(interval=5, func=self.onStart, background=True)
 
 		return True
 
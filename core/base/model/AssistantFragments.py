@@ -0,0 +1,182 @@
+import hashlib
+import json
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class AssistantFragments:
+	"""
+	The intents each skill dialog template brings to the assistant, built once and cached per skill and language
+	for as long as the template file checksum doesn't change. The checksum itself is only computed again once the file was touched.
+	Slot and entity ids are derived from the slot names and types instead of being random, so that a skill
+	always brings the same fragment and the assistant can be told up to date by comparing signatures.
+	"""
+
+	# Part of the signature, to be raised whenever the fragments change shape
+	VERSION = 1
+
+	def __init__(self, cachePath: Path, checksum: Callable[[Path], str]):
+		"""
+		:param cachePath: Path, where to persist the fragments
+		:param checksum: callable returning the checksum of a file
+		"""
+		self._cachePath = cachePath
+		self._checksum = checksum
+		self._fragments: Dict[Tuple[str, str], dict] = dict()
+		self._lock = threading.Lock()
+
+
+	def load(self, skillName: str, language: str, file: Path) -> Optional[dict]:
+		"""
+		Returns the assistant fragment of a skill dialog template, building it only if the template changed
+		:param skillName: str
+		:param language: str
+		:param file: Path, the dialog template file
+		:return: dict with the template checksum and the intents, None if the file doesn't exist
+		"""
+		try:
+			stat = file.stat()
+		except OSError:
+			return None
+
+		# The checksum is only computed when the file was touched since the fragment was built
+		touched = [stat.st_mtime_ns, stat.st_size]
+		key = (skillName, language)
+		cacheFile = self._cachePath / f'{skillName}_{language}.json'
+
+		with self._lock:
+			cached = self._fragments.get(key, None)
+			if not cached and cacheFile.exists():
+				try:
+					cached = json.loads(cacheFile.read_text())
+				except ValueError:
+					cached = None  # Rebuilt right below
+
+			if cached and cached.get('touched') == touched:
+				self._fragments[key] = cached
+				return cached
+
+			checksum = self._checksum(file)
+			if cached and cached.get('checksum') == checksum:
+				fragment = {**cached, 'touched': touched}
+			else:
+				fragment = {
+					'checksum': checksum,
+					'touched' : touched,
+					'intents' : self.build(json.loads(file.read_text()), language)
+				}
+
+			self._cachePath.mkdir(parents=True, exist_ok=True)
+			cacheFile.write_text(json.dumps(fragment, ensure_ascii=False))
+			self._fragments[key] = fragment
+
+			return fragment
+
+
+	@classmethod
+	def build(cls, data: dict, language: str) -> List[dict]:
+		"""
+		The assistant intents declared by a dialog template
+		:param data: dict, the dialog template content
+		:param language: str
+		:return: list of assistant intents
+		"""
+		intents = list()
+		for intent in data.get('intents', list()):
+			intents.append({
+				'id'              : intent['name'],
+				'type'            : 'registry',
+				'version'         : '0.1.0',
+				'language'        : language,
+				'slots'           : [{
+					'name'           : slot['name'],
+					'id'             : cls.slotId(slot['type'], slot['name']),
+					'entityId'       : cls.entityId(slot['type']),
+					'missingQuestion': slot['missingQuestion'],
+					'required'       : slot['required']
+				} for slot in intent.get('slots', None) or list()],
+				'name'            : intent['name'],
+				'enabledByDefault': intent['enabledByDefault']
+			})
+
+		return intents
+
+
+	@staticmethod
+	def assemble(fragments: Dict[str, dict]) -> Tuple[List[dict], List[str]]:
+		"""
+		Puts the fragments of the skills together, the first skill declaring an intent wins
+		:param fragments: dict, skill name to its fragment
+		:return: tuple of the assistant intents and the names of the duplicated ones
+		"""
+		intents = dict()
+		duplicates = list()
+		for fragment in fragments.values():
+			for intent in fragment['intents']:
+				if intent['name'] in intents:
+					duplicates.append(intent['name'])
+					continue
+
+				intents[intent['name']] = intent
+
+		return list(intents.values()), duplicates
+
+
+	@classmethod
+	def signature(cls, fragments: Dict[str, dict]) -> str:
+		"""
+		Changes whenever a skill is added, removed or has its dialog template changed
+		"""
+		checksums = sorted([skillName, fragment['checksum']] for skillName, fragment in fragments.items())
+		return hashlib.blake2b(json.dumps([cls.VERSION, checksums]).encode()).hexdigest()
+
+
+	def readSignature(self, language: str) -> str:
+		"""
+		The signature of the fragments the assistant was last trained with
+		"""
+		try:
+			return (self._cachePath / f'assistant.{language}.signature').read_text()
+		except OSError:
+			return ''
+
+
+	def writeSignature(self, language: str, signature: str = ''):
+		file = self._cachePath / f'assistant.{language}.signature'
+		if not signature:
+			if file.exists():
+				file.unlink()
+			return
+
+		self._cachePath.mkdir(parents=True, exist_ok=True)
+		file.write_text(signature)
+
+
+	@staticmethod
+	def slotId(slotType: str, slotName: str) -> str:
+		# Slots of the same type and name share their id
+		return hashlib.blake2b(f'{slotType}_{slotName}'.encode(), digest_size=16).hexdigest()[:9]
+
+
+	@staticmethod
+	def entityId(slotType: str) -> str:
+		return f'entity_{hashlib.blake2b(slotType.encode(), digest_size=16).hexdigest()[:11]}'
+
+
+	def drop(self, skillName: str = None):
+		"""
+		Forgets the fragments of a skill, or all of them
+		"""
+		with self._lock:
+			if not skillName:
+				self._fragments.clear()
+				shutil.rmtree(self._cachePath, ignore_errors=True)
+				return
+
+			for key in [key for key in self._fragments if key[0] == skillName]:
+				del self._fragments[key]
+
+			for file in self._cachePath.glob(f'{skillName}_*.json'):
+				file.unlink()
@@ -0,0 +1,108 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+import core.base.model.ProjectAliceObject as PAO
+
+
+class EventRegistry:
+	"""
+	Indexes, per event name, the bound handlers of a set of subscribers (managers or skills).
+	The no-op event methods inherited from ProjectAliceObject are not handlers and are never indexed,
+	so broadcasting an event only walks the subscribers really implementing it.
+	"""
+
+	def __init__(self, fallback: str = None):
+		"""
+		:param fallback: name of a catch all method, called with event=<eventName> for every event, ex. 'onEvent'
+		"""
+		self._fallback = fallback
+		self._handlers: Dict[str, List[Tuple[str, object, Callable]]] = dict()
+		self._fallbacks: Dict[str, Tuple[object, Callable]] = dict()
+		self._order: List[str] = list()
+		self._cache: Dict[str, List[Tuple[str, object, Callable, bool]]] = dict()
+
+
+	def index(self, subscribers: dict):
+		"""
+		Rebuilds the whole index from a dict of subscribers, with name: instance
+		:param subscribers: dict
+		"""
+		handlers = dict()
+		fallbacks = dict()
+		order = list()
+
+		for name, subscriber in subscribers.items():
+			if not subscriber:
+				continue
+
+			order.append(name)
+			for method, func in self.implementedEvents(subscriber).items():
+				if self._fallback and method == self._fallback:
+					fallbacks[name] = (subscriber, func)
+				else:
+					handlers.setdefault(method, list()).append((name, subscriber, func))
+
+		self._handlers = handlers
+		self._fallbacks = fallbacks
+		self._order = order
+		self._cache = dict()
+
+
+	def clear(self):
+		self.index(dict())
+
+
+	def handlers(self, event: str) -> List[Tuple[str, object, Callable, bool]]:
+		"""
+		Returns the handlers for the given event, as a list of (subscriber name, subscriber, bound method, isFallback)
+		:param event: str, the event method name, ex. 'onHotword'
+		:return: list
+		"""
+		ret = self._cache.get(event)
+		if ret is not None:
+			return ret
+
+		if not self._fallbacks:
+			ret = [(name, subscriber, func, False) for name, subscriber, func in self._handlers.get(event, list())]
+		else:
+			explicit = {name: (subscriber, func) for name, subscriber, func in self._handlers.get(event, list())}
+			ret = list()
+			for name in self._order:
+				if name in explicit:
+					ret.append((name, *explicit[name], False))
+				if name in self._fallbacks:
+					ret.append((name, *self._fallbacks[name], True))
+
+		self._cache[event] = ret
+		return ret
+
+
+	@staticmethod
+	def implementedEvents(subscriber: object) -> Dict[str, Callable]:
+		"""
+		Lists the event methods a subscriber implements, skipping ProjectAliceObject no-op defaults
+		:param subscriber: object
+		:return: dict, with method name: bound method
+		"""
+		ret = dict()
+		klass = type(subscriber)
+
+		for method in dir(klass):
+			if not method.startswith('on') or not EventRegistry.isHandler(klass, method):
+				continue
+
+			ret[method] = getattr(subscriber, method)
+
+		for method, func in vars(subscriber).items() if hasattr(subscriber, '__dict__') else list():
+			if method.startswith('on') and callable(func):
+				ret[method] = func
+
+		return ret
+
+
+	@staticmethod
+	def isHandler(klass: type, method: str) -> bool:
+		func: Optional[Callable] = getattr(klass, method, None)
+		if not callable(func) or isinstance(func, type):
+			return False
+
+		return func is not getattr(PAO.ProjectAliceObject, method, None)
@@ -0,0 +1,131 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.base.model.AliceSkill import AliceSkill
+from core.base.model.Intent import Intent
+from core.base.model.LazyAliceSkill import LazyAliceSkill
+
+
+class TopicNode:
+
+	def __init__(self):
+		self.children: Dict[str, TopicNode] = dict()
+		self.intents: List[tuple] = list()
+
+
+class IntentRouter:
+	"""
+	Routes an intent topic to the skills supporting it, without asking every skill in turn.
+	Plain intent topics are looked up in a dict, wildcard subscriptions are walked in a topic trie.
+	Per skill, the intent kept is the one AliceSkill.filterIntent would pick, and the skills are returned in their dispatch order.
+	Skills overriding onMessageDispatch or filterIntent can't be indexed and are always returned, with no intent.
+	Skills not loaded yet are routed by their manifest intents.
+	"""
+
+	CACHE_SIZE = 1024
+
+	def __init__(self, skills: Callable[[], dict]):
+		"""
+		:param skills: callable returning the dict of skills to route to, with name: instance
+		"""
+		self._skills = skills
+		self._indexed = False
+		self._exact: Dict[str, List[tuple]] = dict()
+		self._wildcards = TopicNode()
+		self._custom: List[tuple] = list()
+		self._cache: Dict[str, List[Tuple[str, AliceSkill, Optional[Intent]]]] = dict()
+
+
+	def invalidate(self):
+		"""
+		Drops the index, it is rebuilt on next route. Has to be called whenever skills or their intents change
+		"""
+		self._indexed = False
+		self._exact = dict()
+		self._wildcards = TopicNode()
+		self._custom = list()
+		self._cache = dict()
+
+
+	def index(self):
+		self.invalidate()
+
+		for skillOrder, (skillName, skill) in enumerate(self._skills().items()):
+			if not skill:
+				continue
+
+			if not self.isRoutable(skill):
+				self._custom.append((skillOrder, 0, '', skillName, skill, None))
+				continue
+
+			for intentOrder, (intentName, intent) in enumerate(skill.supportedIntents.items()):
+				entry = (skillOrder, intentOrder, intentName, skillName, skill, intent)
+				if '+' not in intentName and '#' not in intentName:
+					self._exact.setdefault(intentName, list()).append(entry)
+					continue
+
+				node = self._wildcards
+				for level in intentName.split('/'):
+					node = node.children.setdefault(level, TopicNode())
+				node.intents.append(entry)
+
+		self._indexed = True
+
+
+	def route(self, topic: str) -> List[Tuple[str, AliceSkill, Optional[Intent]]]:
+		"""
+		Returns the skills to dispatch the given topic to, as a list of (skill name, skill, intent)
+		:param topic: str, the intent topic
+		:return: list
+		"""
+		if not self._indexed:
+			self.index()
+
+		ret = self._cache.get(topic)
+		if ret is not None:
+			return ret
+
+		matches = self._exact.get(topic, list()) + self._custom
+		self._walk(self._wildcards, topic.split('/'), 0, matches, topic.startswith('$'))
+
+		best = dict()
+		for skillOrder, intentOrder, intentName, skillName, skill, intent in sorted(matches, key=lambda entry: entry[:2]):
+			if skillOrder not in best or AliceSkill.intentNameMoreSpecific(intentName, best[skillOrder][0]):
+				best[skillOrder] = (intentName, skillName, skill, intent)
+
+		ret = [best[skillOrder][1:] for skillOrder in sorted(best)]
+
+		if len(self._cache) >= self.CACHE_SIZE:
+			self._cache = dict()
+		self._cache[topic] = ret
+
+		return ret
+
+
+	def _walk(self, node: TopicNode, levels: List[str], depth: int, matches: list, systemTopic: bool):
+		# Same rules as mqtt topic_matches_sub, a trailing # also matches the parent level and wildcards don't match $ topics
+		wildcards = not (systemTopic and depth == 0)
+
+		if wildcards and '#' in node.children:
+			matches.extend(node.children['#'].intents)
+
+		if depth == len(levels):
+			matches.extend(node.intents)
+			return
+
+		child = node.children.get(levels[depth])
+		if child:
+			self._walk(child, levels, depth + 1, matches, systemTopic)
+
+		if wildcards and '+' in node.children:
+			self._walk(node.children['+'], levels, depth + 1, matches, systemTopic)
+
+
+	@staticmethod
+	def isRoutable(skill: object) -> bool:
+		if isinstance(skill, LazyAliceSkill):
+			return True
+
+		klass = type(skill)
+		return isinstance(skill, AliceSkill) \
+			and klass.onMessageDispatch is AliceSkill.onMessageDispatch \
+			and klass.filterIntent is AliceSkill.filterIntent
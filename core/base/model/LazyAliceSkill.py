@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from core.base.model.Intent import Intent
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+from core.commons import constants
+from core.dialog.model.DialogSession import DialogSession
+
+
+class LazyAliceSkill(ProjectAliceObject):
+	"""
+	Stands for a skill that is installed but not imported yet, built from its install file and cached manifest.
+	It subscribes the skill intents, and the real skill is imported on its first intent.
+	Asking it for anything it doesn't know imports the real skill as well.
+	"""
+
+	def __init__(self, installer: dict, manifest: dict):
+		self._installer = installer
+		self._manifest = manifest
+		self._name = installer['name']
+		self._version = installer.get('version', '0.0.1')
+		self._updateAvailable = False
+		self._active = False
+		self._required = False
+		self._failedStarting = False
+		self._supportedIntents: Dict[str, Intent] = {topic: Intent(topic, userIntent=False) for topic in manifest['intents']}
+		super().__init__()
+
+
+	def __getattr__(self, item: str) -> Any:
+		if item.startswith('_'):
+			raise AttributeError(item)
+
+		skill = self.SkillManager.loadLazySkill(self._name)
+		if not skill:
+			raise AttributeError(item)
+
+		return getattr(skill, item)
+
+
+	def onStart(self):
+		self._active = True
+		self.SkillManager.configureSkillIntents(self._name, True)
+		self.logInfo(f'![green](Started!), will be loaded on first use')
+
+
+	def onStop(self):
+		self._active = False
+		self.SkillManager.configureSkillIntents(self._name, False)
+		self.logInfo(f'![green](Stopped)')
+		self.broadcast(method=constants.EVENT_SKILL_STOPPED, exceptions=[self.name], propagateToSkills=True, skill=self)
+
+
+	def onBooted(self) -> bool:
+		return True
+
+
+	def onSkillInstalled(self, **kwargs):
+		self.onSkillUpdated(**kwargs)
+
+
+	def onSkillUpdated(self, skill: str):
+		if skill != self._name:
+			return
+
+		self._updateAvailable = False
+		self.subscribeIntents()
+
+
+	def onSkillDeleted(self, skill: str):
+		if skill != self._name:
+			return
+
+		for tableName in self._manifest.get('tables', list()):
+			self.DatabaseManager.dropTable(tableName=tableName, callerName=self._name)
+
+
+	def dispatchIntent(self, session: DialogSession, _intent: Intent) -> bool:
+		skill = self.SkillManager.loadLazySkill(self._name)
+		if not skill:
+			return False
+
+		return skill.onMessageDispatch(session)
+
+
+	def subscribeIntents(self):
+		self.MqttManager.subscribeSkillIntents(self._supportedIntents)
+
+
+	def unsubscribeIntents(self):
+		self.MqttManager.unsubscribeSkillIntents(self._supportedIntents)
+
+
+	def getResource(self, resourcePathFile: str = '') -> Path:
+		return self.skillPath / resourcePathFile
+
+
+	@staticmethod
+	def hasScenarioNodes() -> bool:
+		return False
+
+
+	@property
+	def skillPath(self) -> Path:
+		return Path(self.Commons.rootDir(), 'skills', self._name)
+
+
+	@property
+	def name(self) -> str:
+		return self._name
+
+
+	@property
+	def version(self) -> str:
+		return self._version
+
+
+	@property
+	def supportedIntents(self) -> dict:
+		return self._supportedIntents
+
+
+	# Skills bringing widgets or device types are always imported at boot, see SkillManifest.EAGER_RESOURCES
+	@property
+	def widgets(self) -> list:
+		return list()
+
+
+	@property
+	def deviceTypes(self) -> list:
+		return list()
+
+
+	@property
+	def active(self) -> bool:
+		return self._active
+
+
+	@active.setter
+	def active(self, value: bool):
+		self._active = value
+
+
+	@property
+	def required(self) -> bool:
+		return self._required
+
+
+	@required.setter
+	def required(self, value: bool):
+		self._required = value
+
+
+	@property
+	def updateAvailable(self) -> bool:
+		return self._updateAvailable
+
+
+	@updateAvailable.setter
+	def updateAvailable(self, value: bool):
+		self._updateAvailable = value
+
+
+	@property
+	def failedStarting(self) -> bool:
+		return self._failedStarting
+
+
+	@failedStarting.setter
+	def failedStarting(self, value: bool):
+		self._failedStarting = value
+
+
+	def __repr__(self) -> str:
+		return json.dumps({'name': self._name, 'version': self._version, 'lazy': True})
+
+
+	def __str__(self) -> str:
+		return self.__repr__()
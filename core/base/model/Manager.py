@@ -9,6 +9,9 @@ from core.base.model.ProjectAliceObject import ProjectAliceObject
 
 class Manager(ProjectAliceObject):
 
+	# Managers to start before this one, by their SuperManager key, ex. 'LanguageManager'
+	START_DEPENDENCIES: typing.List[str] = list()
+
 	def __init__(self, name: str = '', databaseSchema: dict = None):
 		super().__init__()
 
@@ -24,6 +27,13 @@ class Manager(ProjectAliceObject):
 		return self._name
 
 
+	@property
+	def startDependencies(self) -> typing.List[str]:
+		if self._databaseSchema and 'DatabaseManager' not in self.START_DEPENDENCIES:
+			return [*self.START_DEPENDENCIES, 'DatabaseManager']
+		return self.START_DEPENDENCIES
+
+
 	@property
 	def isActive(self) -> bool:
 		return self._isActive
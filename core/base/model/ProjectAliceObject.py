@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import re
+import time
 from copy import copy
 from pathlib import Path
 from typing import Union
@@ -36,6 +37,7 @@ if TYPE_CHECKING:
 	from core.util.AliceWatchManager import AliceWatchManager
 	from core.util.DatabaseManager import DatabaseManager
 	from core.util.InternetManager import InternetManager
+	from core.util.MetricsManager import MetricsManager
 	from core.util.TelemetryManager import TelemetryManager
 	from core.util.ThreadManager import ThreadManager
 	from core.util.TimeManager import TimeManager
@@ -93,37 +95,39 @@ class ProjectAliceObject:
 		if not method.startswith('on'):
 			method = f'on{method[0].capitalize() + method[1:]}'
 
-		# Give absolute priority to DialogManager
-		try:
-			func = getattr(SM.SuperManager.getInstance().getManager('DialogManager'), method, None)
-			if func:
-				func(**kwargs)
+		superManager = SM.SuperManager.getInstance()
+		liveManagers = superManager.managers
+		handlers = superManager.eventRegistry.handlers(method)
 
-		except TypeError as e:
-			self.logWarning(f'Failed to broadcast event **{method}** to **DialogManager**: {e}')
+		metrics = superManager.metricsManager
+		startTime = time.perf_counter() if metrics and metrics.enabled else 0
 
-		deadManagers = list()
-		for name, man in SM.SuperManager.getInstance().managers.items():
-			if not man:
-				deadManagers.append(name)
+		# Give absolute priority to DialogManager
+		for name, man, func, _ in handlers:
+			if name != 'DialogManager' or name not in liveManagers:
 				continue
 
-			if (manager and man.name != manager.name) or man.name in exceptions:
+			try:
+				func(**kwargs)
+			except TypeError as e:
+				self.logWarning(f'Failed to broadcast event **{method}** to **DialogManager**: {e}')
+			break
+
+		# Only managers really implementing the event are indexed, popped managers are skipped
+		for name, man, func, _ in handlers:
+			if name not in liveManagers or (manager and man.name != manager.name) or man.name in exceptions:
 				continue
 
 			try:
-				func = getattr(man, method, None)
-				if func:
-					func(**kwargs)
-
+				func(**kwargs)
 			except TypeError as e:
 				self.logWarning(f'Failed to broadcast event **{method}** to **{man.name}**: {e}')
 
 		if propagateToSkills:
 			self.SkillManager.skillBroadcast(method=method, **kwargs)
 
-		for name in deadManagers:
-			del SM.SuperManager.getInstance().managers[name]
+		if startTime:
+			metrics.observe('alice_broadcast_seconds', time.perf_counter() - startTime, method)
 
 		if method == 'onAudioFrame':
 			return
@@ -248,6 +252,8 @@ class ProjectAliceObject:
 
 
 	def logDebug(self, msg: str, plural: Union[list, str] = None):
+		if not self._logger.isEnabled('debug'):
+			return
 		self._logger.doLog(function='debug', msg=self.decorateLogs(msg), printStack=False, plural=plural)
 
 
@@ -807,3 +813,8 @@ class ProjectAliceObject:
 	@property
 	def StateManager(self) -> StateManager:  # NOSONAR
 		return SM.SuperManager.getInstance().stateManager
+
+
+	@property
+	def MetricsManager(self) -> MetricsManager:  # NOSONAR
+		return SM.SuperManager.getInstance().metricsManager
@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+from typing import List, Optional
+
+from core.base.model.AliceSkill import AliceSkill
+from core.base.model.IntentRouter import IntentRouter
+
+
+class SkillManifest:
+	"""
+	What has to be known about a skill without importing it: its intents, its tables and whether it can be loaded lazily.
+	Manifests are cached per skill and considered stale as soon as the skill version or one of its python files changes.
+	"""
+
+	CACHE_PATH = Path('var/cache/skills')
+	EAGER_RESOURCES = ['widgets', 'devices', 'scenarioNodes']
+
+	def __init__(self, rootDir: str):
+		self._cachePath = Path(rootDir, self.CACHE_PATH)
+		self._skillsPath = Path(rootDir, 'skills')
+
+
+	def load(self, skillName: str, installer: dict) -> Optional[dict]:
+		"""
+		Returns the cached manifest for the given skill, or None if there's none or it's stale
+		:param skillName: str
+		:param installer: dict, the skill install file content
+		:return: dict
+		"""
+		file = self._cachePath / f'{skillName}.json'
+		if not file.exists():
+			return None
+
+		try:
+			manifest = json.loads(file.read_text())
+		except ValueError:
+			return None
+
+		if manifest.get('version') != installer.get('version') or manifest.get('signature') != self.signature(skillName):
+			return None
+
+		return manifest
+
+
+	def write(self, skill: AliceSkill) -> dict:
+		manifest = {
+			'version'  : skill.version,
+			'signature': self.signature(skill.name),
+			'intents'  : [str(intent) for intent in skill.supportedIntents],
+			'tables'   : list(skill.databaseSchema or dict()),
+			'eager'    : self.needsEagerLoad(skill)
+		}
+
+		self._cachePath.mkdir(parents=True, exist_ok=True)
+		(self._cachePath / f'{skill.name}.json').write_text(json.dumps(manifest, ensure_ascii=False))
+		return manifest
+
+
+	def delete(self, skillName: str):
+		file = self._cachePath / f'{skillName}.json'
+		if file.exists():
+			file.unlink()
+
+
+	def signature(self, skillName: str) -> List[list]:
+		skillPath = self._skillsPath / skillName
+		files = sorted([*skillPath.glob('*.py'), *skillPath.glob('*.install')])
+		return [[file.name, file.stat().st_mtime_ns, file.stat().st_size] for file in files] + \
+			[[resource, (skillPath / resource).exists()] for resource in self.EAGER_RESOURCES]
+
+
+	@classmethod
+	def needsEagerLoad(cls, skill: AliceSkill) -> bool:
+		"""
+		A skill has to be imported at boot if it does more than answering its intents:
+		listening to events, running anything on start, or bringing widgets, device types or scenario nodes
+		"""
+		if not IntentRouter.isRoutable(skill):
+			return True
+
+		if any(skill.getResource(resource).exists() for resource in cls.EAGER_RESOURCES):
+			return True
+
+		klass = type(skill)
+		for method in dir(klass):
+			if method.startswith('on') and method != 'onMessage' and getattr(klass, method) is not getattr(AliceSkill, method, None):
+				return True
+
+		return False
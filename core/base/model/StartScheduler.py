@@ -0,0 +1,101 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+
+
+class StartScheduler:
+	"""
+	Starts a set of managers as soon as the managers they depend on are started.
+	Managers that do not depend on each other are started concurrently on a thread pool.
+	"""
+
+	def __init__(self, managers: dict, dependencies: Dict[str, List[str]], workers: int = 4):
+		"""
+		:param managers: dict, with name: manager
+		:param dependencies: dict, with name: names of the managers it has to be started after. Unknown names are ignored
+		:param workers: int, the number of managers started at the same time, 1 starts them one after the other
+		"""
+		self._managers = {name: manager for name, manager in managers.items() if manager}
+		self._workers = max(1, workers)
+		self._dependencies = {
+			name: [dependency for dependency in dependencies.get(name, list()) if dependency in self._managers and dependency != name]
+			for name in self._managers
+		}
+		self._timings: Dict[str, float] = dict()
+
+
+	def run(self, start: Callable = None) -> Dict[str, float]:
+		"""
+		Starts the managers. Stops scheduling and raises on the first manager failing to start,
+		once the managers already starting are done
+		:param start: callable taking a manager, defaults to calling its onStart
+		:return: dict, with name: seconds it took to start, in start order
+		"""
+		self.checkDependencies()
+
+		start = start or (lambda manager: manager.onStart())
+		waitingOn = {name: set(dependencies) for name, dependencies in self._dependencies.items()}
+		dependents = {name: list() for name in self._managers}
+		for name, dependencies in self._dependencies.items():
+			for dependency in dependencies:
+				dependents[dependency].append(name)
+
+		self._timings = dict()
+		running: Dict[Future, str] = dict()
+		error = None
+
+		with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='managerStart') as executor:
+			def submitReady():
+				for name in [name for name, dependencies in waitingOn.items() if not dependencies]:
+					waitingOn.pop(name)
+					running[executor.submit(self._timed, start, name)] = name
+
+			submitReady()
+			while running:
+				done, _ = wait(running, return_when=FIRST_COMPLETED)
+				for future in done:
+					name = running.pop(future)
+					try:
+						self._timings[name] = future.result()
+					except Exception as e:
+						error = error or e
+						continue
+
+					for dependent in dependents[name]:
+						if dependent in waitingOn:
+							waitingOn[dependent].discard(name)
+
+				if not error:
+					submitReady()
+
+		if error:
+			raise error
+
+		return self._timings
+
+
+	def checkDependencies(self):
+		"""
+		Raises if some managers could never be started because they depend on each other
+		"""
+		started = set()
+		waiting = dict(self._dependencies)
+		while waiting:
+			ready = [name for name, dependencies in waiting.items() if started.issuperset(dependencies)]
+			if not ready:
+				raise Exception(f'Circular start dependencies between {", ".join(waiting)}')
+
+			for name in ready:
+				started.add(name)
+				waiting.pop(name)
+
+
+	def _timed(self, start: Callable, name: str) -> float:
+		startTime = time.perf_counter()
+		start(self._managers[name])
+		return time.perf_counter() - startTime
+
+
+	@property
+	def timings(self) -> Dict[str, float]:
+		return self._timings
@@ -0,0 +1,140 @@
+import difflib
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+
+class SuggestionIndex:
+	"""
+	Finds the skills having a sample that looks like a user input.
+	Samples are indexed once by their character trigrams, an input is scored against the postings with BM25
+	and only the best candidates are compared with difflib, as is and with their words sorted so that word order doesn't matter
+	"""
+
+	NGRAM = 3
+	CANDIDATES = 32
+	K1 = 1.2
+	B = 0.75
+
+	SLOT_REGEX = re.compile(r'{(.*?):=>.*?}')
+	CLEAN_REGEX = re.compile(r'[^\w\s]')
+
+	def __init__(self, samples: Dict[str, List[str]] = None):
+		"""
+		:param samples: dict, skill name to its list of samples
+		"""
+		self._skills: List[str] = list()
+		self._samples: List[Tuple[str, str]] = list()
+		self._lengths: List[int] = list()
+		self._averageLength = 0.0
+		self._postings: Dict[str, List[Tuple[int, int]]] = dict()
+		self._idf: Dict[str, float] = dict()
+
+		if samples:
+			self.build(samples)
+
+
+	@classmethod
+	def normalize(cls, text: str) -> str:
+		text = cls.SLOT_REGEX.sub(r'\1', text)
+		return ' '.join(cls.CLEAN_REGEX.sub(' ', text.lower()).split())
+
+
+	@classmethod
+	def ngrams(cls, text: str) -> Counter:
+		grams = Counter()
+		for word in text.split():
+			word = f' {word} '
+			grams.update(word[i:i + cls.NGRAM] for i in range(len(word) - cls.NGRAM + 1))
+		return grams
+
+
+	def build(self, samples: Dict[str, List[str]]):
+		"""
+		Replaces the index content
+		:param samples: dict, skill name to its list of samples
+		"""
+		skills = list()
+		texts = list()
+		lengths = list()
+		postings = defaultdict(list)
+
+		for skillName, skillSamples in samples.items():
+			for sample in set(skillSamples or list()):
+				text = self.normalize(sample)
+				if not text:
+					continue
+
+				grams = self.ngrams(text)
+				sampleId = len(texts)
+				skills.append(skillName)
+				texts.append((text, self._sortedWords(text)))
+				lengths.append(sum(grams.values()))
+				for gram, count in grams.items():
+					postings[gram].append((sampleId, count))
+
+		total = len(texts)
+		self._skills = skills
+		self._samples = texts
+		self._lengths = lengths
+		self._averageLength = sum(lengths) / total if total else 0.0
+		self._postings = dict(postings)
+		self._idf = {gram: math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5)) for gram, posting in postings.items()}
+
+
+	def search(self, text: str, limit: float = 0.75, candidates: int = CANDIDATES) -> List[str]:
+		"""
+		:param text: str, the user input
+		:param limit: float, the difflib ratio a sample has to reach
+		:param candidates: int, how many of the best scored samples are compared with difflib
+		:return: list of skill names, best match first
+		"""
+		text = self.normalize(text)
+		if not text or not self._samples:
+			return list()
+
+		scores = defaultdict(float)
+		for gram in self.ngrams(text):
+			posting = self._postings.get(gram, None)
+			if not posting:
+				continue
+
+			idf = self._idf[gram]
+			for sampleId, count in posting:
+				norm = self.K1 * (1 - self.B + self.B * self._lengths[sampleId] / self._averageLength)
+				scores[sampleId] += idf * count * (self.K1 + 1) / (count + norm)
+
+		matcher = difflib.SequenceMatcher(None)
+		matcher.set_seq2(text)
+		sortedMatcher = difflib.SequenceMatcher(None)
+		sortedMatcher.set_seq2(self._sortedWords(text))
+
+		suggestions = list()
+		for sampleId, _ in heapq.nlargest(candidates, scores.items(), key=lambda item: item[1]):
+			skillName = self._skills[sampleId]
+			if skillName in suggestions:
+				continue
+
+			sample, sortedSample = self._samples[sampleId]
+			if self._matches(matcher, sample, limit) or self._matches(sortedMatcher, sortedSample, limit):
+				suggestions.append(skillName)
+
+		return suggestions
+
+
+	def __len__(self) -> int:
+		return len(self._samples)
+
+
+	@staticmethod
+	def _sortedWords(text: str) -> str:
+		return ' '.join(sorted(text.split()))
+
+
+	@staticmethod
+	def _matches(matcher: difflib.SequenceMatcher, sample: str, limit: float) -> bool:
+		# The quick ratios are upper bounds of the ratio, cheap enough to rule most samples out
+		matcher.set_seq1(sample)
+		return matcher.real_quick_ratio() >= limit and matcher.quick_ratio() >= limit and matcher.ratio() >= limit
@@ -1,6 +1,5 @@
 import hashlib
 import inspect
-import json
 import random
 import socket
 import sqlite3
@@ -9,7 +8,6 @@ import subprocess
 import tempfile
 import time
 import uuid
-from collections import defaultdict
 from contextlib import contextmanager, suppress
 from ctypes import *
 from datetime import datetime
@@ -23,9 +21,8 @@ from googletrans import Translator
 from paho.mqtt.client import MQTTMessage
 
 import core.base.SuperManager as SuperManager
-import core.commons.model.Slot as slotModel
 from core.base.model.Manager import Manager
-from core.commons import constants
+from core.commons.model.MqttEnvelope import MqttEnvelope
 from core.commons.model.PartOfDay import PartOfDay
 from core.dialog.model.DialogSession import DialogSession
 
@@ -108,71 +105,39 @@ class CommonsManager(Manager):
 		return str(Path(__file__).resolve().parent.parent.parent)
 
 
+	# The message helpers below decode the message once, see MqttEnvelope
 	@staticmethod
 	def payload(message: MQTTMessage) -> dict:
-		try:
-			payload = json.loads(message.payload)
-			if isinstance(payload, bool):
-				message.payload = payload
-				raise TypeError
-		except (ValueError, TypeError):
-			var = message.topic.split('/')[-1]
-			payload = {var: message.payload}
-
-		return payload
-
-
-	@classmethod
-	def parseSlotsToObjects(cls, message: MQTTMessage) -> dict:
-		slots = defaultdict(list)
-		data = cls.payload(message)
-
-		if not isinstance(data, dict):
-			return dict()
-
-		for slotData in data.get('slots', dict()):
-			slot = slotModel.Slot(**slotData)
-			slots[slot.slotName].append(slot)
-		return slots
-
-
-	@classmethod
-	def parseSlots(cls, message: MQTTMessage) -> dict:
-		data = cls.payload(message)
-
-		if not isinstance(data, dict):
-			return dict()
+		return MqttEnvelope.wrap(message).data
 
-		return {slot['slotName']: slot['rawValue'] for slot in data.get('slots', dict())}
 
+	@staticmethod
+	def parseSlotsToObjects(message: MQTTMessage) -> dict:
+		return MqttEnvelope.wrap(message).slotsAsObjects
 
-	@classmethod
-	def parseSessionId(cls, message: MQTTMessage) -> Union[str, bool]:
-		data = cls.payload(message)
 
-		if not isinstance(data, dict):
-			return False
+	@staticmethod
+	def parseSlots(message: MQTTMessage) -> dict:
+		return MqttEnvelope.wrap(message).slots
 
-		return data.get('sessionId', False)
 
+	@staticmethod
+	def parseSessionId(message: MQTTMessage) -> Union[str, bool]:
+		return MqttEnvelope.wrap(message).sessionId
 
-	@classmethod
-	def parseCustomData(cls, message: MQTTMessage) -> dict:
-		try:
-			data = cls.payload(message)
-			return json.loads(data['customData'])
-		except (ValueError, TypeError, KeyError):
-			return dict()
 
+	@staticmethod
+	def parseCustomData(message: MQTTMessage) -> dict:
+		return MqttEnvelope.wrap(message).customData
 
-	@classmethod
-	def parseDeviceUid(cls, message: MQTTMessage) -> str:
-		data = cls.payload(message)
 
-		if not isinstance(data, dict):
-			return constants.UNKNOWN
+	@staticmethod
+	def parseDeviceUid(message: MQTTMessage) -> str:
+		deviceUid = MqttEnvelope.wrap(message).deviceUid
+		if deviceUid is None:
+			return SuperManager.SuperManager.getInstance().configManager.getAliceConfigByName('uuid')
 
-		return data.get('siteId', data.get('IPAddress', SuperManager.SuperManager.getInstance().configManager.getAliceConfigByName('uuid')))
+		return deviceUid
 
 
 	@staticmethod
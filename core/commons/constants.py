@@ -76,7 +76,12 @@ TOPIC_SKILL_UPDATED = 'projectalice/skills/updated'
 TOPIC_SKILL_DELETED = 'projectalice/skills/deleted'
 
 TOPIC_SYSLOG = 'projectalice/logging/syslog'
+TOPIC_SYSLOG_BATCH = 'projectalice/logging/syslogBatch'
+TOPIC_ALICE_WATCH = 'projectalice/logging/alicewatch'
+TOPIC_ALICE_WATCH_SUBSCRIBE = 'projectalice/logging/alicewatch/subscribe'
+TOPIC_ALICE_WATCH_UNSUBSCRIBE = 'projectalice/logging/alicewatch/unsubscribe'
 TOPIC_NLU_TRAINING_STATUS = 'projectalice/nlu/trainingStatus'
+TOPIC_METRICS_SUMMARY = 'projectalice/metrics/summary'
 
 EVENT_FULL_MINUTE = 'fullMinute'
 EVENT_FIVE_MINUTE = 'fiveMinute'
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Union
+
+from paho.mqtt.client import MQTTMessage
+
+from core.commons import constants
+from core.commons.model.Slot import Slot
+
+
+class MqttEnvelope(MQTTMessage):
+	"""
+	A mqtt message decoding its payload only once. The decoded payload, slots and custom data are built on first access
+	and shared by whoever reads them from this message, so they must be copied before being modified.
+	"""
+
+	__slots__ = ('_data', '_decoded', '_slots', '_slotsAsObjects', '_customData')
+
+	COPIED_ATTRIBUTES = ('timestamp', 'state', 'dup', 'payload', 'qos', 'retain', 'info', 'properties')
+
+	def __init__(self, mid: int = 0, topic: bytes = b''):
+		super().__init__(mid=mid, topic=topic)
+		self._data = None
+		self._decoded = False
+		self._slots: Optional[Dict[str, str]] = None
+		self._slotsAsObjects: Optional[Dict[str, List[Slot]]] = None
+		self._customData = None
+
+
+	@classmethod
+	def wrap(cls, message: MQTTMessage) -> MqttEnvelope:
+		"""
+		Returns the message itself if it already is an envelope, a new envelope holding the message otherwise
+		:param message: MQTTMessage, or any object having at least a topic and a payload
+		:return: MqttEnvelope
+		"""
+		if isinstance(message, cls):
+			return message
+
+		topic = getattr(message, '_topic', None) or message.topic or b''
+		envelope = cls(mid=getattr(message, 'mid', 0), topic=topic.encode('utf-8') if isinstance(topic, str) else topic)
+		for attribute in cls.COPIED_ATTRIBUTES:
+			if hasattr(message, attribute):
+				setattr(envelope, attribute, getattr(message, attribute))
+
+		return envelope
+
+
+	@property
+	def data(self) -> Any:
+		"""
+		The decoded payload. Payloads that aren't json, or are json booleans, are returned as {last topic level: payload}
+		"""
+		if not self._decoded:
+			try:
+				data = json.loads(self.payload)
+				if isinstance(data, bool):
+					self.payload = data
+					raise TypeError
+			except (ValueError, TypeError):
+				data = {self.topic.split('/')[-1]: self.payload}
+
+			self._data = data
+			self._decoded = True
+
+		return self._data
+
+
+	@property
+	def sessionId(self) -> Union[str, bool]:
+		data = self.data
+		if not isinstance(data, dict):
+			return False
+
+		return data.get('sessionId', False)
+
+
+	@property
+	def deviceUid(self) -> Optional[str]:
+		"""
+		The device the message is from, None if the payload doesn't tell
+		"""
+		data = self.data
+		if not isinstance(data, dict):
+			return constants.UNKNOWN
+
+		return data.get('siteId', data.get('IPAddress', None))
+
+
+	@property
+	def slots(self) -> Dict[str, str]:
+		if self._slots is None:
+			data = self.data
+			self._slots = {slot['slotName']: slot['rawValue'] for slot in data.get('slots', dict())} if isinstance(data, dict) else dict()
+
+		return self._slots
+
+
+	@property
+	def slotsAsObjects(self) -> Dict[str, List[Slot]]:
+		if self._slotsAsObjects is None:
+			data = self.data
+			if not isinstance(data, dict):
+				self._slotsAsObjects = dict()
+			else:
+				self._slotsAsObjects = defaultdict(list)
+				for slotData in data.get('slots', dict()):
+					slot = Slot(**slotData)
+					self._slotsAsObjects[slot.slotName].append(slot)
+
+		return self._slotsAsObjects
+
+
+	@property
+	def customData(self) -> Any:
+		if self._customData is None:
+			try:
+				self._customData = json.loads(self.data['customData'])
+			except (ValueError, TypeError, KeyError):
+				self._customData = dict()
+
+		return self._customData
@@ -14,12 +14,16 @@ from core.device.model.Device import Device
 from core.device.model.DeviceAbility import DeviceAbility
 from core.device.model.DeviceException import DeviceTypeUndefined, MaxDeviceOfTypeReached, MaxDevicePerLocationReached
 from core.device.model.DeviceLink import DeviceLink
+from core.device.model.DeviceRegistry import DeviceRegistry
 from core.device.model.DeviceType import DeviceType
 from core.device.model.Heartbeat import Heartbeat
 from core.dialog.model.DialogSession import DialogSession
 
 
 class DeviceManager(Manager):
+
+	START_DEPENDENCIES = ['SkillManager', 'LocationManager']
+
 	DB_DEVICE = 'myDevices'
 	DB_LINKS = 'deviceLinks'
 	DATABASE = {
@@ -45,7 +49,7 @@ class DeviceManager(Manager):
 	def __init__(self):
 		super().__init__(databaseSchema=self.DATABASE)
 
-		self._devices: Dict[int, Device] = dict()
+		self._registry = DeviceRegistry()
 		self._deviceLinks: Dict[int, DeviceLink] = dict()
 		self._deviceTypes: Dict[str, Dict[str, DeviceType]] = dict()
 
@@ -90,10 +94,10 @@ class DeviceManager(Manager):
 
 		device.setAbilities(abilities)
 
-		for device in self._devices.values():
+		for device in self.devices.values():
 			device.onStart()
 
-		self.logInfo(f'Loaded **{len(self._devices)}** device instance', plural='instance')
+		self.logInfo(f'Loaded **{len(self.devices)}** device instance', plural='instance')
 
 
 	def onBooted(self):
@@ -102,10 +106,10 @@ class DeviceManager(Manager):
 		self.MqttManager.publish(topic=constants.TOPIC_CORE_RECONNECTION)
 		self.getMainDevice().connected = True
 
-		if self._devices:
+		if self.devices:
 			self.ThreadManager.newThread(name='checkHeartbeats', target=self.checkHeartbeats)
 
-		for device in self._devices.values():
+		for device in self.devices.values():
 			device.onBooted()
 
 		self._heartbeat = Heartbeat(device=self.getMainDevice())
@@ -117,7 +121,7 @@ class DeviceManager(Manager):
 		self._stopBroadcasting()
 		self._broadcastSocket.close()
 
-		for device in self._devices.values():
+		for device in self.devices.values():
 			device.onStop()
 
 		if self._heartbeat:
@@ -136,7 +140,7 @@ class DeviceManager(Manager):
 				skillImport = importlib.import_module(f'skills.{data.get("skillName")}.devices.{data.get("typeName")}')
 				klass = getattr(skillImport, data.get('typeName'))
 				device = klass(data)
-				self._devices[device.id] = device
+				self._registry.add(device)
 			except Exception as e:
 				self.logError(f"Couldn't create device instance: {e}")
 
@@ -173,8 +177,6 @@ class DeviceManager(Manager):
 					device.connected = False
 					self.MqttManager.publish(constants.TOPIC_DEVICE_UPDATED, payload={'device': device.toDict()})
 
-		self._heartbeatsCheckTimer = self.ThreadManager.newTimer(interval=2, func=self.checkHeartbeats)
-
 
 	def getDevice(self, deviceId: int = None, uid: str = None) -> Optional[Device]:
 		"""
@@ -184,12 +186,9 @@ class DeviceManager(Manager):
 		:return: Device instance if any or None
 		"""
 		if deviceId:
-			return self._devices.get(deviceId, None)
+			return self._registry.get(deviceId)
 		elif uid:
-			for device in self._devices.values():
-				if device.uid == uid:
-					return device
-			return None
+			return self._registry.getByUid(uid)
 		else:
 			raise Exception('Cannot get a device without id or uid')
 
@@ -229,15 +228,7 @@ class DeviceManager(Manager):
 		:param connectedOnly: Whether or not to return non connected devices
 		:return: A list of Device instances
 		"""
-		ret = list()
-		for device in self._devices.values():
-			if connectedOnly and not device.connected:
-				continue
-
-			if device.hasAbilities(abilities):
-				ret.append(device)
-
-		return ret
+		return self._registry.query(abilities=abilities, connectedOnly=connectedOnly)
 
 
 	def getDevicesByType(self, deviceType: DeviceType, connectedOnly: bool = True) -> List[Device]:
@@ -247,16 +238,7 @@ class DeviceManager(Manager):
 		:param deviceType: DeviceType
 		:return: list of Device instances
 		"""
-
-		ret = list()
-		for device in self._devices.values():
-			if connectedOnly and not device.connected:
-				continue
-
-			if device.deviceType == deviceType:
-				ret.append(device)
-
-		return ret
+		return self._registry.query(deviceType=deviceType, connectedOnly=connectedOnly)
 
 
 	def getDevicesByLocation(self, locationId: int, deviceType: DeviceType = None, abilities: List[DeviceAbility] = None, connectedOnly: bool = True) -> List[Device]:
@@ -293,19 +275,7 @@ class DeviceManager(Manager):
 		:param connectedOnly: Whether or not to return non connected devices
 		:return: list of Device instances
 		"""
-
-		ret = list()
-		for device in self._devices.values():
-			if (locationId and device.parentLocation != locationId)\
-			    or (skillName and device.skillName != skillName)\
-				or (deviceType and device.deviceType != deviceType)\
-				or (connectedOnly and not device.connected)\
-				or (abilities and not device.hasAbilities(abilities)):
-				continue
-
-			ret.append(device)
-
-		return ret
+		return self._registry.query(locationId=locationId, skillName=skillName, deviceType=deviceType, abilities=abilities, connectedOnly=connectedOnly)
 
 
 	def getDeviceType(self, skillName: str, deviceType: str) -> Optional[DeviceType]:
@@ -323,11 +293,7 @@ class DeviceManager(Manager):
 		Returns the main device, the only one having the IS_CORE ability
 		:return: Device instance
 		"""
-		try:
-			devices = self.getDevicesWithAbilities(abilities=[DeviceAbility.IS_CORE], connectedOnly=False)
-			return devices[0]
-		except:
-			return None
+		return self._registry.mainDevice
 
 
 	def addNewDeviceFromWebUI(self, data: Dict) -> Optional[Device]:
@@ -393,7 +359,7 @@ class DeviceManager(Manager):
 		}
 
 		device = Device(data)
-		self._devices[device.id] = device
+		self._registry.add(device)
 
 		if device.deviceType.allowLocationLinks:
 			self.addDeviceLink(targetLocation=locationId, deviceId=device.id)
@@ -404,7 +370,15 @@ class DeviceManager(Manager):
 
 	@property
 	def devices(self) -> Dict[int, Device]:
-		return self._devices
+		return self._registry.devices
+
+
+	def reindexDevice(self, device: Device):
+		"""
+		Has to be called whenever a device uid, location, abilities or connection state changes
+		:param device: Device instance
+		"""
+		self._registry.reindex(device)
 
 
 	def updateDeviceSettings(self, deviceId: int, data: dict) -> Optional[Device]:
@@ -473,7 +447,7 @@ class DeviceManager(Manager):
 		else:
 			device.onStop()
 			self.deleteDeviceLinks(deviceId=device.id)
-			self._devices.pop(device.id, None)
+			self._registry.remove(device)
 			self.DatabaseManager.delete(tableName=self.DB_DEVICE, callerName=self.name, values={'id': device.id})
 
 
@@ -546,7 +520,7 @@ class DeviceManager(Manager):
 
 		self._heartbeats[uid] = round(time.time())
 		if not self._heartbeatsCheckTimer:
-			self._heartbeatsCheckTimer = self.ThreadManager.newTimer(interval=2, func=self.checkHeartbeats)
+			self._heartbeatsCheckTimer = self.ThreadManager.doEvery(interval=2, func=self.checkHeartbeats)
 
 		return device
 
@@ -772,7 +746,7 @@ class DeviceManager(Manager):
 
 
 	def getDeviceByName(self, name: str):
-		return next((dev for dev in self._devices.values() if dev.displayName == name), None)
+		return next((dev for dev in self.devices.values() if dev.displayName == name), None)
 
 
 # def broadcastToDevices(self, topic: str, payload: dict = None, deviceType: DeviceType = None, location: Location = None, connectedOnly: bool = True):
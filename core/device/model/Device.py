@@ -208,16 +208,19 @@ class Device(ProjectAliceObject):
 			return self._abilities & check == check
 
 
-	def setAbilities(self, abilities: List[DeviceAbility]):
+	def setAbilities(self, abilities: List[DeviceAbility]) -> int:
 		"""
 		Sets this device's abilities, based on a bitmask
 		:param abilities:
-		:return:
+		:return: the abilities bitmask
 		"""
 		self._abilities = 0
 		for ability in abilities:
 			self._abilities |= ability.value
 
+		self.DeviceManager.reindexDevice(self)
+		return self._abilities
+
 
 	# noinspection SqlResolve
 	def saveToDB(self):
@@ -226,7 +229,7 @@ class Device(ProjectAliceObject):
 		:return:
 		"""
 		if self._id != -1:
-			self.DatabaseManager.replace(
+			self.DatabaseManager.replaceLater(
 				tableName=self.DeviceManager.DB_DEVICE,
 				query='REPLACE INTO :__table__ (id, uid, parentLocation, typeName, skillName, settings, deviceParams, deviceConfigs) VALUES (:id, :uid, :parentLocation, :typeName, :skillName, :settings, :deviceParams, :deviceConfigs)',
 				callerName=self.DeviceManager.name,
@@ -279,6 +282,7 @@ class Device(ProjectAliceObject):
 		:return:
 		"""
 		self._uid = uid
+		self.DeviceManager.reindexDevice(self)
 		self.saveToDB()
 
 
@@ -312,7 +316,9 @@ class Device(ProjectAliceObject):
 		:param value: bool
 		:return:
 		"""
-		self._connected = value
+		if value != self._connected:
+			self._connected = value
+			self.DeviceManager.reindexDevice(self)
 
 
 	@property
@@ -351,6 +357,7 @@ class Device(ProjectAliceObject):
 	@parentLocation.setter
 	def parentLocation(self, value: int):
 		self._parentLocation = value
+		self.DeviceManager.reindexDevice(self)
 
 
 	@property
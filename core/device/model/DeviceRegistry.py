@@ -0,0 +1,158 @@
+import threading
+from typing import Dict, Hashable, List, Optional
+
+from core.device.model.Device import Device
+from core.device.model.DeviceAbility import DeviceAbility
+from core.device.model.DeviceType import DeviceType
+
+
+class DeviceRegistry:
+	"""
+	Holds the devices, indexed by id, uid, type, location, skill, ability and connection state, so that looking devices up
+	doesn't go through all of them. Devices must be reindexed whenever one of those changes, which Device does by itself.
+	"""
+
+	def __init__(self):
+		self._devices: Dict[int, Device] = dict()
+		self._byUid: Dict[str, Device] = dict()
+		self._indexes: Dict[str, Dict[Hashable, Dict[int, Device]]] = {
+			'location' : dict(),
+			'skill'    : dict(),
+			'type'     : dict(),
+			'ability'  : dict(),
+			'connected': dict()
+		}
+		self._keys: Dict[int, Dict[str, list]] = dict()
+		self._mainDevice: Optional[Device] = None
+		self._mainDeviceCached = False
+		self._lock = threading.RLock()
+
+
+	def add(self, device: Device):
+		with self._lock:
+			self._devices[device.id] = device
+			self.reindex(device)
+
+
+	def remove(self, device: Device):
+		with self._lock:
+			self._unindex(device.id)
+			self._devices.pop(device.id, None)
+
+
+	def reindex(self, device: Device):
+		"""
+		Updates the indexes of a device, has to be called when its uid, location, abilities or connection state change
+		:param device: Device
+		"""
+		with self._lock:
+			if self._devices.get(device.id) is not device:
+				return
+
+			self._unindex(device.id)
+
+			abilities = device.getAbilities() or 0
+			keys = {
+				'location' : [device.parentLocation],
+				'skill'    : [device.skillName],
+				'type'     : [device.deviceType],
+				'ability'  : [ability for ability in DeviceAbility if abilities & ability.value],
+				'connected': [True] if device.connected else list()
+			}
+
+			for index, values in keys.items():
+				for value in values:
+					self._indexes[index].setdefault(value, dict())[device.id] = device
+
+			keys['uid'] = [device.uid]
+			self._byUid[device.uid] = device
+			self._keys[device.id] = keys
+			self._mainDeviceCached = False
+
+
+	def get(self, deviceId: int) -> Optional[Device]:
+		return self._devices.get(deviceId, None)
+
+
+	def getByUid(self, uid: str) -> Optional[Device]:
+		return self._byUid.get(uid, None)
+
+
+	def query(self, locationId: int = None, skillName: str = None, deviceType: DeviceType = None, abilities: List[DeviceAbility] = None, connectedOnly: bool = True) -> List[Device]:
+		"""
+		Returns the devices matching all the given criteria, looking only at the smallest indexed set of devices matching one of them
+		:param locationId: int
+		:param skillName: str
+		:param deviceType: DeviceType
+		:param abilities: list of DeviceAbility the devices must have at least
+		:param connectedOnly: bool
+		:return: list of Device instances
+		"""
+		with self._lock:
+			candidates = [self._devices]
+			if locationId:
+				candidates.append(self._indexes['location'].get(locationId, dict()))
+			if skillName:
+				candidates.append(self._indexes['skill'].get(skillName, dict()))
+			if deviceType:
+				candidates.append(self._indexes['type'].get(deviceType, dict()))
+			if connectedOnly:
+				candidates.append(self._indexes['connected'].get(True, dict()))
+			for ability in abilities or list():
+				candidates.append(self._indexes['ability'].get(ability, dict()))
+
+			devices = list(min(candidates, key=len).values())
+
+		ret = list()
+		for device in devices:
+			if (locationId and device.parentLocation != locationId) \
+				or (skillName and device.skillName != skillName) \
+				or (deviceType and device.deviceType != deviceType) \
+				or (connectedOnly and not device.connected) \
+				or (abilities and not device.hasAbilities(abilities)):
+				continue
+
+			ret.append(device)
+
+		return ret
+
+
+	@property
+	def mainDevice(self) -> Optional[Device]:
+		"""
+		The main device, the only one having the IS_CORE ability
+		"""
+		with self._lock:
+			if not self._mainDeviceCached:
+				devices = self.query(abilities=[DeviceAbility.IS_CORE], connectedOnly=False)
+				self._mainDevice = devices[0] if devices else None
+				self._mainDeviceCached = True
+
+			return self._mainDevice
+
+
+	@property
+	def devices(self) -> Dict[int, Device]:
+		return self._devices
+
+
+	def _unindex(self, deviceId: int):
+		keys = self._keys.pop(deviceId, None)
+		if not keys:
+			return
+
+		for uid in keys.pop('uid'):
+			if self._byUid.get(uid) is self._devices.get(deviceId):
+				self._byUid.pop(uid, None)
+
+		for index, values in keys.items():
+			for value in values:
+				bucket = self._indexes[index].get(value)
+				if bucket is None:
+					continue
+
+				bucket.pop(deviceId, None)
+				if not bucket:
+					self._indexes[index].pop(value, None)
+
+		self._mainDeviceCached = False
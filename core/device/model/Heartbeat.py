@@ -21,6 +21,7 @@ class Heartbeat(ProjectAliceObject):
 
 		self._topic = topic
 		self._rnd = 0
+		self._timer = None
 		self._device = device
 		self.startHeartbeat()
 
@@ -31,6 +32,8 @@ class Heartbeat(ProjectAliceObject):
 
 
 	def stopHeartBeat(self):
+		if self._timer:
+			self._timer.cancel()
 		self.ThreadManager.terminateThread(name=f'heartBeatThread-{self._rnd}')
 
 
@@ -47,9 +50,9 @@ class Heartbeat(ProjectAliceObject):
 		self._client.connect(self.ConfigManager.getAliceConfigByName('mqttHost'), int(self.ConfigManager.getAliceConfigByName('mqttPort')))
 		self._client.loop_start()
 		self.beat()
+		self._timer = self.ThreadManager.doEvery(interval=self._tempo, func=self.beat)
 
 
 	def beat(self):
 		if not self.ProjectAlice.shuttingDown:
 			self._client.publish(topic=self._topic, payload=json.dumps({'uid': self._device.uid}), qos=0, retain=False)
-		self.ThreadManager.newTimer(interval=self._tempo, func=self.beat)
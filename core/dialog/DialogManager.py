@@ -1,7 +1,6 @@
 import json
 import uuid
 from pathlib import Path
-from threading import Timer
 from typing import Dict, Optional
 
 from paho.mqtt.client import MQTTMessage
@@ -10,6 +9,7 @@ from core.base.model.Manager import Manager
 from core.commons import constants
 from core.device.model.DeviceAbility import DeviceAbility
 from core.dialog.model.DialogSession import DialogSession
+from core.util.model.ThreadTimer import ThreadTimer
 from core.voice.WakewordRecorder import WakewordRecorderState
 
 
@@ -27,7 +27,7 @@ class DialogManager(Manager):
 		self._sessionsByDeviceUids: Dict[str: DialogSession] = dict()
 		self._endedSessions: Dict[str: DialogSession] = dict()
 		self._feedbackSounds: Dict[str: bool] = dict()
-		self._sessionTimeouts: Dict[str, Timer] = dict()
+		self._sessionTimeouts: Dict[str, ThreadTimer] = dict()
 		self._revivePendingSessions: Dict[str, DialogSession] = dict()
 
 		self._disabledByDefaultIntents = set()
@@ -483,8 +483,9 @@ class DialogManager(Manager):
 			return
 
 		session.previousInput = session.input
-		self.databaseInsert(
+		self.DatabaseManager.insertLater(
 			tableName='notRecognizedIntents',
+			callerName=self.name,
 			values={
 				'text': session.input
 			}
@@ -7,10 +7,13 @@ from core.base.model.Manager import Manager
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
 from core.dialog.model.DialogTemplate import DialogTemplate
+from core.dialog.model.UtteranceCache import UtteranceCache
 
 
 class DialogTemplateManager(Manager):
 
+	START_DEPENDENCIES = ['SkillManager']
+
 	def __init__(self):
 		super().__init__()
 
@@ -26,6 +29,8 @@ class DialogTemplateManager(Manager):
 		if not self._pathToData.exists():
 			self._pathToData.write_text('{}')
 
+		self._utteranceCache = UtteranceCache(self._pathToCache / 'utterances', self.Commons.fileChecksum)
+
 		self._dialogTemplates: Optional[Dict[str, DialogTemplate]] = None
 		self._slotTypes: Optional[Dict[str, List[DialogTemplate]]] = None
 		self._intentsToSkills: Optional[Dict[str, DialogTemplate]] = None
@@ -36,6 +41,11 @@ class DialogTemplateManager(Manager):
 		return self._pathToData
 
 
+	@property
+	def utteranceCache(self) -> UtteranceCache:
+		return self._utteranceCache
+
+
 	def initHolders(self):
 		self._dialogTemplates = dict()
 		self._slotTypes = dict()
@@ -64,7 +74,7 @@ class DialogTemplateManager(Manager):
 		self.initHolders()
 
 		for resource in self.skillResource():
-			data = json.loads(resource.read_text())
+			data = self._utteranceCache.load(skillName=resource.parent.parent.name, language=resource.stem, file=resource)
 			dialogTemplate = DialogTemplate(**data)
 			self._dialogTemplates[dialogTemplate.skill] = dialogTemplate
 
@@ -173,6 +183,8 @@ class DialogTemplateManager(Manager):
 			if file.stem.startswith(f'{skillName}_'):
 				file.unlink()
 
+		self._utteranceCache.drop(skillName)
+
 		checksums = json.load(self._pathToChecksums)
 		checksums.pop(skillName, None)
 
@@ -210,7 +222,7 @@ class DialogTemplateManager(Manager):
 
 		skill.addUtterance(text=text, intent=intent)
 		self.DialogManager.cleanNotRecognizedIntent(text=text)
-		self.ThreadManager.doLater(interval=2, func=self.AssistantManager.checkAssistant)
+		self.ThreadManager.doLater(interval=2, func=self.AssistantManager.checkAssistant, background=True)
 
 
 	@classmethod
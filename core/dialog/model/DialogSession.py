@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from copy import copy
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
@@ -8,6 +9,7 @@ from paho.mqtt.client import MQTTMessage
 from core.base.SuperManager import SuperManager
 from core.base.model import Intent
 from core.commons import constants
+from core.commons.model.MqttEnvelope import MqttEnvelope
 
 
 @dataclass
@@ -49,33 +51,34 @@ class DialogSession:
 
 		self.addToHistory(self.intentName)
 
-		commonsManager = SuperManager.getInstance().commonsManager
-		self.message = message
-		self.intentName = message.topic
-		self.payload = commonsManager.payload(message)
-		self.slots = commonsManager.parseSlots(message)
-		self.slotsAsObjects = commonsManager.parseSlotsToObjects(message)
-		self.customData = commonsManager.parseCustomData(message)
+		# The envelope parsed objects are shared, the session keeps copies as it modifies them
+		envelope = MqttEnvelope.wrap(message)
+		self.message = envelope
+		self.intentName = envelope.topic
+		self.payload = copy(envelope.data)
+		self.slots = copy(envelope.slots)
+		self.slotsAsObjects = copy(envelope.slotsAsObjects)
+		self.customData = copy(envelope.customData)
 
 
 	def update(self, message: MQTTMessage):
 		self.addToHistory(self.intentName)
 
-		commonsManager = SuperManager.getInstance().commonsManager
-		self.message = message
-		self.intentName = message.topic
-		self.payload = commonsManager.payload(message)
+		envelope = MqttEnvelope.wrap(message)
+		self.message = envelope
+		self.intentName = envelope.topic
+		self.payload = copy(envelope.data)
 
 		if not isinstance(self.payload, dict):
 			return
 
-		self.slots.update(commonsManager.parseSlots(message))
-		self.slotsAsObjects.update(commonsManager.parseSlotsToObjects(message))
+		self.slots.update(envelope.slots)
+		self.slotsAsObjects.update(envelope.slotsAsObjects)
 		self.text = self.payload.get('text', '')
 		self.input = self.payload.get('input', '')
 
 		if self.customData:
-			self.customData.update(commonsManager.parseCustomData(message))
+			self.customData.update(envelope.customData)
 		else:
 			self.customData = dict()
 
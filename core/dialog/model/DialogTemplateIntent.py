@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
 
+from core.dialog.model.UtteranceCache import UtteranceCache
+
 
 @dataclass
 class DialogTemplateIntent:
@@ -7,13 +9,20 @@ class DialogTemplateIntent:
 	enabledByDefault: bool
 	utterances: list = field(default_factory=list)
 	slots: list = field(default_factory=list)
+	segments: list = field(default_factory=list)
 
 	# TODO remove me
 	description: str = ''
 
 
+	def __post_init__(self):
+		if len(self.segments) != len(self.utterances):
+			self.segments = [UtteranceCache.parse(utterance) for utterance in self.utterances]
+
+
 	def addUtterance(self, text: str):
 		self.utterances.append(text)
+		self.segments.append(UtteranceCache.parse(text))
 
 
 	def dump(self) -> dict:
@@ -21,5 +30,6 @@ class DialogTemplateIntent:
 			'name'            : self.name,
 			'enabledByDefault': self.enabledByDefault,
 			'utterances'      : self.utterances,
+			'segments'        : self.segments,
 			'slots'           : self.slots
 		}
@@ -0,0 +1,82 @@
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional
+
+
+class UtteranceCache:
+	"""
+	Dialog template files with their utterances parsed once. Every intent gets, next to its utterances, their segments:
+	one list per utterance, made of [text] for plain text and [text, slotName] for slots, so that
+	"turn {on:=>state} the light" is [['turn '], ['on', 'state'], [' the light']].
+	Parsed files are persisted and reused for as long as the dialog template file checksum doesn't change.
+	"""
+
+	SLOT_REGEX = re.compile('{(.+?:=>.+?)}')
+
+	def __init__(self, cachePath: Path, checksum: Callable[[Path], str]):
+		"""
+		:param cachePath: Path, where to persist the parsed files
+		:param checksum: callable returning the checksum of a file
+		"""
+		self._cachePath = cachePath
+		self._checksum = checksum
+		self._lock = threading.Lock()
+
+
+	def load(self, skillName: str, language: str, file: Path) -> Optional[dict]:
+		"""
+		Returns the content of a skill dialog template file, its intents having their utterances segments
+		:param skillName: str
+		:param language: str
+		:param file: Path, the dialog template file
+		:return: dict, None if the file doesn't exist
+		"""
+		if not file.exists():
+			return None
+
+		checksum = self._checksum(file)
+		cacheFile = self._cachePath / f'{skillName}_{language}.json'
+
+		with self._lock:
+			if cacheFile.exists():
+				try:
+					cached = json.loads(cacheFile.read_text())
+					if cached.get('checksum') == checksum:
+						return cached['data']
+				except ValueError:
+					pass  # Rebuilt right below
+
+			data = json.loads(file.read_text())
+			for intent in data.get('intents', list()):
+				intent['segments'] = [self.parse(utterance) for utterance in intent.get('utterances', list())]
+
+			self._cachePath.mkdir(parents=True, exist_ok=True)
+			cacheFile.write_text(json.dumps({'checksum': checksum, 'data': data}, ensure_ascii=False))
+
+			return data
+
+
+	def drop(self, skillName: str):
+		with self._lock:
+			for file in self._cachePath.glob(f'{skillName}_*.json'):
+				file.unlink()
+
+
+	@classmethod
+	def parse(cls, utterance: str) -> List[list]:
+		segments = list()
+		for i, piece in enumerate(cls.SLOT_REGEX.split(utterance)):
+			# The split alternates plain text and captured slots
+			segments.append(piece.split(':=>', 1) if i % 2 else [piece])
+
+		return segments
+
+
+	@staticmethod
+	def clean(segments: List[list]) -> str:
+		"""
+		The utterance with its slots replaced by their text
+		"""
+		return ''.join(segment[0] for segment in segments)
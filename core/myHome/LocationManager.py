@@ -1,10 +1,14 @@
 from typing import Dict, List, Optional
 
 from core.base.model.Manager import Manager
+from core.device.model.Device import Device
+from core.device.model.DeviceAbility import DeviceAbility
+from core.device.model.DeviceType import DeviceType
+from core.dialog.model.DialogSession import DialogSession
 from core.myHome.model.Construction import Construction
 from core.myHome.model.Furniture import Furniture
 from core.myHome.model.Location import Location
-from core.dialog.model.DialogSession import DialogSession
+from core.myHome.model.LocationIndex import LocationIndex
 
 
 class LocationManager(Manager):
@@ -38,6 +42,7 @@ class LocationManager(Manager):
 		super().__init__(databaseSchema=self.DATABASE)
 
 		self._locations: Dict[int, Location] = dict()
+		self._index = LocationIndex()
 		self._constructions: Dict[int, Construction] = dict()
 		self._furnitures: Dict[int, Furniture] = dict()
 
@@ -66,7 +71,9 @@ class LocationManager(Manager):
 
 	def loadLocations(self):
 		for row in self.databaseFetch(tableName=self.LOCATIONS_TABLE, method='all'): #NOSONAR
-			self._locations[row['id']] = Location(self.Commons.dictFromRow(row))
+			location = Location(self.Commons.dictFromRow(row))
+			self._locations[location.id] = location
+			self._index.add(location)
 			self.logInfo(f'Loaded location **{row["name"]}**')
 
 
@@ -175,6 +182,7 @@ class LocationManager(Manager):
 
 		location = Location(data)
 		self._locations[location.id] = location
+		self._index.add(location)
 
 		return location
 
@@ -188,6 +196,7 @@ class LocationManager(Manager):
 		    }
 		)
 		self._locations.pop(locId, None)
+		self._index.remove(locId)
 
 		self.DatabaseManager.delete(
 			tableName=self.CONSTRUCTIONS_TABLE,
@@ -225,14 +234,67 @@ class LocationManager(Manager):
 
 
 	def getLocationByName(self, name: str) -> Optional[Location]:
-		return {location.name.lower(): location for location in self._locations.values()}.get(name.lower(), None)
+		return self._index.getByName(name)
 
 
 	def getLocationBySynonym(self, name: str) -> Optional[Location]:
-		for location in self._locations.values():
-			if name.lower() in [synonym.lower() for synonym in location.synonyms]:
-				return location
-		return None
+		return self._index.getBySynonym(name)
+
+
+	def reindexLocation(self, location: Location):
+		"""
+		Has to be called whenever a location name, synonyms or parent changes
+		:param location: Location instance
+		"""
+		self._index.reindex(location)
+
+
+	def getSubLocations(self, locId: int, includeSelf: bool = False) -> List[Location]:
+		"""
+		Returns every location under the given one, however deep, ex. all the rooms of a floor
+		:param locId: int, 0 for the whole home
+		:param includeSelf: bool
+		:return: list of Location instances
+		"""
+		ids = self._index.descendants(locId)
+		ret = [self._locations[locId]] if includeSelf and locId in self._locations else list()
+		return ret + [location for location in self._locations.values() if location.id in ids]
+
+
+	def getParentLocations(self, locId: int) -> List[Location]:
+		"""
+		Returns the locations the given one is in, closest first
+		:param locId: int
+		:return: list of Location instances
+		"""
+		return [self._locations[parentId] for parentId in self._index.ancestors(locId) if parentId in self._locations]
+
+
+	def isInLocation(self, locId: int, parentId: int) -> bool:
+		"""
+		Whether a location is the given parent location or somewhere under it
+		"""
+		return locId == parentId or locId in self._index.descendants(parentId)
+
+
+	def getDevicesUnder(self, locId: int, deviceType: DeviceType = None, abilities: List[DeviceAbility] = None, connectedOnly: bool = True) -> List[Device]:
+		"""
+		Returns the devices in the given location and in every location under it
+		:param locId: int
+		:param deviceType: The device type that it must be
+		:param abilities: The abilities the device has to have
+		:param connectedOnly: Whether or not to return non connected devices
+		:return: list of Device instances
+		"""
+		# Querying the devices of location 0 returns every device, the whole home is only made of its descendants
+		locations = [*self._index.descendants(locId)] if not locId else [locId, *self._index.descendants(locId)]
+
+		ret = dict()
+		for location in locations:
+			for device in self.DeviceManager.getDevicesByLocation(locationId=location, deviceType=deviceType, abilities=abilities, connectedOnly=connectedOnly):
+				ret.setdefault(device.id, device)
+
+		return list(ret.values())
 
 
 	def getLocationName(self, locId: int) -> Optional[str]:
@@ -259,6 +321,7 @@ class LocationManager(Manager):
 
 		location.addSynonym(synonym)
 		location.saveToDB()
+		self._index.reindex(location)
 
 
 	def deleteLocationSynonym(self, locId: int, synonym: str):
@@ -268,6 +331,7 @@ class LocationManager(Manager):
 
 		location.deleteSynonym(synonym)
 		location.saveToDB()
+		self._index.reindex(location)
 
 
 	def getLocationSettings(self, locId: int) -> dict:
@@ -296,6 +360,7 @@ class LocationManager(Manager):
 			location.updateSettings(data['settings'])
 
 		location.saveToDB()
+		self._index.reindex(location)
 		return location
 
 
@@ -334,8 +399,11 @@ class LocationManager(Manager):
 			return loc
 
 		if deviceUid:
-			locId = self.DeviceManager.getDevice(uid=deviceUid).parentLocation
-			return self.getLocation(locId=locId)
+			device = self.DeviceManager.getDevice(uid=deviceUid)
+			if not device:
+				return None
+
+			return self.getLocation(locId=device.parentLocation)
 
 		return None
 
@@ -91,6 +91,7 @@ class Location(ProjectAliceObject):
 			values={'name': newName},
 			row=('id', self.id)
 		)
+		self.LocationManager.reindexLocation(self)
 
 
 	def addSynonym(self, synonym: str):
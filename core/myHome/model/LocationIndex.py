@@ -0,0 +1,155 @@
+import threading
+from typing import Dict, FrozenSet, List, Optional
+
+from core.myHome.model.Location import Location
+
+
+class LocationIndex:
+	"""
+	Holds the locations, indexed by casefolded name and synonym, and the closure of their hierarchy,
+	so that finding a location or everything under it doesn't go through all of them.
+	Locations must be reindexed whenever their name, synonyms or parent change.
+	"""
+
+	def __init__(self):
+		self._locations: Dict[int, Location] = dict()
+		self._byName: Dict[str, Dict[int, Location]] = dict()
+		self._bySynonym: Dict[str, Dict[int, Location]] = dict()
+		self._keys: Dict[int, tuple] = dict()
+		self._children: Dict[int, Dict[int, None]] = dict()
+		self._closure: Optional[Dict[int, FrozenSet[int]]] = None
+		self._lock = threading.RLock()
+
+
+	def add(self, location: Location):
+		with self._lock:
+			self._locations[location.id] = location
+			self.reindex(location)
+
+
+	def remove(self, locId: int):
+		with self._lock:
+			self._unindex(locId)
+			self._locations.pop(locId, None)
+
+
+	def reindex(self, location: Location):
+		"""
+		Updates the indexes of a location, has to be called when its name, synonyms or parent change
+		:param location: Location
+		"""
+		with self._lock:
+			if self._locations.get(location.id) is not location:
+				return
+
+			self._unindex(location.id)
+
+			name = location.name.casefold()
+			synonyms = list({synonym.casefold() for synonym in location.synonyms})
+			self._byName.setdefault(name, dict())[location.id] = location
+			for synonym in synonyms:
+				self._bySynonym.setdefault(synonym, dict())[location.id] = location
+
+			self._children.setdefault(location.parentLocation, dict())[location.id] = None
+			self._keys[location.id] = (name, synonyms, location.parentLocation)
+			self._closure = None
+
+
+	def get(self, locId: int) -> Optional[Location]:
+		return self._locations.get(locId, None)
+
+
+	def getByName(self, name: str) -> Optional[Location]:
+		return self._first(self._byName.get(name.casefold(), None))
+
+
+	def getBySynonym(self, synonym: str) -> Optional[Location]:
+		return self._first(self._bySynonym.get(synonym.casefold(), None))
+
+
+	def descendants(self, locId: int) -> FrozenSet[int]:
+		"""
+		The ids of every location under the given one, however deep
+		:param locId: int, 0 for the whole home
+		:return: frozenset of location ids
+		"""
+		with self._lock:
+			if self._closure is None:
+				self._closure = self._buildClosure()
+
+			return self._closure.get(locId, frozenset())
+
+
+	def ancestors(self, locId: int) -> List[int]:
+		"""
+		The ids of the locations the given one is in, closest first
+		:param locId: int
+		:return: list of location ids
+		"""
+		ret = list()
+		location = self._locations.get(locId, None)
+		while location and location.parentLocation and location.parentLocation not in ret and location.parentLocation != locId:
+			ret.append(location.parentLocation)
+			location = self._locations.get(location.parentLocation, None)
+
+		return ret
+
+
+	@property
+	def locations(self) -> Dict[int, Location]:
+		return self._locations
+
+
+	@staticmethod
+	def _first(bucket: Optional[Dict[int, Location]]) -> Optional[Location]:
+		return next(iter(bucket.values()), None) if bucket else None
+
+
+	def _buildClosure(self) -> Dict[int, FrozenSet[int]]:
+		closure = dict()
+
+		def collect(locId: int, path: set) -> FrozenSet[int]:
+			if locId in closure:
+				return closure[locId]
+
+			ret = set()
+			for childId in self._children.get(locId, dict()):
+				# A misconfigured hierarchy could loop
+				if childId in path:
+					continue
+
+				ret.add(childId)
+				ret.update(collect(childId, path | {childId}))
+
+			closure[locId] = frozenset(ret)
+			return closure[locId]
+
+		for locId in [0, *self._locations]:
+			collect(locId, {locId})
+
+		return closure
+
+
+	def _unindex(self, locId: int):
+		keys = self._keys.pop(locId, None)
+		if not keys:
+			return
+
+		name, synonyms, parent = keys
+		self._pop(self._byName, name, locId)
+		for synonym in synonyms:
+			self._pop(self._bySynonym, synonym, locId)
+
+		self._pop(self._children, parent, locId)
+		self._closure = None
+
+
+	@staticmethod
+	def _pop(index: dict, key, locId: int):
+		bucket = index.get(key)
+		if bucket is None:
+			return
+
+		bucket.pop(locId, None)
+		if not bucket:
+			index.pop(key, None)
@@ -7,6 +7,8 @@ from core.base.model.StateType import StateType
 
 class NluManager(Manager):
 
+	START_DEPENDENCIES = ['LanguageManager']
+
 	def __init__(self):
 		super().__init__()
 		self._nluEngine = None
@@ -63,7 +65,7 @@ class NluManager(Manager):
 
 
 	def buildTrainingData(self):
-		self.clearCache()
+		# The engine keeps its per skill conversions in cache and only converts the changed skills
 		self._nluEngine.convertDialogTemplate(self.DialogTemplateManager.pathToData)
 
 
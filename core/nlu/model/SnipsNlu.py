@@ -1,5 +1,5 @@
+import hashlib
 import json
-import re
 import shutil
 import threading
 import time
@@ -10,13 +10,13 @@ import subprocess
 from typing import Optional
 
 from core.commons import constants
+from core.dialog.model.UtteranceCache import UtteranceCache
 from core.nlu.model.NluEngine import NluEngine
 from core.util.Stopwatch import Stopwatch
 
 
 class SnipsNlu(NluEngine):
 	NAME = 'Snips NLU'
-	UTTERANCE_REGEX = re.compile('{(.+?:=>.+?)}')
 
 
 	def __init__(self):
@@ -66,67 +66,119 @@ class SnipsNlu(NluEngine):
 	def convertDialogTemplate(self, file: Path):
 		self.logInfo(f'Preparing NLU training file')
 		dialogTemplate = json.loads(file.read_text())
+		language = self.LanguageManager.activeLanguage
+
+		# Each skill is converted on its own and cached, keyed by the checksum of its template entry.
+		# Not the file checksums, as slot extenders make a skill's entry depend on other skills
+		shardsPath = self._cachePath / 'shards' / language
+		shardsPath.mkdir(parents=True, exist_ok=True)
 
 		nluTrainingSample = dict()
-		nluTrainingSample['language'] = self.LanguageManager.activeLanguage
+		nluTrainingSample['language'] = language
 		nluTrainingSample['entities'] = dict()
 		nluTrainingSample['intents'] = dict()
 
+		converted = list()
 		for skill in dialogTemplate:
-			for entity in skill['slotTypes']:
-				nluTrainingSampleEntity = nluTrainingSample['entities'].setdefault(entity['name'], dict())
-
-				nluTrainingSampleEntity['automatically_extensible'] = entity['automaticallyExtensible']
-				nluTrainingSampleEntity['matching_strictness'] = entity['matchingStrictness'] or 1.0
-				nluTrainingSampleEntity['use_synonyms'] = entity['useSynonyms']
-
-				nluTrainingSampleEntity['data'] = [{
-						'value'   : value['value'],
-						'synonyms': value.get('synonyms', list())
-					} for value in entity['values']
-				]
-
-			for intent in skill['intents']:
-				intentName = intent['name']
-				slots = self.loadSlots(intent)
-				nluTrainingSample['intents'][intentName] = {'utterances': list()}
-
-				for utterance in intent['utterances']:
-					data = list()
-					result = self.UTTERANCE_REGEX.split(utterance)
-					if not result:
+			checksum = hashlib.blake2b(json.dumps(skill, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+			shardFile = shardsPath / f'{skill["skill"]}.json'
+
+			shard = self.loadShard(shardFile, checksum)
+			if not shard:
+				shard = self.convertSkill(skill)
+				shardFile.write_text(json.dumps({'checksum': checksum, **shard}, ensure_ascii=False))
+				converted.append(skill['skill'])
+
+			for entityName, entity in shard['entities'].items():
+				nluTrainingSample['entities'].setdefault(entityName, dict()).update(entity)
+
+			nluTrainingSample['intents'].update(shard['intents'])
+
+		skills = {skill['skill'] for skill in dialogTemplate}
+		for shardFile in shardsPath.glob('*.json'):
+			if shardFile.stem not in skills:
+				shardFile.unlink()
+
+		self.logInfo(f'Converted **{len(converted)}** skill, **{len(dialogTemplate) - len(converted)}** unchanged', plural='skill')
+
+		# json.dumps uses the C encoder, json.dump to a file does not
+		Path(self._cachePath / f'{language}.json').write_text(json.dumps(nluTrainingSample, ensure_ascii=False))
+
+
+	@staticmethod
+	def loadShard(shardFile: Path, checksum: str) -> Optional[dict]:
+		if not shardFile.exists():
+			return None
+
+		try:
+			shard = json.loads(shardFile.read_text())
+		except ValueError:
+			return None
+
+		return shard if shard.get('checksum') == checksum else None
+
+
+	def convertSkill(self, skill: dict) -> dict:
+		"""
+		Converts one skill of the dialog templates to Snips entities and intents
+		:param skill: dict, the skill entry of the dialog templates data
+		:return: dict, with entities and intents
+		"""
+		entities = dict()
+		intents = dict()
+
+		for entity in skill['slotTypes']:
+			nluTrainingSampleEntity = entities.setdefault(entity['name'], dict())
+
+			nluTrainingSampleEntity['automatically_extensible'] = entity['automaticallyExtensible']
+			nluTrainingSampleEntity['matching_strictness'] = entity['matchingStrictness'] or 1.0
+			nluTrainingSampleEntity['use_synonyms'] = entity['useSynonyms']
+
+			nluTrainingSampleEntity['data'] = [{
+					'value'   : value['value'],
+					'synonyms': value.get('synonyms', list())
+				} for value in entity['values']
+			]
+
+		for intent in skill['intents']:
+			intentName = intent['name']
+			slots = self.loadSlots(intent)
+			intents[intentName] = {'utterances': list()}
+
+			# Utterances come parsed from the dialog templates cache
+			allSegments = intent.get('segments', list())
+			if len(allSegments) != len(intent['utterances']):
+				allSegments = [UtteranceCache.parse(utterance) for utterance in intent['utterances']]
+
+			for utterance, segments in zip(intent['utterances'], allSegments):
+				data = list()
+				for segment in segments:
+					if len(segment) == 1:
 						data.append({
-							'text': utterance
+							'text': segment[0]
 						})
-					else:
-						for match in result:
-							if ':=>' not in match:
-								data.append({
-									'text': match
-								})
-								continue
+						continue
 
-							text, slotName = match.split(':=>')
-							entity = slots.get(slotName, None)
+					text, slotName = segment
+					entity = slots.get(slotName, None)
 
-							if not entity:
-								self.logWarning(f'Slot named "{slotName}" with text "{text}" in utterance "{utterance}" doesn\'t have any matching slot definition, skipping to avoid NLU training failure')
-								continue
+					if not entity:
+						self.logWarning(f'Slot named "{slotName}" with text "{text}" in utterance "{utterance}" doesn\'t have any matching slot definition, skipping to avoid NLU training failure')
+						continue
 
-							if entity.startswith('snips/'):
-								nluTrainingSample['entities'][entity] = dict()
+					if entity.startswith('snips/'):
+						entities[entity] = dict()
 
-							data.append({
-								'entity'   : entity,
-								'slot_name': slotName,
-								'text'     : text
-							})
+					data.append({
+						'entity'   : entity,
+						'slot_name': slotName,
+						'text'     : text
+					})
 
-					# noinspection PyTypeChecker
-					nluTrainingSample['intents'][intentName]['utterances'].append({'data': data})
+				# noinspection PyTypeChecker
+				intents[intentName]['utterances'].append({'data': data})
 
-		with Path(self._cachePath / f'{self.LanguageManager.activeLanguage}.json').open('w') as fp:
-			json.dump(nluTrainingSample, fp, ensure_ascii=False)
+		return {'entities': entities, 'intents': intents}
 
 
 	def train(self):
@@ -148,27 +200,45 @@ class SnipsNlu(NluEngine):
 				dataset['entities'].update(trainingData['entities'])
 				dataset['intents'].update(trainingData['intents'])
 
+			datasetHash = hashlib.blake2b(json.dumps(dataset, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+			if self.isTrainedOn(datasetHash):
+				self.logInfo('Dataset unchanged since last training, skipping')
+				self.MqttManager.publish(constants.TOPIC_NLU_TRAINING_STATUS, payload={'status': 'done'})
+				self.ThreadManager.getEvent('TrainAssistant').clear()
+				self.NluManager.training = False
+				# Listeners waiting on a training, like the skills, must not tell skipped from done
+				self.broadcast(method=constants.EVENT_NLU_TRAINED, exceptions=[constants.DUMMY], propagateToSkills=True)
+				return
+
 			datasetFile = Path('/tmp/snipsNluDataset.json')
 
-			with datasetFile.open('w') as fp:
-				json.dump(dataset, fp, ensure_ascii=False, indent='\t')
+			datasetFile.write_text(json.dumps(dataset, ensure_ascii=False))
 
 			self.logInfo('Generated dataset for training')
 
 			# Now that we have generated the dataset, let's train in the background if we are already booted, else do it directly
 			if self.ProjectAlice.isBooted:
-				self.ThreadManager.newThread(name='NLUTraining', target=self.nluTrainingThread, args=[datasetFile])
+				self.ThreadManager.newThread(name='NLUTraining', target=self.nluTrainingThread, args=[datasetFile, datasetHash])
 			else:
-				self.nluTrainingThread(datasetFile)
+				self.nluTrainingThread(datasetFile, datasetHash)
 		except:
 			self.NluManager.training = False
 
 
-	def nluTrainingThread(self, datasetFile: Path):
+	def isTrainedOn(self, datasetHash: str) -> bool:
+		"""
+		Whether the current NLU engine was trained on a dataset with the given hash
+		"""
+		trainedHash = self._cachePath / f'{self.LanguageManager.activeLanguage}.trained'
+		assistantPath = Path(self.Commons.rootDir(), f'trained/assistants/{self.LanguageManager.activeLanguage}/nlu_engine')
+		return assistantPath.exists() and trainedHash.exists() and trainedHash.read_text() == datasetHash
+
+
+	def nluTrainingThread(self, datasetFile: Path, datasetHash: str = ''):
 		try:
 			with Stopwatch() as stopWatch:
 				self.logInfo('Begin training...')
-				self._timer = self.ThreadManager.newTimer(interval=0.25, func=self.trainingStatus)
+				self._timer = self.ThreadManager.doEvery(interval=0.25, func=self.trainingStatus)
 
 				tempTrainingData = Path('/tmp/snipsNLU')
 
@@ -195,6 +265,9 @@ class SnipsNlu(NluEngine):
 
 				shutil.move(tempTrainingData, assistantPath)
 
+				if datasetHash and training.returncode == 0:
+					Path(self._cachePath / f'{self.LanguageManager.activeLanguage}.trained').write_text(datasetHash)
+
 			self._timer.cancel()
 			self.MqttManager.publish(constants.TOPIC_NLU_TRAINING_STATUS, payload={'status': 'done'})
 			self.ThreadManager.getEvent('TrainAssistant').clear()
@@ -205,12 +278,13 @@ class SnipsNlu(NluEngine):
 		except:
 			self.MqttManager.publish(constants.TOPIC_NLU_TRAINING_STATUS, payload={'status': 'failed'})
 		finally:
+			if self._timer:
+				self._timer.cancel()
 			self.NluManager.training = False
 
 
 	def trainingStatus(self):
 		self.MqttManager.publish(constants.TOPIC_NLU_TRAINING_STATUS, payload={'status': 'training'})
-		self._timer = self.ThreadManager.newTimer(interval=0.25, func=self.trainingStatus)
 
 
 	@staticmethod
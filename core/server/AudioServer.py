@@ -13,6 +13,7 @@ from core.ProjectAliceExceptions import PlayBytesStopped
 from core.base.model.Manager import Manager
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
+from core.server.model.AudioFrame import AudioFormat, AudioFrame
 from core.util.model.AliceEvent import AliceEvent
 from core.voice.WakewordRecorder import WakewordRecorderState
 
@@ -21,6 +22,7 @@ class AudioManager(Manager):
 
 	SAMPLERATE = 16000
 	FRAMES_PER_BUFFER = 320
+	AUDIO_FORMAT = AudioFormat(sampleRate=SAMPLERATE, channels=1, sampleWidth=2)
 
 	LAST_USER_SPEECH = 'var/cache/lastUserpeech_{}_{}.wav'
 	SECOND_LAST_USER_SPEECH = 'var/cache/secondLastUserSpeech_{}_{}.wav'
@@ -38,6 +40,7 @@ class AudioManager(Manager):
 
 		self._audioInput = None
 		self._audioOutput = None
+		self._rawFrameHeader = AudioFrame.rawHeader(self.AUDIO_FORMAT)
 
 
 	def onStart(self):
@@ -175,15 +178,12 @@ class AudioManager(Manager):
 
 
 	def publishAudioFrames(self, frames: bytes):
-		with io.BytesIO() as buffer:
-			with wave.open(buffer, 'wb') as wav:
-				wav.setnchannels(1)
-				wav.setsampwidth(2)
-				wav.setframerate(self.SAMPLERATE)
-				wav.writeframes(frames)
-
-			audioFrames = buffer.getvalue()
-			self.MqttManager.publish(topic=constants.TOPIC_AUDIO_FRAME.format(self.DeviceManager.getMainDevice().uid), payload=bytearray(audioFrames))
+		if self.ConfigManager.getAliceConfigByName('rawAudioFrames'):
+			audioFrames = self._rawFrameHeader + frames
+		else:
+			audioFrames = AudioFrame.encodeWav(frames, self.AUDIO_FORMAT)
+
+		self.MqttManager.publish(topic=constants.TOPIC_AUDIO_FRAME.format(self.DeviceManager.getMainDevice().uid), payload=audioFrames)
 
 
 	def onPlayBytes(self, payload: bytearray, deviceUid: str, sessionId: str = None, requestId: str = None):
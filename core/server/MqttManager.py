@@ -1,10 +1,12 @@
+import functools
 import json
 import random
 import re
+import time
 import traceback
 import uuid
 from pathlib import Path
-from typing import List, Union
+from typing import Callable, List, Union
 
 import paho.mqtt.client as mqtt
 import paho.mqtt.publish as publish
@@ -12,13 +14,21 @@ import paho.mqtt.publish as publish
 from core.base.model.Intent import Intent
 from core.base.model.Manager import Manager
 from core.commons import constants
+from core.commons.model.MqttEnvelope import MqttEnvelope
+from core.util.model.WorkerPool import QueueFull
 from core.device.model.Device import Device
 from core.device.model.DeviceAbility import DeviceAbility
 
 
 class MqttManager(Manager):
+
+	# The audio server subscribes to its frames before the client connects
+	START_DEPENDENCIES = ['UserManager', 'AudioManager']
+
 	DEFAULT_CLIENT_EXTENSION = '@mqtt'
 	TOPIC_AUDIO_FRAME = constants.TOPIC_AUDIO_FRAME.replace('{}', '+')
+	AUDIO_FRAME_PREFIX, AUDIO_FRAME_SUFFIX = constants.TOPIC_AUDIO_FRAME.split('{}')
+	DROPPED_AUDIO_LOG_INTERVAL = 10
 
 	def __init__(self):
 		super().__init__()
@@ -26,8 +36,9 @@ class MqttManager(Manager):
 		self._mqttClient = mqtt.Client()
 		self._multiDetectionsHolder = list()
 		self._deactivatedIntents = list()
+		self._droppedAudio = 0
+		self._droppedAudioLogged = 0.0
 
-		self._audioFrameRegex = re.compile(self.TOPIC_AUDIO_FRAME.replace('+', '(.*)'))
 		self._wakewordDetectedRegex = re.compile(constants.TOPIC_WAKEWORD_DETECTED.replace('{}', '(.*)'))
 		self._vadUpRegex = re.compile(constants.TOPIC_VAD_UP.replace('{}', '(.*)'))
 		self._vadDownRegex = re.compile(constants.TOPIC_VAD_DOWN.replace('{}', '(.*)'))
@@ -42,34 +53,36 @@ class MqttManager(Manager):
 		self._mqttClient.on_connect = self.onConnect
 		self._mqttClient.on_log = self.onLog
 
-		self._mqttClient.message_callback_add(constants.TOPIC_HOTWORD_DETECTED, self.onHotwordDetected)
+		self.addMessageCallback(constants.TOPIC_HOTWORD_DETECTED, self.onHotwordDetected, queueName='audio')
 		for username in self.UserManager.getAllUserNames():
-			self._mqttClient.message_callback_add(constants.TOPIC_WAKEWORD_DETECTED.replace('{user}', username), self.onHotwordDetected)
-
-		self._mqttClient.message_callback_add(constants.TOPIC_SESSION_STARTED, self.sessionStarted)
-		self._mqttClient.message_callback_add(constants.TOPIC_ASR_START_LISTENING, self.startListening)
-		self._mqttClient.message_callback_add(constants.TOPIC_ASR_STOP_LISTENING, self.stopListening)
-		self._mqttClient.message_callback_add(constants.TOPIC_ASR_TOGGLE_ON, self.asrToggleOn)
-		self._mqttClient.message_callback_add(constants.TOPIC_ASR_TOGGLE_OFF, self.asrToggleOff)
-		self._mqttClient.message_callback_add(constants.TOPIC_INTENT_PARSED, self.intentParsed)
-		self._mqttClient.message_callback_add(constants.TOPIC_TEXT_CAPTURED, self.captured)
-		self._mqttClient.message_callback_add(constants.TOPIC_TTS_SAY, self.intentSay)
-		self._mqttClient.message_callback_add(constants.TOPIC_TTS_FINISHED, self.sayFinished)
-		self._mqttClient.message_callback_add(constants.TOPIC_SESSION_ENDED, self.sessionEnded)
-		self._mqttClient.message_callback_add(constants.TOPIC_CONTINUE_SESSION, self.continueSession)
-		self._mqttClient.message_callback_add(constants.TOPIC_INTENT_NOT_RECOGNIZED, self.intentNotRecognized)
-		self._mqttClient.message_callback_add(constants.TOPIC_SESSION_QUEUED, self.sessionQueued)
-		self._mqttClient.message_callback_add(constants.TOPIC_NLU_QUERY, self.nluQuery)
-		self._mqttClient.message_callback_add(constants.TOPIC_PARTIAL_TEXT_CAPTURED, self.nluPartialCapture)
-		self._mqttClient.message_callback_add(constants.TOPIC_HOTWORD_TOGGLE_ON, self.hotwordToggleOn)
-		self._mqttClient.message_callback_add(constants.TOPIC_HOTWORD_TOGGLE_OFF, self.hotwordToggleOff)
-		self._mqttClient.message_callback_add(constants.TOPIC_END_SESSION, self.eventEndSession)
-		self._mqttClient.message_callback_add(constants.TOPIC_START_SESSION, self.startSession)
-		self._mqttClient.message_callback_add(constants.TOPIC_DEVICE_HEARTBEAT, self.deviceHeartbeat)
-		self._mqttClient.message_callback_add(constants.TOPIC_TOGGLE_FEEDBACK_ON, self.toggleFeedback)
-		self._mqttClient.message_callback_add(constants.TOPIC_TOGGLE_FEEDBACK_OFF, self.toggleFeedback)
-		self._mqttClient.message_callback_add(constants.TOPIC_NLU_INTENT_NOT_RECOGNIZED, self.nluIntentNotRecognized)
-		self._mqttClient.message_callback_add(constants.TOPIC_NLU_ERROR, self.nluError)
+			self.addMessageCallback(constants.TOPIC_WAKEWORD_DETECTED.replace('{user}', username), self.onHotwordDetected, queueName='audio')
+
+		self.addMessageCallback(constants.TOPIC_SESSION_STARTED, self.sessionStarted)
+		self.addMessageCallback(constants.TOPIC_ASR_START_LISTENING, self.startListening, queueName='audio')
+		self.addMessageCallback(constants.TOPIC_ASR_STOP_LISTENING, self.stopListening, queueName='audio')
+		self.addMessageCallback(constants.TOPIC_ASR_TOGGLE_ON, self.asrToggleOn, queueName='audio')
+		self.addMessageCallback(constants.TOPIC_ASR_TOGGLE_OFF, self.asrToggleOff, queueName='audio')
+		self.addMessageCallback(constants.TOPIC_INTENT_PARSED, self.intentParsed)
+		self.addMessageCallback(constants.TOPIC_TEXT_CAPTURED, self.captured)
+		self.addMessageCallback(constants.TOPIC_TTS_SAY, self.intentSay)
+		self.addMessageCallback(constants.TOPIC_TTS_FINISHED, self.sayFinished)
+		self.addMessageCallback(constants.TOPIC_SESSION_ENDED, self.sessionEnded)
+		self.addMessageCallback(constants.TOPIC_CONTINUE_SESSION, self.continueSession)
+		self.addMessageCallback(constants.TOPIC_INTENT_NOT_RECOGNIZED, self.intentNotRecognized)
+		self.addMessageCallback(constants.TOPIC_SESSION_QUEUED, self.sessionQueued)
+		self.addMessageCallback(constants.TOPIC_NLU_QUERY, self.nluQuery)
+		self.addMessageCallback(constants.TOPIC_PARTIAL_TEXT_CAPTURED, self.nluPartialCapture)
+		self.addMessageCallback(constants.TOPIC_HOTWORD_TOGGLE_ON, self.hotwordToggleOn, queueName='audio')
+		self.addMessageCallback(constants.TOPIC_HOTWORD_TOGGLE_OFF, self.hotwordToggleOff, queueName='audio')
+		self.addMessageCallback(constants.TOPIC_END_SESSION, self.eventEndSession)
+		self.addMessageCallback(constants.TOPIC_START_SESSION, self.startSession)
+		self.addMessageCallback(constants.TOPIC_DEVICE_HEARTBEAT, self.deviceHeartbeat)
+		self.addMessageCallback(constants.TOPIC_TOGGLE_FEEDBACK_ON, self.toggleFeedback)
+		self.addMessageCallback(constants.TOPIC_TOGGLE_FEEDBACK_OFF, self.toggleFeedback)
+		self.addMessageCallback(constants.TOPIC_NLU_INTENT_NOT_RECOGNIZED, self.nluIntentNotRecognized)
+		self.addMessageCallback(constants.TOPIC_NLU_ERROR, self.nluError)
+		self.addMessageCallback(constants.TOPIC_ALICE_WATCH_SUBSCRIBE, self.aliceWatchSubscribe)
+		self.addMessageCallback(constants.TOPIC_ALICE_WATCH_UNSUBSCRIBE, self.aliceWatchUnsubscribe)
 
 		self.connect()
 
@@ -78,11 +91,11 @@ class MqttManager(Manager):
 		super().onBooted()
 
 		for device in self.DeviceManager.getDevicesWithAbilities(abilities=[DeviceAbility.PLAY_SOUND, DeviceAbility.CAPTURE_SOUND], connectedOnly=False):
-			self._mqttClient.message_callback_add(constants.TOPIC_VAD_UP.format(device.uid), self.onVADUp)
-			self._mqttClient.message_callback_add(constants.TOPIC_VAD_DOWN.format(device.uid), self.onVADDown)
+			self.addMessageCallback(constants.TOPIC_VAD_UP.format(device.uid), self.onVADUp, queueName='audio')
+			self.addMessageCallback(constants.TOPIC_VAD_DOWN.format(device.uid), self.onVADDown, queueName='audio')
 
-			self._mqttClient.message_callback_add(constants.TOPIC_PLAY_BYTES.format(device.uid), self.topicPlayBytes)
-			self._mqttClient.message_callback_add(constants.TOPIC_PLAY_BYTES_FINISHED.format(device.uid), self.topicPlayBytesFinished)
+			self.addMessageCallback(constants.TOPIC_PLAY_BYTES.format(device.uid), self.topicPlayBytes)
+			self.addMessageCallback(constants.TOPIC_PLAY_BYTES_FINISHED.format(device.uid), self.topicPlayBytesFinished)
 
 
 	def onStop(self):
@@ -122,6 +135,8 @@ class MqttManager(Manager):
 			(constants.TOPIC_NLU_INTENT_NOT_RECOGNIZED, 0),
 			(constants.TOPIC_START_SESSION, 0),
 			(constants.TOPIC_NLU_ERROR, 0),
+			(constants.TOPIC_ALICE_WATCH_SUBSCRIBE, 0),
+			(constants.TOPIC_ALICE_WATCH_UNSUBSCRIBE, 0),
 			(self.TOPIC_AUDIO_FRAME, 0)
 		]
 
@@ -180,23 +195,93 @@ class MqttManager(Manager):
 			self.mqttClient.unsubscribe(str(intent))
 
 
+	def addMessageCallback(self, topic: str, callback: Callable, queueName: str = 'dialog'):
+		"""
+		Adds a topic callback, called with the message as an envelope so that its payload is decoded only once
+		:param topic: str
+		:param callback: callable, taking the client, the user data and the message
+		:param queueName: str, 'audio' for the messages starting or stopping what is done with the audio frames,
+		so that they are handled in order with the frames around them
+		"""
+		self._mqttClient.message_callback_add(topic, lambda client, userdata, message: self.dispatch(queueName, callback, client, userdata, MqttEnvelope.wrap(message)))
+
+
+	def dispatch(self, queueName: str, func: Callable, *args, **kwargs):
+		"""
+		Hands a received message over to one of the ThreadManager worker queues, so that the network thread only reads messages.
+		Audio and dialog queues have a single worker each, messages are handled in the order they came in within a queue.
+		Hotword, listening and toggle messages go with the audio frames, as they change how the frames that follow are used
+		:param queueName: str, audio or dialog
+		:param func: callable, handling the message
+		"""
+		if self.MetricsManager.enabled:
+			func = self.timed(queueName, func)
+
+		if not self.ConfigManager.getAliceConfigByName('mqttWorkerDispatch'):
+			func(*args, **kwargs)
+			return
+
+		future = self.ThreadManager.submit(queueName, func, *args, **kwargs)
+		if not future.done() or future.cancelled() or not isinstance(future.exception(), QueueFull):
+			return
+
+		if kwargs.get('method', None) != constants.EVENT_AUDIO_FRAME:
+			self.logWarning(f'Dropped a message, the {queueName} queue is full')
+			return
+
+		# Frames come by the dozens per second, drops are summed up rather than logged one by one
+		self._droppedAudio += 1
+		now = time.monotonic()
+		if now - self._droppedAudioLogged >= self.DROPPED_AUDIO_LOG_INTERVAL:
+			self.logWarning(f'Dropped {self._droppedAudio} audio frames, the audio queue is full')
+			self._droppedAudio = 0
+			self._droppedAudioLogged = now
+
+
+	def timed(self, queueName: str, func: Callable) -> Callable:
+		"""
+		Wraps a message handler to record the time from now, the message reception, to the end of its handling, queue wait included
+		"""
+		receivedAt = time.perf_counter()
+
+		@functools.wraps(func)
+		def wrapper(*args, **kwargs):
+			try:
+				return func(*args, **kwargs)
+			finally:
+				self.MetricsManager.observe('alice_mqtt_message_seconds', time.perf_counter() - receivedAt, queueName)
+
+		return wrapper
+
+
 	def onMqttMessage(self, _client, _userdata, message: mqtt.MQTTMessage):
 		try:
-			if self._audioFrameRegex.match(message.topic):
-				self.broadcast(
+			topic = message.topic
+			if topic.endswith(self.AUDIO_FRAME_SUFFIX) and topic.startswith(self.AUDIO_FRAME_PREFIX):
+				self.dispatch(
+					'audio',
+					self.broadcast,
 					method=constants.EVENT_AUDIO_FRAME,
 					exceptions=[self.name],
 					propagateToSkills=True,
 					message=message,
-					deviceUid=message.topic.replace('hermes/audioServer/', '').replace('/audioFrame', '')
+					deviceUid=topic[len(self.AUDIO_FRAME_PREFIX):-len(self.AUDIO_FRAME_SUFFIX)]
 				)
 				return
 
 			if message.topic == constants.TOPIC_INTENT_PARSED:
 				return
 
-			payload = self.Commons.payload(message)
-			sessionId = self.Commons.parseSessionId(message)
+			self.dispatch('dialog', self.handleMessage, MqttEnvelope.wrap(message))
+		except Exception as e:
+			self.logError(f'Error in onMessage: {e}')
+			traceback.print_exc()
+
+
+	def handleMessage(self, message: MqttEnvelope):
+		try:
+			payload = message.data
+			sessionId = message.sessionId
 
 			session = self.DialogManager.getSession(sessionId)
 			if session:
@@ -276,6 +361,7 @@ class MqttManager(Manager):
 			self.ThreadManager.doLater(interval=0.5, func=self.handleMultiDetection)
 
 		self._multiDetectionsHolder.append(payload['siteId'])
+		self.MetricsManager.startSpan('alice_wake_to_intent_seconds', deviceUid)
 
 		user = constants.UNKNOWN_USER
 		if payload['modelType'] == 'personal':
@@ -387,6 +473,8 @@ class MqttManager(Manager):
 
 		if session:
 			session.update(msg)
+			self.MetricsManager.endSpan('alice_wake_to_intent_seconds', session.deviceUid)
+			self.MetricsManager.startSpan('alice_intent_to_say_seconds', sessionId)
 
 			intent = Intent(session.payload['intent']['intentName'])
 			if str(intent) in self._deactivatedIntents:
@@ -459,6 +547,8 @@ class MqttManager(Manager):
 		sessionId = self.Commons.parseSessionId(msg)
 		payload = self.Commons.payload(msg)
 
+		self.MetricsManager.endSpan('alice_intent_to_say_seconds', sessionId)
+
 		session = self.DialogManager.getSession(sessionId)
 		if session:
 			session.update(msg)
@@ -597,6 +687,27 @@ class MqttManager(Manager):
 		self.broadcast(method=constants.EVENT_DEVICE_HEARTBEAT, exceptions=[self.name], propagateToSkills=True, uid=uid, deviceUid=deviceUid)
 
 
+	def aliceWatchSubscribe(self, _client, _data, msg: mqtt.MQTTMessage):
+		payload = self.Commons.payload(msg)
+		uid = payload.get('uid', None)
+		if not uid:
+			self.logWarning('Received an AliceWatch subscription without uid')
+			return
+
+		try:
+			verbosity = int(payload.get('verbosity', 1))
+		except (TypeError, ValueError):
+			verbosity = 1
+
+		self.AliceWatchManager.subscribe(uid=uid, verbosity=verbosity)
+
+
+	def aliceWatchUnsubscribe(self, _client, _data, msg: mqtt.MQTTMessage):
+		uid = self.Commons.payload(msg).get('uid', None)
+		if uid:
+			self.AliceWatchManager.unsubscribe(uid=uid)
+
+
 	def toggleFeedback(self, _client, _data, msg: mqtt.MQTTMessage):
 		deviceUid = self.Commons.parseDeviceUid(msg)
 		method = constants.EVENT_TOGGLE_FEEDBACK_OFF if msg.topic.lower().endswith('off') else constants.EVENT_TOGGLE_FEEDBACK_ON
@@ -866,7 +977,7 @@ class MqttManager(Manager):
 		if stringPayload:
 			payload = stringPayload
 
-		if payload and not isinstance(payload, str) and not isinstance(payload, bytearray) and not isinstance(payload, int) and not isinstance(payload, float):
+		if payload and not isinstance(payload, (str, bytes, bytearray, int, float)):
 			self.logWarning(f'Trying to send an invalid payload: {payload}')
 			return
 
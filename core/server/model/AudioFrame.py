@@ -0,0 +1,79 @@
+import io
+import struct
+import wave
+from dataclasses import dataclass
+from typing import Tuple, Union
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+	sampleRate: int = 16000
+	channels: int = 1
+	sampleWidth: int = 2
+
+
+class AudioFrame:
+	"""
+	Codec for the payloads published on the audioFrame topics. Two framings are supported:
+	- Hermes: every frame is a complete wav file, as per the Hermes protocol. Kept for compatibility
+	- Raw: a fixed 12 bytes header describing the stream format, followed by the raw pcm samples
+
+	Decoding detects the framing from the first bytes and never copies the samples, it returns a memoryview
+	on the received payload
+	"""
+
+	RAW_MAGIC = b'PAPC'
+	RAW_HEADER = struct.Struct('<4sIHH')  # magic, sample rate, channels, sample width
+	WAV_MAGIC = b'RIFF'
+	WAV_HEADER_SIZE = 44
+
+
+	@classmethod
+	def rawHeader(cls, audioFormat: AudioFormat) -> bytes:
+		"""
+		The header never changes for a given stream, build it once and prepend it to every frame
+		"""
+		return cls.RAW_HEADER.pack(cls.RAW_MAGIC, audioFormat.sampleRate, audioFormat.channels, audioFormat.sampleWidth)
+
+
+	@staticmethod
+	def encodeWav(pcm: bytes, audioFormat: AudioFormat) -> bytes:
+		with io.BytesIO() as buffer:
+			with wave.open(buffer, 'wb') as wav:
+				wav.setnchannels(audioFormat.channels)
+				wav.setsampwidth(audioFormat.sampleWidth)
+				wav.setframerate(audioFormat.sampleRate)
+				wav.writeframes(pcm)
+
+			return buffer.getvalue()
+
+
+	@classmethod
+	def decode(cls, payload: Union[bytes, bytearray, memoryview]) -> Tuple[memoryview, AudioFormat]:
+		"""
+		Returns the pcm samples of a frame and their format
+		:param payload: the mqtt message payload
+		:return: tuple, memoryview on the pcm samples and their AudioFormat
+		"""
+		view = memoryview(payload)
+		magic = bytes(view[:4])
+
+		if magic == cls.RAW_MAGIC:
+			_, sampleRate, channels, sampleWidth = cls.RAW_HEADER.unpack_from(view)
+			return view[cls.RAW_HEADER.size:], AudioFormat(sampleRate, channels, sampleWidth)
+
+		if magic != cls.WAV_MAGIC:
+			raise ValueError('Unknown audio frame format')
+
+		# Canonical 44 bytes header, as written by the wave module: slice the samples out directly
+		if len(view) >= cls.WAV_HEADER_SIZE and view[8:16] == b'WAVEfmt ' and view[36:40] == b'data':
+			channels, sampleRate = struct.unpack_from('<HI', view, 22)
+			sampleWidth = struct.unpack_from('<H', view, 34)[0] // 8
+			dataSize = struct.unpack_from('<I', view, 40)[0]
+			return view[cls.WAV_HEADER_SIZE:cls.WAV_HEADER_SIZE + dataSize], AudioFormat(sampleRate, channels, sampleWidth)
+
+		# Anything else, like extra chunks, goes through the wave module
+		with io.BytesIO(payload) as buffer:
+			with wave.open(buffer, 'rb') as wav:
+				audioFormat = AudioFormat(wav.getframerate(), wav.getnchannels(), wav.getsampwidth())
+				return memoryview(wav.readframes(wav.getnframes())), audioFormat
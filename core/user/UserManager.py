@@ -55,7 +55,7 @@ class UserManager(Manager):
 
 		if save:
 			user.apiToken = token
-			self.DatabaseManager.update(
+			self.DatabaseManager.updateLater(
 				tableName='users',
 				callerName=self.name,
 				values={'apiToken': token},
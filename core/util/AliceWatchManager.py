@@ -1,25 +1,70 @@
+import threading
 from datetime import datetime
+from typing import Dict
 
 from core.base.model.Manager import Manager
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
+from core.util.model.AliceWatchers import AliceWatchers
 
 
 class AliceWatchManager(Manager):
 
+	PARTIALS_INTERVAL = 0.5
+
 	def __init__(self):
 		super().__init__()
+		self._watchers = AliceWatchers()
+		self._partials: Dict[str, str] = dict()
+		self._partialsTimer = None
+		self._partialsLock = threading.Lock()
+
+
+	def onStart(self):
+		super().onStart()
+		self.updateWatchMode()
+
+
+	def updateWatchMode(self):
+		"""
+		Applies the aliceWatchOnDemand setting, called again whenever it changes
+		"""
+		self._watchers.onDemand = bool(self.ConfigManager.getAliceConfigByName('aliceWatchOnDemand'))
+
+
+	def subscribe(self, uid: str, verbosity: int):
+		"""
+		Registers or renews an AliceWatch viewer. When AliceWatch runs on demand, nothing is formatted nor published while none is subscribed
+		:param uid: str, identifies the viewer
+		:param verbosity: int, the highest verbosity the viewer displays
+		"""
+		self._watchers.subscribe(uid=uid, verbosity=verbosity)
+
+
+	def unsubscribe(self, uid: str):
+		self._watchers.unsubscribe(uid=uid)
+
+
+	def deviceName(self, uid: str) -> str:
+		device = self.DeviceManager.getDevice(uid=uid)
+		return device.displayName if device else constants.UNKNOWN
 
 
 	def onHotword(self, deviceUid: str, user: str = constants.UNKNOWN_USER):
+		if not self._watchers.wants(1):
+			return
+
 		self.publish(payload={
-			'text': f'Detected on device **{self.DeviceManager.getDevice(uid=deviceUid).displayName}**, for user **{user}**',
+			'text': f'Detected on device **{self.deviceName(deviceUid)}**, for user **{user}**',
 			'component': 'Hotword',
 			'verbosity': 1
 		})
 
 
 	def onIntent(self, session: DialogSession):
+		if not self._watchers.wants(0):
+			return
+
 		text = f'New intent detected ![yellow]({session.payload["intent"]["intentName"]}) with confidence ![yellow]({round(session.payload["intent"]["confidenceScore"], 3)})'
 
 		if session.slots:
@@ -37,6 +82,9 @@ class AliceWatchManager(Manager):
 
 
 	def onIntentParsed(self, session: DialogSession):
+		if not self._watchers.wants(1):
+			return
+
 		text = f'Intent detected ![yellow]({session.payload["intent"]["intentName"]}) with confidence **{round(session.payload["intent"]["confidenceScore"], 3)}** for input "![yellow]({session.payload.get("input", "")})"'
 
 		if session.slots:
@@ -58,14 +106,21 @@ class AliceWatchManager(Manager):
 		# which results in getMainDevice().uid being None. the below is a temp fix
 		if not session.deviceUid:
 			session.deviceUid = self.DeviceManager.getMainDevice().uid
+
+		if not self._watchers.wants(1):
+			return
+
 		self.publish(payload={
-			'text': f'Session with id "**{session.sessionId}**" was started on device **{self.DeviceManager.getDevice(uid=session.deviceUid).displayName}**',
+			'text': f'Session with id "**{session.sessionId}**" was started on device **{self.deviceName(session.deviceUid)}**',
 			'component': 'Dialogue',
 			'verbosity': 1
 		})
 
 
 	def onCaptured(self, session: DialogSession):
+		if not self._watchers.wants(1):
+			return
+
 		self.publish(payload={
 			'text': f'Captured text "![yellow]({session.payload["text"]})" in {round(session.payload["seconds"], 1)}s',
 			'component': 'Asr',
@@ -74,46 +129,78 @@ class AliceWatchManager(Manager):
 
 
 	def onPartialTextCaptured(self, session, text: str, likelihood: float, seconds: float):
-		self.publish(payload={
-			'text': f'Capturing text: "![yellow]({text})"',
-			'component': 'Asr',
-			'verbosity': 2
-		})
+		if not self._watchers.wants(2):
+			return
+
+		# Partials come in at the asr pace, only the last one of each session is published every PARTIALS_INTERVAL
+		with self._partialsLock:
+			self._partials[session.sessionId] = text
+			if not self._partialsTimer:
+				self._partialsTimer = self.ThreadManager.newTimer(interval=self.PARTIALS_INTERVAL, func=self.publishPartials)
+
+
+	def publishPartials(self):
+		with self._partialsLock:
+			partials = self._partials
+			self._partials = dict()
+			self._partialsTimer = None
+
+		for text in partials.values():
+			self.publish(payload={
+				'text': f'Capturing text: "![yellow]({text})"',
+				'component': 'Asr',
+				'verbosity': 2
+			})
 
 
 	def onHotwordToggleOn(self, deviceUid: str, session: DialogSession):
+		if not self._watchers.wants(2):
+			return
+
 		self.publish(payload={
-			'text': f'Was asked to toggle itself **on** on device **{self.DeviceManager.getDevice(uid=deviceUid).displayName}**',
+			'text': f'Was asked to toggle itself **on** on device **{self.deviceName(deviceUid)}**',
 			'component': 'Hotword',
 			'verbosity': 2
 		})
 
 
 	def onHotwordToggleOff(self, deviceUid: str, session: DialogSession):
+		if not self._watchers.wants(2):
+			return
+
 		self.publish(payload={
-			'text'     : f'Was asked to toggle itself **off** on device **{self.DeviceManager.getDevice(uid=deviceUid).displayName}**',
+			'text'     : f'Was asked to toggle itself **off** on device **{self.deviceName(deviceUid)}**',
 			'component': 'Hotword',
 			'verbosity': 2
 		})
 
 
 	def onStartListening(self, session):
+		if not self._watchers.wants(2):
+			return
+
 		self.publish(payload={
-			'text': f'Was asked to start listening on device **{self.DeviceManager.getDevice(uid=session.deviceUid).displayName}**',
+			'text': f'Was asked to start listening on device **{self.deviceName(session.deviceUid)}**',
 			'component': 'Asr',
 			'verbosity': 2
 		})
 
 
 	def onStopListening(self, session):
+		if not self._watchers.wants(2):
+			return
+
 		self.publish(payload={
-			'text': f'Was asked to stop listening on device **{self.DeviceManager.getDevice(uid=session.deviceUid).displayName}**',
+			'text': f'Was asked to stop listening on device **{self.deviceName(session.deviceUid)}**',
 			'component': 'Asr',
 			'verbosity': 2
 		})
 
 
 	def onContinueSession(self, session):
+		if not self._watchers.wants(1):
+			return
+
 		self.publish(payload={
 			'text': f'Was asked to continue session with id "**{session.sessionId}**" by saying "![yellow]({session.text})"',
 			'component': 'Dialogue',
@@ -122,6 +209,9 @@ class AliceWatchManager(Manager):
 
 
 	def onEndSession(self, session: DialogSession, reason: str = 'nominal'):
+		if not self._watchers.wants(1):
+			return
+
 		if 'text' in session.payload:
 			self.publish(payload={
 				'text': f'Was asked to end session with id "**{session.sessionId}**" by saying "![yellow]({session.payload["text"]})"',
@@ -137,6 +227,9 @@ class AliceWatchManager(Manager):
 
 
 	def onSay(self, session: DialogSession):
+		if not self._watchers.wants(1):
+			return
+
 		self.publish(payload={
 			'text': f'Was asked to say "![yellow]({session.payload["text"]})"',
 			'component': 'Tts',
@@ -145,6 +238,9 @@ class AliceWatchManager(Manager):
 
 
 	def onIntentNotRecognized(self, session: DialogSession):
+		if not self._watchers.wants(1):
+			return
+
 		self.publish(payload={
 			'text': f'![red](Intent not recognized) for "![yellow]({session.text})"',
 			'component': 'Nlu',
@@ -153,13 +249,10 @@ class AliceWatchManager(Manager):
 
 
 	def onSessionEnded(self, session: DialogSession):
-		device = self.DeviceManager.getDevice(uid=session.deviceUid)
-		if device:
-			displayName = device.displayName
-		else:
-			displayName = constants.UNKNOWN
+		if not self._watchers.wants(1):
+			return
 
-		text = f'Session with id "**{session.sessionId}**" was ended on device **{displayName}**.'
+		text = f'Session with id "**{session.sessionId}**" was ended on device **{self.deviceName(session.deviceUid)}**.'
 
 		reason = session.payload['termination']['reason']
 		if reason:
@@ -182,16 +275,22 @@ class AliceWatchManager(Manager):
 
 
 	def onVadUp(self, deviceUid: str):
+		if not self._watchers.wants(2):
+			return
+
 		self.publish(payload={
-			'text': f'Up on device **{self.DeviceManager.getDevice(uid=deviceUid).displayName}**',
+			'text': f'Up on device **{self.deviceName(deviceUid)}**',
 			'component': 'Voice activity',
 			'verbosity': 2
 		})
 
 
 	def onVadDown(self, deviceUid: str):
+		if not self._watchers.wants(2):
+			return
+
 		self.publish(payload={
-			'text': f'Down on device **{self.DeviceManager.getDevice(uid=deviceUid).displayName}**',
+			'text': f'Down on device **{self.deviceName(deviceUid)}**',
 			'component': 'Voice activity',
 			'verbosity': 2
 		})
@@ -199,6 +298,9 @@ class AliceWatchManager(Manager):
 
 	# TODO Should support site configuration
 	def onConfigureIntent(self, intents: list):
+		if not self._watchers.wants(1):
+			return
+
 		text = f'Was asked to configure all devices:'
 		for intent in intents:  # NOSONAR
 			text = f'{text}\n[=>]{"![green](enable)" if intent["enable"] else "![red](disable)"} {intent["intentId"]}'
@@ -213,6 +315,9 @@ class AliceWatchManager(Manager):
 
 
 	def onNluQuery(self, session):
+		if not self._watchers.wants(2):
+			return
+
 		self.publish(payload={
 			'text': f'Was asked to parse input "![yellow]({session.payload.get("input", "")}")',
 			'component': 'Nlu',
@@ -221,7 +326,9 @@ class AliceWatchManager(Manager):
 
 
 	def publish(self, payload: dict = None):
-		topic = f'projectalice/logging/alicewatch'
+		if not self._watchers.wants(payload['verbosity']):
+			return
+
 		payload['time'] = datetime.strftime(datetime.now(), '%H:%M:%S')
 
-		self.MqttManager.publish(topic=topic, payload=payload)
+		self.MqttManager.publish(topic=constants.TOPIC_ALICE_WATCH, payload=payload)
@@ -1,27 +1,57 @@
+import queue
 import sqlite3
+import threading
 import time
 import typing
+from concurrent.futures import Future
+from functools import lru_cache
 from pathlib import Path
 
 from core.ProjectAliceExceptions import DbConnectionError, InvalidQuery
 from core.base.model.Manager import Manager
 from core.commons import constants
 from core.commons.CommonsManager import CommonsManager
+from core.util.model.DatabaseWrite import DatabaseWrite
 
 
 # noinspection SqlResolve
 class DatabaseManager(Manager):
 
 	TABLE_TAG = ':__table__'
+	SYNCHRONOUS_LEVELS = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+	CACHED_STATEMENTS = 256
 
 	def __init__(self):
 		super().__init__()
 		self._tables = list()
 
+		# One connection per thread, kept open. Sqlite connections cannot be shared between threads
+		self._local = threading.local()
+		self._connections: typing.Dict[int, typing.Tuple[threading.Thread, sqlite3.Connection]] = dict()
+		self._connectionsLock = threading.Lock()
+		self._generation = 0
+
+		# Opt in write behind, writes are queued and committed in groups by a single writer thread
+		self._writeQueue: queue.Queue = queue.Queue()
+		self._writer: typing.Optional[threading.Thread] = None
+		self._writeBehind = False
+		self._writeBehindLock = threading.Lock()
+
 
 	def onStart(self):
 		super().onStart()
 		self.fetchTables()
+		self.updateWriteBehind()
+
+
+	def onStop(self):
+		super().onStop()
+		self.stopWriteBehind()
+		self.closeConnections(force=True)
+
+
+	def onQuarterHour(self):
+		self.pruneConnections()
 
 
 	def fetchTables(self):
@@ -31,33 +61,109 @@ class DatabaseManager(Manager):
 			cursor.execute("SELECT name FROM main.sqlite_master WHERE type = 'table' and name NOT LIKE 'sqlite_%'")
 			self._tables = cursor.fetchall()
 			cursor.close()
-			database.close()
 		except sqlite3.Error as e:
 			self.logError(f'Something went wrong fetching database tables: {e}')
 			try:
 				cursor.close()
-				database.close()
 			except:
 				pass  # what else is there to do?
 			return False
 
 
 	def clearDB(self):
+		self.closeConnections(force=True)
 		Path(self.Commons.rootDir(), 'system/database/data.db').unlink()
 
 
 	def getConnection(self) -> sqlite3.Connection:
+		"""
+		Returns the connection of the calling thread, opening it if needed.
+		Do not close it, it is reused by every following query of that thread
+		:return: sqlite3.Connection
+		"""
+		if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
+			self.logDebug(f'DB lock aquired by {CommonsManager.getFunctionCaller(depth=5)}->{CommonsManager.getFunctionCaller(depth=4)}->{CommonsManager.getFunctionCaller(depth=3)}')
+
+		con = getattr(self._local, 'connection', None)
+		if con and self._local.generation == self._generation:
+			return con
+
+		if con:
+			self._closeConnection(threading.get_ident())
+
 		try:
-			if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-				self.logDebug(f'DB lock aquired by {CommonsManager.getFunctionCaller(depth=5)}->{CommonsManager.getFunctionCaller(depth=4)}->{CommonsManager.getFunctionCaller(depth=3)}')
-			con = sqlite3.connect(constants.DATABASE_FILE, timeout=10)
+			con = sqlite3.connect(constants.DATABASE_FILE, timeout=10, check_same_thread=False, cached_statements=self.CACHED_STATEMENTS)
+			con.row_factory = sqlite3.Row
+			con.execute('PRAGMA journal_mode=WAL')
+			con.execute(f'PRAGMA synchronous={self.synchronousLevel}')
 		except sqlite3.Error as e:
 			self.logError(f'Failed to connect to DB ({constants.DATABASE_FILE}): {e}')
 			raise DbConnectionError()
-		con.row_factory = sqlite3.Row
+
+		self._local.connection = con
+		self._local.generation = self._generation
+		with self._connectionsLock:
+			self._connections[threading.get_ident()] = (threading.current_thread(), con)
+
 		return con
 
 
+	@property
+	def synchronousLevel(self) -> str:
+		level = str(self.ConfigManager.getAliceConfigByName('databaseSynchronous') or 'NORMAL').upper()
+		return level if level in self.SYNCHRONOUS_LEVELS else 'NORMAL'
+
+
+	def closeConnections(self, force: bool = False):
+		"""
+		Invalidates the pooled connections, each thread reopens its own on next query.
+		:param force: close every connection right now, only safe when no query can be running, on stop for example
+		"""
+		self._generation += 1
+
+		if not force:
+			return
+
+		with self._connectionsLock:
+			connections = list(self._connections.values())
+			self._connections = dict()
+
+		for _, con in connections:
+			try:
+				con.close()
+			except sqlite3.Error:
+				pass  # Nothing to do, we are leaving anyway
+
+		self._local = threading.local()
+
+
+	def pruneConnections(self):
+		"""
+		Closes the connections left behind by threads that ended
+		"""
+		with self._connectionsLock:
+			dead = [ident for ident, (thread, _) in self._connections.items() if not thread.is_alive()]
+
+		for ident in dead:
+			self._closeConnection(ident)
+
+		if dead:
+			self.logDebug(f'Closed {len(dead)} database connection of ended threads', plural='connection')
+
+
+	def _closeConnection(self, ident: int):
+		with self._connectionsLock:
+			_, con = self._connections.pop(ident, (None, None))
+
+		if not con:
+			return
+
+		try:
+			con.close()
+		except sqlite3.Error:
+			pass  # Was closed already
+
+
 	def initDB(self, schema: dict, callerName: str) -> bool:
 		database = self.getConnection()
 		cursor = database.cursor()
@@ -166,7 +272,6 @@ class DatabaseManager(Manager):
 			ret = False
 		finally:
 			cursor.close()
-			database.close()
 		return ret
 
 
@@ -180,11 +285,11 @@ class DatabaseManager(Manager):
 			database.commit()
 		except sqlite3.Error as e:
 			self.logError(f'Failed dropping table **{tableName}** for component **{callerName}**: {e}')
+			database.rollback()
 			ret = False
 		finally:
 			try:
 				cursor.close()
-				database.close()
 			except:
 				pass  # Well, what's to do here....
 
@@ -232,7 +337,7 @@ class DatabaseManager(Manager):
 
 		try:
 			try:
-				startTime = time.time()
+				startTime = time.perf_counter()
 				cursor.execute(query, values)
 				insertId = cursor.lastrowid
 			except DbConnectionError as e:
@@ -244,8 +349,7 @@ class DatabaseManager(Manager):
 				raise
 			else:
 				database.commit()
-				if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-					self.logDebug(f'It took {time.time() - startTime} seconds to INSERT {tableName} DB ')
+				self.profile('insert', startTime, tableName)
 		except Exception as e:
 			exception = e
 
@@ -253,10 +357,6 @@ class DatabaseManager(Manager):
 			cursor.close()
 		except Exception as e:
 			self.logError(f'FATAL ERROR: {e}')
-		try:
-			database.close()
-		except Exception as e:
-			self.logError(f'FATAL ERROR: {e}')
 
 		if insertId is not None and not exception:
 			return insertId
@@ -273,7 +373,8 @@ class DatabaseManager(Manager):
 
 		if not query:
 			updates = [f'{col} = :{col}' for col in values.keys()]
-			query = f'UPDATE :__table__ SET {" ,".join(updates)} WHERE {row[0]} = "{row[1]}"'
+			query = f'UPDATE :__table__ SET {" ,".join(updates)} WHERE {row[0]} = :__rowValue'
+			values = {**values, '__rowValue': row[1]}
 
 		query = self.basicChecks(tableName, query, callerName, values)
 		if not query:
@@ -285,21 +386,20 @@ class DatabaseManager(Manager):
 
 		try:
 			try:
-				startTime = time.time()
+				startTime = time.perf_counter()
 				cursor.execute(query, values)
 			except (DbConnectionError, sqlite3.Error) as e:
 				self.logWarning(f'Error updating data for component **{callerName}** in table **{tableName}**: {e}')
+				database.rollback()
 				raise
 			else:
 				database.commit()
-				if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-					self.logDebug(f'It took {time.time() - startTime} seconds to UPDATE to {tableName} DB ')
+				self.profile('update', startTime, tableName)
 		except:
 			ret = False
 		finally:
 			try:
 				cursor.close()
-				database.close()
 			except:
 				pass  # what else is there to do??
 
@@ -328,7 +428,7 @@ class DatabaseManager(Manager):
 		data = dict()
 
 		try:
-			startTime = time.time()
+			startTime = time.perf_counter()
 			cursor.execute(query, values)
 
 			if method == 'one':
@@ -336,14 +436,12 @@ class DatabaseManager(Manager):
 			else:
 				data = cursor.fetchall()
 
-			if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-				self.logDebug(f'It took {time.time() - startTime} seconds to FETCH from {tableName} DB ')
+			self.profile('fetch', startTime, tableName)
 		except (DbConnectionError, sqlite3.Error) as e:
 			self.logWarning(f'Error fetching data for component **{callerName}** in table **{tableName}**: {e}')
 		finally:
 			try:
 				cursor.close()
-				database.close()
 			except:
 				pass  # Well, what's to do here....
 
@@ -361,7 +459,7 @@ class DatabaseManager(Manager):
 			values = dict()
 
 		if not query:
-			where = 'AND '.join([f'{k} = "{v}"' for k, v in values.items()])
+			where = ' AND '.join([f'{k} = :{k}' for k in values])
 			query = f'DELETE FROM :__table__ WHERE {where}'
 
 		query = self.basicChecks(tableName, query, callerName)
@@ -370,22 +468,16 @@ class DatabaseManager(Manager):
 
 		database = self.getConnection()
 		try:
-			startTime = time.time()
+			startTime = time.perf_counter()
 			database.execute(query, values)
 			database.commit()
-			if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-				self.logDebug(f'It took {time.time() - startTime} seconds to DELETE in {tableName} DB ')
+			self.profile('delete', startTime, tableName)
 		except DbConnectionError as e:
 			self.logWarning(f'Error deleting from table **{tableName}** for component **{callerName}**: {e}')
 		except sqlite3.Error as e:
 			self.logWarning(f'Error deleting from table **{tableName}** for component **{callerName}**: {e}')
 			database.rollback()
 
-		try:
-			database.close()
-		except:
-			pass  # Well, what's to do here....
-
 
 	# noinspection SqlResolve
 	def prune(self, tableName: str, callerName: str):
@@ -403,18 +495,252 @@ class DatabaseManager(Manager):
 
 		database = self.getConnection()
 		try:
-			startTime = time.time()
+			startTime = time.perf_counter()
 			database.execute(query)
 			database.commit()
-			if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
-				self.logDebug(f'It took {time.time() - startTime} seconds to PRUNE {tableName} DB ')
+			self.profile('prune', startTime, tableName)
 		except DbConnectionError as e:
 			self.logWarning(f'Error pruning table **{tableName}** for component **{callerName}**: {e}')
 		except sqlite3.Error as e:
 			self.logWarning(f'Error pruning table **{tableName}** for component **{callerName}**: {e}')
 			database.rollback()
-		finally:
-			database.close()
+
+
+	def insertLater(self, tableName: str, query: str = None, callerName: str = None, values: dict = None) -> Future:
+		"""
+		Same as insert, but queued for a grouped commit if write behind is enabled.
+		Data is not readable before the returned future is done
+		:return: Future, resolving to the inserted row id once committed
+		"""
+		if not values:
+			raise Exception('Cannot DB insert without values...')
+
+		if not callerName:
+			callerName = self.Commons.getFunctionCaller()
+
+		if not self._writeBehind:
+			return self._runNow(self.insert, tableName=tableName, query=query, callerName=callerName, values=values)
+
+		if not query:
+			cols = ', '.join(values)
+			data = ', :'.join(values)
+			query = f'INSERT INTO :__table__ ({cols}) VALUES (:{data})'
+
+		query = self.basicChecks(tableName, query, callerName, values)
+		if not query:
+			raise InvalidQuery
+
+		return self._enqueueWrite(DatabaseWrite(tableName=tableName, callerName=callerName, query=query, values=values, isInsert=True))
+
+
+	def replaceLater(self, tableName: str, query: str = None, callerName: str = None, values: dict = None) -> Future:
+		"""
+		Same as replace, but queued for a grouped commit if write behind is enabled
+		:return: Future, resolving to the row id once committed
+		"""
+		if not query and values:
+			cols = ', '.join(values)
+			data = ', :'.join(values)
+			query = f'REPLACE INTO :__table__ ({cols}) VALUES (:{data})'
+
+		return self.insertLater(tableName, query, callerName, values)
+
+
+	def updateLater(self, tableName: str, callerName: str, values: dict = None, query: str = None, row: tuple = None) -> Future:
+		"""
+		Same as update, but queued for a grouped commit if write behind is enabled
+		:return: Future, resolving to True once committed, False if the update failed
+		"""
+		if not self._writeBehind:
+			return self._runNow(self.update, tableName=tableName, callerName=callerName, values=values, query=query, row=row)
+
+		if not query and not values:
+			self.logWarning('Cannot update database with neither query or values set')
+			return self._done(False)
+
+		if not query:
+			updates = [f'{col} = :{col}' for col in values.keys()]
+			query = f'UPDATE :__table__ SET {" ,".join(updates)} WHERE {row[0]} = :__rowValue'
+			values = {**values, '__rowValue': row[1]}
+
+		query = self.basicChecks(tableName, query, callerName, values)
+		if not query:
+			raise InvalidQuery
+
+		return self._enqueueWrite(DatabaseWrite(tableName=tableName, callerName=callerName, query=query, values=values or dict()))
+
+
+	def updateWriteBehind(self):
+		"""
+		Starts or stops the write behind writer thread, according to the settings
+		"""
+		if self.ConfigManager.getAliceConfigByName('databaseWriteBehind'):
+			self.startWriteBehind()
+		else:
+			self.stopWriteBehind()
+
+
+	def startWriteBehind(self):
+		if self._writeBehind:
+			return
+
+		self._writeBehind = True
+		self._writer = self.ThreadManager.newThread(name='databaseWriter', target=self._writeBehindWorker)
+		self.logInfo('Write behind enabled')
+
+
+	def stopWriteBehind(self):
+		"""
+		Stops the writer thread once everything queued is committed. Writes are synchronous again afterwards
+		"""
+		if not self._writeBehind:
+			return
+
+		with self._writeBehindLock:
+			self._writeBehind = False
+			self._writeQueue.put(None)
+
+		if self._writer and self._writer is not threading.current_thread():
+			self._writer.join()
+
+		self._writer = None
+
+		# Writes queued while we were stopping
+		leftovers = list()
+		while not self._writeQueue.empty():
+			write = self._writeQueue.get(block=False)
+			if write:
+				leftovers.append(write)
+
+		if leftovers:
+			self._flushWrites(leftovers)
+
+		self.logInfo('Write behind disabled, all writes committed')
+
+
+	def _enqueueWrite(self, write: DatabaseWrite) -> Future:
+		with self._writeBehindLock:
+			if self._writeBehind:
+				self._writeQueue.put(write)
+				return write.future
+
+		# Write behind was stopped since the caller checked, nobody would ever flush the queue
+		self._flushWrites([write])
+		return write.future
+
+
+	def _writeBehindWorker(self):
+		maxRows = max(1, int(self.ConfigManager.getAliceConfigByName('databaseWriteBehindRows') or 100))
+		maxDelay = max(0, int(self.ConfigManager.getAliceConfigByName('databaseWriteBehindDelay') or 500)) / 1000
+
+		while True:
+			write = self._writeQueue.get()
+			if write is None:
+				return
+
+			batch = [write]
+			stopping = False
+			deadline = time.monotonic() + maxDelay
+
+			while len(batch) < maxRows:
+				timeout = deadline - time.monotonic()
+				if timeout <= 0:
+					break
+
+				try:
+					write = self._writeQueue.get(timeout=timeout)
+				except queue.Empty:
+					break
+
+				if write is None:
+					stopping = True
+					break
+
+				batch.append(write)
+
+			self._flushWrites(batch)
+
+			if stopping:
+				return
+
+
+	def _flushWrites(self, batch: typing.List[DatabaseWrite]):
+		"""
+		Commits a batch of writes in one single transaction, then resolves their futures
+		"""
+		startTime = time.perf_counter()
+		results = list()
+
+		try:
+			database = self.getConnection()
+			for write in batch:
+				try:
+					cursor = database.execute(write.query, write.values)
+					results.append((write, cursor.lastrowid if write.isInsert else True))
+				except sqlite3.Error as e:
+					self.logWarning(f'Error writing data for component **{write.callerName}** in table **{write.tableName}**: {e}')
+					results.append((write, e))
+
+			database.commit()
+		except (DbConnectionError, sqlite3.Error) as e:
+			self.logError(f'Failed committing {len(batch)} queued database writes: {e}')
+			try:
+				database.rollback()
+			except Exception:
+				pass  # Connection failed, nothing to rollback
+
+			for write in batch:
+				if write.isInsert:
+					write.future.set_exception(e)
+				else:
+					write.future.set_result(False)
+			return
+
+		for write, result in results:
+			if not isinstance(result, Exception):
+				write.future.set_result(result)
+			elif write.isInsert:
+				write.future.set_exception(result)
+			else:
+				write.future.set_result(False)
+
+		self.profile('flush', startTime, f'{len(batch)} queued writes')
+
+
+	def profile(self, operation: str, startTime: float, target: str):
+		"""
+		Records how long a database operation took in the metrics, and logs it if database profiling is enabled
+		:param operation: str, ex. 'insert'
+		:param startTime: float, the operation perf_counter start time
+		:param target: str, what the operation was run on, usually the table name
+		"""
+		elapsed = time.perf_counter() - startTime
+		self.MetricsManager.observe('alice_db_seconds', elapsed, operation)
+
+		if self.ConfigManager.getAliceConfigByName('databaseProfiling'):
+			self.logDebug(f'It took {elapsed} seconds to {operation.upper()} {target}')
+
+
+	@staticmethod
+	def _runNow(func: typing.Callable, **kwargs) -> Future:
+		future = Future()
+		try:
+			future.set_result(func(**kwargs))
+		except Exception as e:
+			future.set_exception(e)
+		return future
+
+
+	@staticmethod
+	def _done(result: typing.Any) -> Future:
+		future = Future()
+		future.set_result(result)
+		return future
+
+
+	@property
+	def writeBehind(self) -> bool:
+		return self._writeBehind
 
 
 	def basicChecks(self, tableName: str, query: str, callerName: str, values: dict = None) -> typing.Optional[str]:
@@ -428,4 +754,14 @@ class DatabaseManager(Manager):
 			self.logWarning(f"Cannot use reserved sqlite keyword \":__table__\". Caller: {callerName}")
 			return None
 		else:
-			return query.replace(self.TABLE_TAG, callerName + '_' + tableName)
+			return self.resolveQuery(query, f'{callerName}_{tableName}')
+
+
+	@staticmethod
+	@lru_cache(maxsize=512)
+	def resolveQuery(query: str, fullTableName: str) -> str:
+		"""
+		Resolves the table tag of a statement. The same few statements are run over and over, cache them.
+		Their final text is then stable, which is what the sqlite statement cache of the pooled connections is keyed on
+		"""
+		return query.replace(DatabaseManager.TABLE_TAG, fullTableName)
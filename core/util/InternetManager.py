@@ -6,6 +6,9 @@ from core.commons import constants
 
 class InternetManager(Manager):
 
+	# Seconds, a check must not hold its worker while the network hangs
+	CHECK_TIMEOUT = 5
+
 	def __init__(self):
 		super().__init__()
 		self._online = False
@@ -37,7 +40,7 @@ class InternetManager(Manager):
 
 	def checkInternet(self):
 		self.checkOnlineState()
-		self.ThreadManager.doLater(interval=self._checkFrequency, func=self.checkInternet)
+		self.ThreadManager.doLater(interval=self._checkFrequency, func=self.checkInternet, background=True)
 
 
 	def checkOnlineState(self, addr: str = 'https://clients3.google.com/generate_204', silent: bool = False) -> bool:
@@ -45,7 +48,7 @@ class InternetManager(Manager):
 			return False
 
 		try:
-			online = requests.get(addr).status_code == 204
+			online = requests.get(addr, timeout=self.CHECK_TIMEOUT).status_code == 204
 		except:
 			online = False
 
@@ -0,0 +1,207 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from core.base.model.Manager import Manager
+from core.commons import constants
+from core.util.model.Metrics import MetricsRegistry
+
+
+class MetricsManager(Manager):
+	"""
+	Latency and throughput metrics of Alice herself, served by the api on /metrics and summarized on the mqtt bus.
+	While metrics are disabled, recording one costs a single attribute check
+	"""
+
+	START_DEPENDENCIES = ['ThreadManager']
+
+	# Spans that never end, a wakeword with no intent following, are dropped oldest first
+	MAX_SPANS = 64
+
+	REAL_TIME_FACTOR_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+	def __init__(self):
+		super().__init__()
+		self._registry = MetricsRegistry()
+		self._spans: Dict[Tuple[str, str], float] = dict()
+		self._spansLock = threading.Lock()
+		self._summaryTimer = None
+
+		registry = self._registry
+		registry.histogram('alice_broadcast_seconds', 'Time taken dispatching an event to the managers and skills', ['event'])
+		registry.histogram('alice_mqtt_message_seconds', 'Time from receiving a mqtt message to the end of its handling', ['queue'])
+		registry.histogram('alice_wake_to_intent_seconds', 'Time from the wakeword detection to the parsed intent')
+		registry.histogram('alice_intent_to_say_seconds', 'Time from the parsed intent to the say request')
+		registry.histogram('alice_db_seconds', 'Database operations execution time', ['operation'])
+		registry.histogram('alice_asr_real_time_factor', 'Decoding time divided by the recorded audio duration', ['asr'], buckets=self.REAL_TIME_FACTOR_BUCKETS)
+		registry.histogram('alice_tts_synthesis_seconds', 'Time taken synthesizing speech that was not cached', ['tts'])
+		registry.counter('alice_cache_hits_total', 'Cache hits', ['cache'])
+		registry.counter('alice_cache_misses_total', 'Cache misses', ['cache'])
+		registry.gauge('alice_cache_hit_ratio', 'Cache hits divided by the cache lookups', ['cache'])
+		registry.gauge('alice_worker_queue_depth', 'Tasks waiting in a worker queue', ['queue'])
+		registry.counter('alice_worker_tasks_total', 'Tasks handled by a worker queue', ['queue', 'state'])
+		registry.gauge('alice_timers_pending', 'Timers waiting to fire')
+		registry.counter('alice_timers_executed_total', 'Timers fired')
+
+		registry.addCollector(self.collectCaches)
+		registry.addCollector(self.collectWorkers)
+
+
+	def onStart(self):
+		super().onStart()
+		self.updateMetrics()
+
+
+	def onStop(self):
+		super().onStop()
+		self.ThreadManager.removeTimer(self._summaryTimer)
+		self._summaryTimer = None
+
+
+	def updateMetrics(self):
+		"""
+		Applies the metrics settings, called again whenever they change
+		"""
+		enabled = bool(self.ConfigManager.getAliceConfigByName('enableMetrics'))
+		if not enabled:
+			self._registry.clear()
+			with self._spansLock:
+				self._spans.clear()
+
+		self._registry.enabled = enabled
+
+		self.ThreadManager.removeTimer(self._summaryTimer)
+		self._summaryTimer = None
+
+		try:
+			interval = int(self.ConfigManager.getAliceConfigByName('metricsSummaryInterval') or 0)
+		except ValueError:
+			interval = 0
+
+		if enabled and interval > 0:
+			self._summaryTimer = self.ThreadManager.doEvery(interval=interval, func=self.publishSummary)
+
+
+	@property
+	def enabled(self) -> bool:
+		return self._registry.enabled
+
+
+	@property
+	def registry(self) -> MetricsRegistry:
+		return self._registry
+
+
+	def observe(self, name: str, value: float, *labels):
+		"""
+		Records a value in a histogram
+		:param name: str, the histogram name, ex. 'alice_db_seconds'
+		:param value: float
+		:param labels: the label values, in the order of the histogram labels
+		"""
+		if self._registry.enabled:
+			self._registry.get(name).observe(value, *labels)
+
+
+	def inc(self, name: str, *labels, amount: float = 1.0):
+		if self._registry.enabled:
+			self._registry.get(name).inc(*labels, amount=amount)
+
+
+	def setGauge(self, name: str, value: float, *labels):
+		if self._registry.enabled:
+			self._registry.get(name).set(value, *labels)
+
+
+	def startSpan(self, name: str, key: str):
+		"""
+		Starts timing something that ends in another place, ex. from the wakeword to the intent
+		:param name: str, the histogram the span is recorded in
+		:param key: str, ties the end of the span to its start, ex. a device uid or a session id
+		"""
+		if not self._registry.enabled:
+			return
+
+		with self._spansLock:
+			self._spans.pop((name, key), None)
+			self._spans[(name, key)] = time.perf_counter()
+			if len(self._spans) > self.MAX_SPANS:
+				self._spans.pop(next(iter(self._spans)))
+
+
+	def endSpan(self, name: str, key: str, *labels) -> Optional[float]:
+		"""
+		Records the time since the span was started, if it was
+		:return: float, the span duration in seconds, None if it wasn't started
+		"""
+		if not self._registry.enabled:
+			return None
+
+		with self._spansLock:
+			startTime = self._spans.pop((name, key), None)
+
+		if startTime is None:
+			return None
+
+		elapsed = time.perf_counter() - startTime
+		self._registry.get(name).observe(elapsed, *labels)
+		return elapsed
+
+
+	def collectCaches(self):
+		caches = dict()
+		if self.TTSManager:
+			stats = self.TTSManager.ttsCache.stats
+			caches['tts'] = (stats['hits'], stats['misses'])
+
+		if self.WidgetManager:
+			stats = self.WidgetManager.assets.stats
+			caches['widgets'] = (stats['hits'] + stats['loaded'], stats['compiled'])
+
+		hits = self._registry.get('alice_cache_hits_total')
+		misses = self._registry.get('alice_cache_misses_total')
+		ratio = self._registry.get('alice_cache_hit_ratio')
+		for cache, (hitCount, missCount) in caches.items():
+			hits.set(hitCount, cache)
+			misses.set(missCount, cache)
+			ratio.set(hitCount / (hitCount + missCount) if hitCount + missCount else 0, cache)
+
+
+	def collectWorkers(self):
+		if not self.ThreadManager:
+			return
+
+		depth = self._registry.get('alice_worker_queue_depth')
+		tasks = self._registry.get('alice_worker_tasks_total')
+		for queue, stats in self.ThreadManager.taskStats.items():
+			depth.set(stats['depth'], queue)
+			for state in ('completed', 'failed', 'rejected'):
+				tasks.set(stats[state], queue, state)
+
+		stats = self.ThreadManager.timerStats
+		self._registry.get('alice_timers_pending').set(stats['pending'])
+		self._registry.get('alice_timers_executed_total').set(stats['executed'])
+
+
+	def render(self) -> str:
+		"""
+		The metrics in the Prometheus text format
+		"""
+		self._registry.collect(onError=self.onCollectorError)
+		return self._registry.render()
+
+
+	def summary(self) -> Dict[str, dict]:
+		self._registry.collect(onError=self.onCollectorError)
+		return self._registry.summary()
+
+
+	def publishSummary(self):
+		if not self._registry.enabled:
+			return
+
+		self.MqttManager.publish(topic=constants.TOPIC_METRICS_SUMMARY, payload={'timestamp': round(time.time()), 'metrics': self.summary()})
+
+
+	def onCollectorError(self, collector, exception: Exception):
+		self.logWarning(f'Failed collecting metrics from **{getattr(collector, "__name__", collector)}**: {exception}')
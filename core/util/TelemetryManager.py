@@ -139,8 +139,10 @@ class TelemetryManager(Manager):
 		if not self.currentValue(ttype, value, service, deviceId,timestamp, locationId):
 			return False
 
-		self.databaseInsert(
+		# Nothing reads this row back right away, let it be committed with the next batch
+		self.DatabaseManager.insertLater(
 			tableName='telemetry',
+			callerName=self.name,
 			query='INSERT INTO :__table__ (type, value, service, deviceId, timestamp, locationId) VALUES (:type, :value, :service, :deviceId, :timestamp, :locationId)',
 			values={'type': ttype.value, 'value': value, 'service': service, 'deviceId': deviceId, 'timestamp': round(timestamp), 'locationId': locationId}
 		)
@@ -1,4 +1,6 @@
+import functools
 import threading
+from concurrent.futures import Future
 from typing import Callable
 
 from core.base.model.Manager import Manager
@@ -6,6 +8,8 @@ from core.util.Decorators import IfSetting
 from core.util.model.AliceEvent import AliceEvent
 from core.util.model.MemoryProfiler import MemoryProfiler
 from core.util.model.ThreadTimer import ThreadTimer
+from core.util.model.TimerScheduler import TimerScheduler
+from core.util.model.WorkerPool import WorkerPool
 
 
 class ThreadManager(Manager):
@@ -13,7 +17,8 @@ class ThreadManager(Manager):
 	def __init__(self):
 		super().__init__()
 
-		self._timers = list()
+		self._scheduler = TimerScheduler(onError=self.onTimerError)
+		self._workerPool = WorkerPool(onError=self.onTaskError)
 		self._threads = dict()
 		self._events = dict()
 		self._memProfiler = MemoryProfiler()
@@ -21,9 +26,8 @@ class ThreadManager(Manager):
 
 	def onStop(self):
 		super().onStop()
-		for timer in self._timers:
-			if timer.timer.isAlive():
-				timer.timer.cancel()
+		self._scheduler.stop()
+		self._workerPool.stop()
 
 		for thread in self._threads.values():
 			if thread.isAlive():
@@ -46,36 +50,37 @@ class ThreadManager(Manager):
 
 
 	def onQuarterHour(self):
-		deadTimers = 0
 		deadThreads = 0
-		timers = self._timers.copy()
-		for threadTimer in timers:
-			if not threadTimer.timer.isAlive():
-				self._timers.remove(threadTimer)
-				deadTimers += 1
-
 		threads = self._threads.copy()
 		for threadName, thread in threads.items():
 			if not thread.is_alive():
 				self._threads.pop(threadName, None)
 				deadThreads += 1
 
-		if deadTimers > 0:
-			self.logInfo(f'Cleaned {deadTimers} dead timer', 'timer')
-
 		if deadThreads > 0:
 			self.logInfo(f'Cleaned {deadThreads} dead thread', 'thread')
 
 
-	def newTimer(self, interval: float, func: Callable, autoStart: bool = True, args: list = None, kwargs: dict = None) -> threading.Timer:
-		args = args or list()
-		kwargs = kwargs or dict()
-
-		threadTimer = ThreadTimer(callback=func, args=args, kwargs=kwargs)
-		timer = threading.Timer(interval=interval, function=self.onTimerEnd, args=[threadTimer])
-		timer.daemon = True
-		threadTimer.timer = timer
-		self._timers.append(threadTimer)
+	def newTimer(self, interval: float, func: Callable, autoStart: bool = True, args: list = None, kwargs: dict = None, periodic: bool = False, background: bool = False) -> ThreadTimer:
+		"""
+		Runs func after interval seconds, from the timer scheduler's worker pool rather than a thread of its own.
+		The timer workers are few and shared by every timer, such as the session timeouts, so anything that may block,
+		network calls, broadcasts to skills or trainings, has to be run in background
+		:param interval: float, seconds
+		:param func: callable
+		:param autoStart: bool, if False call start() on the returned timer to schedule it
+		:param args: list
+		:param kwargs: dict
+		:param periodic: bool, run func every interval seconds until the timer is canceled
+		:param background: bool, once due, hand func over to the background worker queue instead of running it on a timer worker
+		:return: ThreadTimer, to cancel it, already cancelled if the manager was stopped
+		"""
+		callback = functools.partial(self.submit, 'background', func) if background else func
+		timer = ThreadTimer(callback=callback, args=args or list(), kwargs=kwargs or dict(), interval=interval, periodic=periodic, scheduler=self._scheduler)
+
+		# Same as the worker pool, never started again once stopped, timers asked for during shutdown never run
+		if not self._scheduler.running and self.isActive:
+			self._scheduler.start(workers=self.timerWorkers())
 
 		if autoStart:
 			timer.start()
@@ -83,27 +88,64 @@ class ThreadManager(Manager):
 		return timer
 
 
-	def doLater(self, interval: float, func: Callable, args: list = None, kwargs: dict = None):
-		self.newTimer(interval=interval, func=func, args=args, kwargs=kwargs)
+	def doLater(self, interval: float, func: Callable, args: list = None, kwargs: dict = None, background: bool = False):
+		self.newTimer(interval=interval, func=func, args=args, kwargs=kwargs, background=background)
 
 
-	def onTimerEnd(self, timer: ThreadTimer):
-		if not timer or not timer.callback:
-			return
+	def doEvery(self, interval: float, func: Callable, args: list = None, kwargs: dict = None, background: bool = False) -> ThreadTimer:
+		return self.newTimer(interval=interval, func=func, args=args, kwargs=kwargs, periodic=True, background=background)
 
-		timer.callback(*timer.args, **timer.kwargs)
-		self.removeTimer(timer)
+
+	def onTimerError(self, timer: ThreadTimer, exception: Exception):
+		self.logError(f'Error in timer callback **{getattr(timer.callback, "__qualname__", timer.callback)}**: {exception}')
 
 
 	def removeTimer(self, timer: ThreadTimer):
-		if not timer or not timer.callback:
-			return
+		if timer:
+			timer.cancel()
+
+
+	def timerWorkers(self) -> int:
+		try:
+			return max(1, int(self.ConfigManager.getAliceConfigByName('timerWorkers') or 4))
+		except ValueError:
+			return 4
+
+
+	@property
+	def timerStats(self) -> dict:
+		return self._scheduler.stats
+
+
+	def submit(self, queueName: str, func: Callable, *args, priority: int = 0, **kwargs) -> Future:
+		"""
+		Runs func on one of the worker pool queues: audio, dialog or background
+		:param queueName: str
+		:param func: callable
+		:param priority: int, lower runs first among the tasks waiting in that queue
+		:return: Future, failed if the manager was stopped
+		"""
+		# Started on first use, as managers start in parallel, but never again once stopped: the pool then fails the submissions
+		if not self._workerPool.running and self.isActive:
+			self._workerPool.start(workers={'background': self.backgroundWorkers()})
+
+		return self._workerPool.submit(queueName, func, *args, priority=priority, **kwargs)
+
+
+	def onTaskError(self, queueName: str, func: Callable, exception: Exception):
+		self.logError(f'Error in {queueName} task **{getattr(func, "__qualname__", func)}**: {exception}')
+
+
+	def backgroundWorkers(self) -> int:
+		try:
+			return max(1, int(self.ConfigManager.getAliceConfigByName('backgroundWorkers') or 4))
+		except ValueError:
+			return 4
 
-		if timer.timer.is_alive():
-			timer.timer.cancel()
 
-		if timer in self._timers:
-			self._timers.remove(timer)
+	@property
+	def taskStats(self) -> dict:
+		return self._workerPool.stats
 
 
 	def newThread(self, name: str, target: Callable, autostart: bool = True, args: list = None, kwargs: dict = None) -> threading.Thread:
@@ -0,0 +1,69 @@
+import threading
+import time
+from typing import Dict, Tuple
+
+
+class AliceWatchers:
+	"""
+	Keeps track of the AliceWatch viewers and of the verbosity they asked for. Viewers have to renew their
+	subscription before it expires, so that a closed page doesn't keep Alice formatting messages for nobody.
+	Unless on demand, every message is wanted, whether or not a viewer subscribed
+	"""
+
+	def __init__(self, ttl: float = 30, onDemand: bool = False):
+		"""
+		:param ttl: float, seconds a subscription lasts without being renewed
+		:param onDemand: bool, whether messages are only wanted by subscribed viewers
+		"""
+		self.onDemand = onDemand
+		self._ttl = ttl
+		self._watchers: Dict[str, Tuple[int, float]] = dict()
+		self._maxVerbosity = -1
+		self._expiresAt = 0.0
+		self._lock = threading.Lock()
+
+
+	def subscribe(self, uid: str, verbosity: int, now: float = None):
+		with self._lock:
+			self._watchers[uid] = (verbosity, (now or time.monotonic()) + self._ttl)
+			self._refresh(now)
+
+
+	def unsubscribe(self, uid: str):
+		with self._lock:
+			if self._watchers.pop(uid, None):
+				self._refresh()
+
+
+	def wants(self, verbosity: int, now: float = None) -> bool:
+		"""
+		Whether any watcher would display a message of the given verbosity
+		"""
+		return not self.onDemand or verbosity <= self.maxVerbosity(now)
+
+
+	def maxVerbosity(self, now: float = None) -> int:
+		"""
+		The highest verbosity asked by the watchers, -1 if there are none
+		"""
+		if self._maxVerbosity < 0:
+			return -1
+
+		if (now or time.monotonic()) >= self._expiresAt:
+			with self._lock:
+				self._refresh(now)
+
+		return self._maxVerbosity
+
+
+	def _refresh(self, now: float = None):
+		# Caller holds the lock
+		now = now or time.monotonic()
+		self._watchers = {uid: watcher for uid, watcher in self._watchers.items() if watcher[1] > now}
+		self._maxVerbosity = max((verbosity for verbosity, _ in self._watchers.values()), default=-1)
+		self._expiresAt = min((expiry for _, expiry in self._watchers.values()), default=0.0)
+
+
+	@property
+	def count(self) -> int:
+		return len(self._watchers)
@@ -0,0 +1,12 @@
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+
+@dataclass
+class DatabaseWrite:
+	tableName: str
+	callerName: str
+	query: str
+	values: dict
+	isInsert: bool = False
+	future: Future = field(default_factory=Future)
@@ -6,6 +6,16 @@ from typing import Match, Union
 
 class Logger:
 
+	LEVELS = {
+		'debug'   : logging.DEBUG,
+		'info'    : logging.INFO,
+		'warning' : logging.WARNING,
+		'error'   : logging.ERROR,
+		'critical': logging.CRITICAL,
+		'fatal'   : logging.FATAL
+	}
+	TAG_REGEX = re.compile(r'^(\[[\w ]+])(.*)$')
+
 	def __init__(self, prepend: str = None, **kwargs):
 		self._prepend = prepend
 		self._logger = logging.getLogger('ProjectAlice')
@@ -34,20 +44,24 @@ class Logger:
 
 
 	def logWarning(self, msg: str, printStack: bool = False, plural: Union[list, str] = None):
-		from core.base.SuperManager import SuperManager
-
-		if SuperManager.getInstance().configManager.getAliceConfigByName('debug'):
-			self.doLog(function='warning', msg=msg, printStack=True, plural=plural)
-		else:
-			self.doLog(function='warning', msg=msg, printStack=printStack, plural=plural)
+		# The debug setting is what sets the logger to debug level
+		self.doLog(function='warning', msg=msg, printStack=printStack or self._logger.isEnabledFor(logging.DEBUG), plural=plural)
 
 
 	def logCritical(self, msg: str, plural: Union[list, str] = None):
 		self.doLog(function='critical', msg=msg, plural=plural)
 
 
+	def isEnabled(self, function: str) -> bool:
+		"""
+		Whether logs of the given level would be output, to skip building messages that wouldn't
+		:param function: str, the level, as in doLog
+		"""
+		return self._logger.isEnabledFor(self.LEVELS.get(function, logging.NOTSET))
+
+
 	def doLog(self, function: callable, msg: str, printStack = True, plural: Union[list, str] = None):
-		if not msg:
+		if not msg or not self.isEnabled(function):
 			return
 
 		if plural:
@@ -56,11 +70,11 @@ class Logger:
 		if self._prepend:
 			msg = f'{self._prepend} {msg}'
 
-		match = re.match(r'^(\[[\w ]+])(.*)$', msg)
-		if match:
-			tag, log = match.groups()
-			space = ''.join([' ' for _ in range(25 - len(tag))])
-			msg = f'{tag}{space}{log}'
+		if msg.startswith('['):
+			match = self.TAG_REGEX.match(msg)
+			if match:
+				tag, log = match.groups()
+				msg = f'{tag.ljust(25)}{log}'
 
 		func = getattr(self._logger, function)
 		func(msg, exc_info=printStack)
@@ -0,0 +1,260 @@
+import bisect
+import math
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+
+class Metric:
+	"""
+	A named metric and its values, one per combination of label values.
+	Label values are given positionally, in the order of the label names
+	"""
+
+	TYPE = 'untyped'
+
+	def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+		"""
+		:param name: str, the metric name, ex. 'alice_db_seconds'
+		:param documentation: str, the help line of the metric
+		:param labels: the label names
+		"""
+		self.name = name
+		self.documentation = documentation
+		self.labelNames = tuple(labels)
+		self._values: Dict[tuple, float] = dict()
+		self._lock = threading.Lock()
+
+
+	def value(self, *labels) -> float:
+		return self._values.get(labels, 0.0)
+
+
+	def samples(self) -> List[Tuple[str, tuple, float]]:
+		"""
+		:return: list of sample name suffix, label pairs and value tuples
+		"""
+		with self._lock:
+			return [('', tuple(zip(self.labelNames, labels)), value) for labels, value in self._values.items()]
+
+
+	def summary(self) -> dict:
+		with self._lock:
+			return {','.join(labels): round(value, 6) for labels, value in self._values.items()}
+
+
+	def clear(self):
+		with self._lock:
+			self._values.clear()
+
+
+class Counter(Metric):
+	TYPE = 'counter'
+
+	def inc(self, *labels, amount: float = 1.0):
+		with self._lock:
+			self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+	def set(self, value: float, *labels):
+		"""
+		Counters mirroring the counts another component keeps are set rather than incremented
+		"""
+		with self._lock:
+			self._values[labels] = value
+
+
+class Gauge(Counter):
+	TYPE = 'gauge'
+
+	def dec(self, *labels, amount: float = 1.0):
+		self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+	TYPE = 'histogram'
+
+	# Seconds, from the fast dictionary lookups to the slow online services
+	BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+	def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = BUCKETS):
+		super().__init__(name, documentation, labels)
+		self.buckets = tuple(sorted(buckets))
+		# Per label values: the count of each bucket, the last one being +Inf, then sum, count and max
+		self._observations: Dict[tuple, list] = dict()
+
+
+	def observe(self, value: float, *labels):
+		index = bisect.bisect_left(self.buckets, value)
+		with self._lock:
+			observation = self._observations.get(labels, None)
+			if observation is None:
+				observation = self._observations[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0, value]
+
+			observation[0][index] += 1
+			observation[1] += value
+			observation[2] += 1
+			if value > observation[3]:
+				observation[3] = value
+
+
+	def value(self, *labels) -> float:
+		observation = self._observations.get(labels, None)
+		return observation[2] if observation else 0
+
+
+	def samples(self) -> List[Tuple[str, tuple, float]]:
+		ret = list()
+		with self._lock:
+			for labels, (counts, total, count, _) in self._observations.items():
+				pairs = tuple(zip(self.labelNames, labels))
+				cumulated = 0
+				for bound, bucketCount in zip([*self.buckets, math.inf], counts):
+					cumulated += bucketCount
+					ret.append(('_bucket', (*pairs, ('le', bound)), cumulated))
+				ret.append(('_sum', pairs, total))
+				ret.append(('_count', pairs, count))
+
+		return ret
+
+
+	def summary(self) -> dict:
+		ret = dict()
+		with self._lock:
+			for labels, (counts, total, count, maximum) in self._observations.items():
+				ret[','.join(labels)] = {
+					'count': count,
+					'avg'  : round(total / count, 6),
+					'p95'  : round(self._quantile(counts, count, 0.95, maximum), 6),
+					'max'  : round(maximum, 6)
+				}
+
+		return ret
+
+
+	def clear(self):
+		with self._lock:
+			self._observations.clear()
+
+
+	def _quantile(self, counts: List[int], count: int, quantile: float, maximum: float) -> float:
+		# Upper bound of the bucket the quantile falls in, never more than what was really observed
+		rank = quantile * count
+		cumulated = 0
+		for bound, bucketCount in zip(self.buckets, counts):
+			cumulated += bucketCount
+			if cumulated >= rank:
+				return min(bound, maximum)
+
+		return maximum
+
+
+class MetricsRegistry:
+	"""
+	Holds the metrics and renders them in the Prometheus text format or as a compact summary.
+	Collectors are called before rendering, to copy the counts other components keep into metrics
+	"""
+
+	def __init__(self):
+		self.enabled = False
+		self._metrics: Dict[str, Metric] = dict()
+		self._collectors: List[Callable[[], None]] = list()
+		self._lock = threading.Lock()
+
+
+	def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+		return self._register(Counter, name, documentation, labels)
+
+
+	def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+		return self._register(Gauge, name, documentation, labels)
+
+
+	def histogram(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = Histogram.BUCKETS) -> Histogram:
+		return self._register(Histogram, name, documentation, labels, buckets=buckets)
+
+
+	def get(self, name: str):
+		return self._metrics.get(name, None)
+
+
+	def addCollector(self, collector: Callable[[], None]):
+		self._collectors.append(collector)
+
+
+	def collect(self, onError: Callable[[Callable, Exception], None] = None):
+		for collector in self._collectors:
+			try:
+				collector()
+			except Exception as e:
+				if onError:
+					onError(collector, e)
+
+
+	def render(self) -> str:
+		"""
+		The metrics in the Prometheus text exposition format
+		"""
+		lines = list()
+		for metric in list(self._metrics.values()):
+			samples = metric.samples()
+			if not samples:
+				continue
+
+			lines.append(f'# HELP {metric.name} {self._escape(metric.documentation, quotes=False)}')
+			lines.append(f'# TYPE {metric.name} {metric.TYPE}')
+			for suffix, labels, value in samples:
+				labelString = ','.join(f'{label}="{self._escape(self._format(labelValue))}"' for label, labelValue in labels)
+				lines.append(f'{metric.name}{suffix}{{{labelString}}} {self._format(value)}' if labelString else f'{metric.name}{suffix} {self._format(value)}')
+
+		return '\n'.join(lines) + '\n'
+
+
+	def summary(self) -> Dict[str, dict]:
+		"""
+		The metrics having values, histograms reduced to their count, average, 95th percentile and maximum
+		"""
+		ret = dict()
+		for metric in list(self._metrics.values()):
+			summary = metric.summary()
+			if summary:
+				ret[metric.name] = summary
+
+		return ret
+
+
+	def clear(self):
+		for metric in self._metrics.values():
+			metric.clear()
+
+
+	def __contains__(self, name: str) -> bool:
+		return name in self._metrics
+
+
+	def _register(self, cls: type, name: str, documentation: str, labels: Sequence[str], **kwargs) -> Metric:
+		with self._lock:
+			metric = self._metrics.get(name, None)
+			if metric:
+				if type(metric) is not cls or metric.labelNames != tuple(labels):
+					raise ValueError(f'Metric {name} is already registered as another type or with other labels')
+				return metric
+
+			metric = self._metrics[name] = cls(name, documentation, labels, **kwargs)
+			return metric
+
+
+	@staticmethod
+	def _format(value) -> str:
+		if isinstance(value, str):
+			return value
+		if value == math.inf:
+			return '+Inf'
+		if float(value).is_integer():
+			return str(int(value))
+		return repr(float(value))
+
+
+	@staticmethod
+	def _escape(text: str, quotes: bool = True) -> str:
+		text = text.replace('\\', '\\\\').replace('\n', '\\n')
+		return text.replace('"', '\\"') if quotes else text
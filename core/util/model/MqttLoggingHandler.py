@@ -1,54 +1,129 @@
 import logging
+import queue
 import re
-from datetime import datetime
+import threading
+import time
+from collections import deque
+from typing import List, Optional
 
 from core.base.SuperManager import SuperManager
 from core.commons import constants
 
 
 class MqttLoggingHandler(logging.Handler):
+	"""
+	Publishes the logs on mqtt. Records are only queued by the logging thread, a background emitter formats
+	and publishes them, one message per record, or, with mqttLogBatching, whatever piled up meanwhile as one message,
+	up to BATCH_SIZE records
+	"""
 
 	REGEX = re.compile(r'\[(?P<component>.*?)]\s*(?P<msg>.*)$')
+	HISTORY_SIZE = 250
+	BATCH_SIZE = 50
+	QUEUE_SIZE = 10000
 
 	def __init__(self):
 		super().__init__()
-		self._history = list()
+		self._history = deque(maxlen=self.HISTORY_SIZE)
+		self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+		self._emitter: Optional[threading.Thread] = None
+		self._dropped = 0
 
 
 	def emit(self, record: logging.LogRecord) -> None:
-		record.msg = self.format(record)
-		matches = self.REGEX.search(record.msg)
+		# Handler.handle holds the handler lock while emitting
+		if not self._emitter:
+			self._emitter = threading.Thread(name='MqttLoggingEmitter', target=self._emit, daemon=True)
+			self._emitter.start()
+
+		try:
+			self._queue.put_nowait(record)
+		except queue.Full:
+			self._dropped += 1
+
+
+	def close(self):
+		if self._emitter:
+			self._queue.put(None)
+			self._emitter.join(timeout=1)
+			self._emitter = None
+		super().close()
+
+
+	def toPayload(self, record: logging.LogRecord) -> dict:
+		text = self.format(record)
+		matches = self.REGEX.search(text)
 
 		if matches:
 			component = matches['component']
 			msg = matches['msg']
 		else:
 			component = constants.UNKNOWN
-			msg = record.msg
+			msg = text
 
-		payload = {
-			'time': datetime.now().strftime('%H:%M:%S.%f')[:-3],
-			'level': record.levelname,
-			'msg' : msg,
+		return {
+			'time'     : f'{time.strftime("%H:%M:%S", time.localtime(record.created))}.{int(record.msecs):03d}',
+			'level'    : record.levelname,
+			'msg'      : msg,
 			'component': component
 		}
 
-		self.saveToHistory(payload)
 
-		if SuperManager.getInstance() and SuperManager.getInstance().mqttManager:
-			SuperManager.getInstance().mqttManager.publish(
+	def publish(self, payloads: List[dict]):
+		superManager = SuperManager.getInstance()
+		if not superManager or not superManager.mqttManager:
+			return
+
+		if superManager.configManager and superManager.configManager.getAliceConfigByName('mqttLogBatching'):
+			superManager.mqttManager.publish(
+				topic=constants.TOPIC_SYSLOG_BATCH,
+				payload={'logs': payloads}
+			)
+			return
+
+		for payload in payloads:
+			superManager.mqttManager.publish(
 				topic=constants.TOPIC_SYSLOG,
 				payload=payload
 			)
 
 
-	def saveToHistory(self, payload: dict):
-		if len(self._history) >= 250:
-			self._history.pop(0)
+	def _emit(self):
+		running = True
+		while running:
+			records = [self._queue.get()]
+			while len(records) < self.BATCH_SIZE:
+				try:
+					records.append(self._queue.get_nowait())
+				except queue.Empty:
+					break
+
+			if None in records:
+				running = False
+				records = records[:records.index(None)]
+
+			payloads = list()
+			for record in records:
+				try:
+					payloads.append(self.toPayload(record))
+				except Exception:
+					self.handleError(record)
+
+			if not payloads:
+				continue
 
-		self._history.append(payload)
+			self._history.extend(payloads)
+			try:
+				self.publish(payloads)
+			except Exception:
+				self.handleError(records[-1])
 
 
 	@property
 	def history(self) -> list:
-		return self._history
+		return list(self._history)
+
+
+	@property
+	def dropped(self) -> int:
+		return self._dropped
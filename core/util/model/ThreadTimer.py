@@ -1,11 +1,46 @@
+from __future__ import annotations
+
 from dataclasses import dataclass, field
-from threading import Timer
-from typing import Callable
+from typing import Callable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+	from core.util.model.TimerScheduler import TimerScheduler
 
 
-@dataclass
+@dataclass(eq=False)
 class ThreadTimer:
+	"""
+	Handle on a job of the TimerScheduler. It can be canceled like a threading.Timer, which it replaces
+	"""
 	callback: Callable
 	args: list = field(default_factory=list)
 	kwargs: dict = field(default_factory=dict)
-	timer: Timer = None
+	interval: float = 0
+	periodic: bool = False
+	scheduler: TimerScheduler = field(default=None, repr=False)
+	due: float = field(default=0, repr=False)
+	sequence: int = field(default=-1, repr=False)
+	queued: bool = field(default=False, repr=False)
+	cancelled: bool = False
+	done: bool = False
+
+
+	def start(self):
+		self.scheduler.schedule(self)
+
+
+	def cancel(self):
+		if self.scheduler:
+			self.scheduler.cancel(self)
+		else:
+			self.cancelled = True
+
+
+	def is_alive(self) -> bool:  # NOSONAR
+		"""
+		Whether the job is waiting or running, named after threading.Timer for the callers used to it
+		"""
+		return self.due > 0 and not self.cancelled and not self.done
+
+
+	isAlive = is_alive
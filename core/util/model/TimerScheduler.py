@@ -0,0 +1,192 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from core.util.model.ThreadTimer import ThreadTimer
+
+
+class TimerScheduler:
+	"""
+	Runs timed and periodic jobs from a single thread keeping them in a heap, instead of one thread per timer.
+	Due jobs are handed to a bounded pool of workers, so a slow callback doesn't delay the others as long as workers are left.
+	Callbacks that may block have to hand their work over elsewhere, or they hold a worker and, once all are held, every other timer.
+	Canceled jobs are only marked, and dropped when they reach the top of the heap or when they make up most of it.
+	"""
+
+	COMPACT_THRESHOLD = 64
+
+	def __init__(self, onError: Callable = None):
+		"""
+		:param onError: callable, called with the job and the exception when a callback raises
+		"""
+		self._heap: List[Tuple[float, int, ThreadTimer]] = list()
+		self._sequence = itertools.count()
+		self._condition = threading.Condition()
+		self._onError = onError
+		self._thread: Optional[threading.Thread] = None
+		self._pool: Optional[ThreadPoolExecutor] = None
+		self._running = False
+		self._cancelled = 0
+		self._executed = 0
+		self._errors = 0
+
+
+	def start(self, workers: int = 4):
+		with self._condition:
+			if self._running:
+				return
+
+			self._running = True
+			self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='TimerWorker')
+			self._thread = threading.Thread(name='TimerScheduler', target=self._run, daemon=True)
+			self._thread.start()
+
+
+	def stop(self):
+		with self._condition:
+			if not self._running:
+				return
+
+			self._running = False
+			for _, sequence, timer in self._heap:
+				if timer.sequence == sequence:
+					timer.queued = False
+					timer.cancelled = True
+
+			self._heap.clear()
+			self._cancelled = 0
+			self._condition.notify()
+
+		if self._thread is not threading.current_thread():
+			self._thread.join(timeout=1)
+
+		self._pool.shutdown(wait=False)
+
+
+	def schedule(self, timer: ThreadTimer) -> ThreadTimer:
+		"""
+		Queues a job to run once its interval elapsed, and every interval after that if periodic.
+		Jobs scheduled while the scheduler isn't running are cancelled right away
+		:param timer: ThreadTimer
+		:return: the same ThreadTimer, to cancel it
+		"""
+		with self._condition:
+			timer.scheduler = self
+			if not self._running:
+				timer.cancelled = True
+				return timer
+
+			timer.cancelled = False
+			timer.done = False
+			self._push(timer, time.monotonic() + timer.interval)
+
+		return timer
+
+
+	def cancel(self, timer: ThreadTimer):
+		with self._condition:
+			if timer.cancelled:
+				return
+
+			timer.cancelled = True
+			if not timer.queued:
+				return
+
+			timer.queued = False
+			timer.sequence = -1
+			self._cancelled += 1
+			if self._cancelled > self.COMPACT_THRESHOLD and self._cancelled * 2 > len(self._heap):
+				self._compact()
+
+
+	@property
+	def running(self) -> bool:
+		return self._running
+
+
+	@property
+	def stats(self) -> dict:
+		with self._condition:
+			return {
+				'pending' : len(self._heap) - self._cancelled,
+				'canceled': self._cancelled,
+				'executed': self._executed,
+				'errors'  : self._errors
+			}
+
+
+	def _push(self, timer: ThreadTimer, due: float):
+		# Caller holds the condition
+		if timer.queued:
+			# Its previous entry is left behind, outdated by the new sequence
+			self._cancelled += 1
+
+		sequence = next(self._sequence)
+		timer.due = due
+		timer.sequence = sequence
+		timer.queued = True
+		heapq.heappush(self._heap, (due, sequence, timer))
+		if self._heap[0][1] == sequence:
+			self._condition.notify()
+
+
+	def _compact(self):
+		# Caller holds the condition
+		self._heap = [entry for entry in self._heap if not self._isStale(entry)]
+		heapq.heapify(self._heap)
+		self._cancelled = 0
+
+
+	@staticmethod
+	def _isStale(entry: Tuple[float, int, ThreadTimer]) -> bool:
+		_, sequence, timer = entry
+		return timer.sequence != sequence
+
+
+	def _run(self):
+		with self._condition:
+			while self._running:
+				if not self._heap:
+					self._condition.wait()
+					continue
+
+				if self._isStale(self._heap[0]):
+					heapq.heappop(self._heap)
+					self._cancelled -= 1
+					continue
+
+				due, _, timer = self._heap[0]
+				delay = due - time.monotonic()
+				if delay > 0:
+					self._condition.wait(timeout=delay)
+					continue
+
+				heapq.heappop(self._heap)
+				timer.queued = False
+				timer.sequence = -1
+				try:
+					self._pool.submit(self._execute, timer)
+				except RuntimeError:
+					# The pool is shut down
+					timer.done = True
+
+
+	def _execute(self, timer: ThreadTimer):
+		try:
+			timer.callback(*timer.args, **timer.kwargs)
+		except Exception as e:
+			with self._condition:
+				self._errors += 1
+
+			if self._onError:
+				self._onError(timer, e)
+		finally:
+			with self._condition:
+				self._executed += 1
+				if timer.periodic and not timer.cancelled and not timer.queued and self._running:
+					self._push(timer, time.monotonic() + timer.interval)
+				elif not timer.queued:
+					timer.done = True
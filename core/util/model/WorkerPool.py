@@ -0,0 +1,206 @@
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Tuple
+
+
+class QueueFull(Exception):
+	pass
+
+
+class WorkerQueue:
+	"""
+	A named priority queue with its own workers, so that work queued elsewhere never delays it
+	"""
+
+	def __init__(self, name: str, workers: int, maxDepth: int):
+		self._name = name
+		self._workers = max(1, workers)
+		self._queue = queue.PriorityQueue(maxsize=max(0, maxDepth))
+		self._threads: List[threading.Thread] = list()
+		self._lock = threading.Lock()
+		self._submitted = 0
+		self._completed = 0
+		self._failed = 0
+		self._rejected = 0
+		self._waited = 0.0
+		self._maxWaited = 0.0
+		self._ran = 0.0
+
+
+	def start(self, onError: Callable = None, workers: int = 0):
+		if workers:
+			self._workers = workers
+
+		for i in range(self._workers):
+			thread = threading.Thread(name=f'{self._name}Worker-{i}', target=self._work, args=[onError], daemon=True)
+			thread.start()
+			self._threads.append(thread)
+
+
+	def stop(self, sequence: itertools.count):
+		while True:
+			try:
+				_, _, task = self._queue.get_nowait()
+			except queue.Empty:
+				break
+
+			if task:
+				task[0].cancel()
+
+		for _ in self._threads:
+			# Stop tasks jump ahead of anything queued meanwhile
+			self._queue.put((float('-inf'), next(sequence), None))
+
+		for thread in self._threads:
+			if thread is not threading.current_thread():
+				thread.join(timeout=1)
+
+		self._threads.clear()
+
+
+	def put(self, priority: int, sequence: int, future: Future, func: Callable, args: tuple, kwargs: dict):
+		try:
+			self._queue.put_nowait((priority, sequence, (future, func, args, kwargs, time.perf_counter())))
+		except queue.Full:
+			with self._lock:
+				self._rejected += 1
+			future.set_exception(QueueFull(f'Queue **{self._name}** is full'))
+			return
+
+		with self._lock:
+			self._submitted += 1
+
+
+	@property
+	def stats(self) -> dict:
+		with self._lock:
+			done = self._completed + self._failed
+			return {
+				'workers'  : self._workers,
+				'depth'    : self._queue.qsize(),
+				'submitted': self._submitted,
+				'completed': self._completed,
+				'failed'   : self._failed,
+				'rejected' : self._rejected,
+				'avgWaitMs': round(self._waited / done * 1000, 3) if done else 0,
+				'maxWaitMs': round(self._maxWaited * 1000, 3),
+				'avgRunMs' : round(self._ran / done * 1000, 3) if done else 0
+			}
+
+
+	def _work(self, onError: Callable):
+		while True:
+			_, _, task = self._queue.get()
+			if not task:
+				return
+
+			future, func, args, kwargs, queuedAt = task
+			if not future.set_running_or_notify_cancel():
+				continue
+
+			started = time.perf_counter()
+			try:
+				future.set_result(func(*args, **kwargs))
+				failed = False
+			except Exception as e:
+				future.set_exception(e)
+				failed = True
+				if onError:
+					onError(self._name, func, e)
+
+			ended = time.perf_counter()
+			with self._lock:
+				if failed:
+					self._failed += 1
+				else:
+					self._completed += 1
+				self._waited += started - queuedAt
+				self._maxWaited = max(self._maxWaited, started - queuedAt)
+				self._ran += ended - started
+
+
+class WorkerPool:
+	"""
+	Runs tasks on named queues, each having its own workers and depth limit.
+	Ordering matters for audio and dialog, so those get a single worker each by default
+	"""
+
+	DEFAULT_QUEUES: Dict[str, Tuple[int, int]] = {
+		'audio'     : (1, 512),
+		'dialog'    : (1, 256),
+		'background': (4, 1024)
+	}
+
+	def __init__(self, queues: Dict[str, Tuple[int, int]] = None, onError: Callable = None):
+		"""
+		:param queues: dict, queue name to a (workers, maxDepth) tuple, a maxDepth of 0 is unbounded
+		:param onError: callable, called with the queue name, the function and the exception when a task raises
+		"""
+		self._queues = {name: WorkerQueue(name, workers, maxDepth) for name, (workers, maxDepth) in (queues or self.DEFAULT_QUEUES).items()}
+		self._onError = onError
+		self._sequence = itertools.count()
+		self._lock = threading.Lock()
+		self._running = False
+
+
+	def start(self, workers: Dict[str, int] = None):
+		"""
+		:param workers: dict, queue name to a number of workers, overriding the ones the queue was defined with
+		"""
+		workers = workers or dict()
+		with self._lock:
+			if self._running:
+				return
+
+			for name, workerQueue in self._queues.items():
+				workerQueue.start(self._onError, max(0, workers.get(name, 0)))
+			self._running = True
+
+
+	def stop(self):
+		with self._lock:
+			if not self._running:
+				return
+
+			self._running = False
+			for workerQueue in self._queues.values():
+				workerQueue.stop(self._sequence)
+
+
+	def submit(self, queueName: str, func: Callable, *args, priority: int = 0, **kwargs) -> Future:
+		"""
+		Queues func to be run with the given arguments
+		:param queueName: str, one of the pool queues
+		:param func: callable
+		:param priority: int, lower runs first among the tasks waiting in that queue
+		:return: Future, failed with QueueFull if the queue is full
+		"""
+		workerQueue = self._queues.get(queueName, None)
+		if not workerQueue:
+			raise KeyError(f'Unknown worker queue **{queueName}**')
+
+		future = Future()
+		if not self._running:
+			future.set_exception(RuntimeError('Worker pool is stopped'))
+			return future
+
+		workerQueue.put(priority, next(self._sequence), future, func, args, kwargs)
+		return future
+
+
+	@property
+	def running(self) -> bool:
+		return self._running
+
+
+	@property
+	def queues(self) -> List[str]:
+		return list(self._queues)
+
+
+	@property
+	def stats(self) -> Dict[str, dict]:
+		return {name: workerQueue.stats for name, workerQueue in self._queues.items()}
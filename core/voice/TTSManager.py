@@ -7,23 +7,45 @@ from core.dialog.model.DialogSession import DialogSession
 from core.user.model.User import User
 from core.voice.model.TTSEnum import TTSEnum
 from core.voice.model.Tts import Tts
+from core.voice.model.TtsCache import TtsCache
 
 
 class TTSManager(Manager):
 
+	START_DEPENDENCIES = ['LanguageManager', 'InternetManager']
+
 	def __init__(self):
 		super().__init__()
 
 		self._fallback = None
 		self._tts = None
 		self._cacheRoot = Path(self.Commons.rootDir(), 'var/cache')
+		self._ttsCache = TtsCache(root=self._cacheRoot, directories=[self._cacheRoot / tts.value for tts in TTSEnum])
 
 
 	def onStart(self):
 		super().onStart()
+		self._ttsCache.maxBytes = self.ttsCacheBudget()
+		self._ttsCache.load()
 		self._loadTTS(self.ConfigManager.getAliceConfigByName('tts').lower())
 
 
+	def onStop(self):
+		super().onStop()
+		self._ttsCache.save()
+
+
+	def ttsCacheBudget(self) -> int:
+		try:
+			return max(0, int(self.ConfigManager.getAliceConfigByName('ttsCacheSize') or 0)) * 1024 * 1024
+		except ValueError:
+			return 0
+
+
+	def updateTtsCacheSize(self):
+		self._ttsCache.maxBytes = self.ttsCacheBudget()
+
+
 	def _loadTTS(self, userTTS: str = None, user: User = None, forceTts = None):
 		self._fallback = None
 		if forceTts:
@@ -106,6 +128,11 @@ class TTSManager(Manager):
 		return self._cacheRoot
 
 
+	@property
+	def ttsCache(self) -> TtsCache:
+		return self._ttsCache
+
+
 	def onInternetConnected(self):
 		if self.ConfigManager.getAliceConfigByName('stayCompletlyOffline') or self.ConfigManager.getAliceConfigByName('keepTTSOffline'):
 			return
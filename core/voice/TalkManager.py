@@ -8,6 +8,8 @@ from core.base.model.Manager import Manager
 
 class TalkManager(Manager):
 
+	START_DEPENDENCIES = ['LanguageManager']
+
 	def __init__(self):
 		super().__init__()
 		self._langData = dict()
@@ -9,6 +9,8 @@ from core.voice.model.WakewordEngine import WakewordEngine
 
 class WakewordManager(Manager):
 
+	START_DEPENDENCIES = ['AudioManager', 'MqttManager']
+
 	def __init__(self):
 		super().__init__()
 		self._engine = None
@@ -36,14 +38,19 @@ class WakewordManager(Manager):
 			self._engine.onAudioFrame(message=message, deviceUid=deviceUid)
 
 
+	def onDeviceHeartbeat(self, uid: str, deviceUid: str = None):
+		if self._engine:
+			self._engine.onDeviceHeartbeat(uid=uid, deviceUid=deviceUid)
+
+
 	def onHotwordToggleOn(self, deviceUid: str, session: DialogSession):
 		if self._engine:
-			self._engine.onHotwordToggleOn(deviceUid=deviceUid, session=DialogSession)
+			self._engine.onHotwordToggleOn(deviceUid=deviceUid, session=session)
 
 
 	def onHotwordToggleOff(self, deviceUid: str, session: DialogSession):
 		if self._engine:
-			self._engine.onHotwordToggleOff(deviceUid=deviceUid, session=DialogSession)
+			self._engine.onHotwordToggleOff(deviceUid=deviceUid, session=session)
 
 
 	def _startWakewordEngine(self):
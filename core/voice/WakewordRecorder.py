@@ -3,12 +3,11 @@ from enum import Enum
 from pathlib import Path
 from typing import Optional
 
-from pydub import AudioSegment
-
 from core.base.model.Manager import Manager
 from core.commons import constants
 from core.device.model.DeviceAbility import DeviceAbility
 from core.dialog.model.DialogSession import DialogSession
+from core.voice.model.EnergyEnvelope import EnergyEnvelope
 from core.voice.model.Wakeword import Wakeword
 from core.voice.model.WakewordUploadThread import WakewordUploadThread
 
@@ -36,6 +35,8 @@ class WakewordRecorder(Manager):
 		self._sampleRate = self.AudioServer.SAMPLERATE
 		self._channels = 1
 		self._gainFix = 0
+		self._envelope: Optional[EnergyEnvelope] = None
+		self._envelopeKey = None
 
 
 	def onStart(self):
@@ -67,6 +68,8 @@ class WakewordRecorder(Manager):
 
 		self._wakeword = None
 		self._userTuning = 0
+		self._envelope = None
+		self._envelopeKey = None
 
 
 	def startCapture(self):
@@ -94,29 +97,30 @@ class WakewordRecorder(Manager):
 		if not filepath:
 			filepath = self.wakeword.getRawSample()
 
-		sound = AudioSegment.from_file(filepath, format='wav')
-
-		if self._gainFix > 0:
-			sound.append(self._gainFix)
-
-		startTrim = self.detectLeadingSilence(sound)
-		endTrim = self.detectLeadingSilence(sound.reverse())
-		duration = len(sound)
-		trimmed = sound[startTrim: duration - endTrim]
-
-		reworked = trimmed.set_frame_rate(self.AudioServer.SAMPLERATE)
-		reworked = reworked.set_channels(1)
-
 		tempFile = Path(filepath.parent, 'tmp.wav')
 		if tempFile.exists():
 			tempFile.unlink()
 
-		reworked.export(tempFile, format='wav')
+		self.loadEnvelope(filepath).save(tempFile, tuning=self._userTuning)
 
 		self._wakeword.addTrimmedSample(tempFile, int(filepath.stem.replace('_raw', '')))
 		self._state = WakewordRecorderState.CONFIRMING
 
 
+	def loadEnvelope(self, filepath: Path) -> EnergyEnvelope:
+		"""
+		Loads a raw sample once, trimming it again with another tuning reuses it
+		:param filepath: Path
+		:return: EnergyEnvelope
+		"""
+		key = (filepath, filepath.stat().st_mtime_ns, self._gainFix)
+		if self._envelopeKey != key:
+			self._envelope = EnergyEnvelope.fromFile(filepath, sampleRate=self.AudioServer.SAMPLERATE, gain=self._gainFix)
+			self._envelopeKey = key
+
+		return self._envelope
+
+
 	def getLastSampleNumber(self) -> int:
 		if self._wakeword and self._wakeword.getTrimmedSample():
 			return len(self._wakeword.trimmedSamples.keys())
@@ -133,15 +137,6 @@ class WakewordRecorder(Manager):
 		self._workAudioFile()
 
 
-	def detectLeadingSilence(self, sound: AudioSegment) -> int:
-		average = sound.dBFS
-		pos = 0
-		while sound[pos: pos + 10].dBFS < (average + self._userTuning) and pos < len(sound):
-			pos += 10
-
-		return pos
-
-
 	def tryCaptureFix(self):
 		self._sampleRate /= 2
 		self._channels = 1
@@ -0,0 +1,144 @@
+import wave
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+
+class EnergyEnvelope:
+	"""
+	A recording loaded once as 16 bits mono samples, with the loudness of each of its 10ms frames.
+	Frames are counted from the start for the leading silence and from the end for the trailing one.
+	A running maximum of those loudnesses lets the cut points for any threshold be found by a binary search,
+	so tuning the trimming doesn't go through the audio again
+	"""
+
+	FRAME_MS = 10
+
+	def __init__(self, samples: np.ndarray, sampleRate: int):
+		"""
+		:param samples: numpy int16 array, mono
+		:param sampleRate: int
+		"""
+		self._samples = samples
+		self._sampleRate = sampleRate
+		self._frameLength = max(1, sampleRate * self.FRAME_MS // 1000)
+
+		self._average = self.dbfs(samples)
+		self._leading = np.maximum.accumulate(self._framesDbfs(samples))
+		self._trailing = np.maximum.accumulate(self._framesDbfs(samples[::-1]))
+
+
+	@classmethod
+	def fromFile(cls, file: Path, sampleRate: int = 0, gain: float = 0) -> 'EnergyEnvelope':
+		"""
+		Loads a wav file, mixed down to mono
+		:param file: Path
+		:param sampleRate: int, resamples to that rate if set and different
+		:param gain: float, dB to add to the samples
+		:return: EnergyEnvelope
+		"""
+		with wave.open(str(file), 'rb') as wav:
+			channels = wav.getnchannels()
+			width = wav.getsampwidth()
+			rate = wav.getframerate()
+			frames = wav.readframes(wav.getnframes())
+
+		if width == 1:
+			samples = (np.frombuffer(frames, np.uint8).astype(np.float32) - 128) * 256
+		elif width == 2:
+			samples = np.frombuffer(frames, np.int16).astype(np.float32)
+		elif width == 4:
+			samples = np.frombuffer(frames, np.int32).astype(np.float32) / 65536
+		else:
+			raise ValueError(f'Unsupported sample width: {width} bytes')
+
+		if channels > 1:
+			samples = samples[:len(samples) - len(samples) % channels].reshape(-1, channels).mean(axis=1)
+
+		if sampleRate and sampleRate != rate and len(samples):
+			length = int(round(len(samples) * sampleRate / rate))
+			samples = np.interp(np.arange(length) * rate / sampleRate, np.arange(len(samples)), samples)
+			rate = sampleRate
+
+		if gain:
+			samples = samples * 10 ** (gain / 20)
+
+		return cls(np.clip(samples, -32768, 32767).astype(np.int16), rate)
+
+
+	@staticmethod
+	def dbfs(samples: np.ndarray) -> float:
+		if not len(samples):
+			return -np.inf
+
+		rms = np.sqrt(np.mean(np.square(samples, dtype=np.float64)))
+		return 20 * np.log10(rms / 32768) if rms else -np.inf
+
+
+	def cutPoints(self, tuning: float = 0) -> Tuple[int, int]:
+		"""
+		The milliseconds of leading and trailing audio quieter than the average loudness plus the tuning
+		:param tuning: float, dB, higher trims more
+		:return: tuple of the leading and trailing silence durations in milliseconds
+		"""
+		threshold = self._average + tuning
+		return self._silence(self._leading, threshold), self._silence(self._trailing, threshold)
+
+
+	def trim(self, tuning: float = 0) -> np.ndarray:
+		"""
+		The samples without their leading and trailing silence
+		:param tuning: float, dB, higher trims more
+		:return: numpy int16 array
+		"""
+		start, end = self.cutPoints(tuning)
+		first = start * self._sampleRate // 1000
+		last = len(self._samples) - end * self._sampleRate // 1000
+		return self._samples[first:max(first, last)]
+
+
+	def save(self, file: Path, tuning: float = 0):
+		"""
+		Writes the trimmed samples as a 16 bits mono wav file
+		"""
+		with wave.open(str(file), 'wb') as wav:
+			wav.setnchannels(1)
+			wav.setsampwidth(2)
+			wav.setframerate(self._sampleRate)
+			wav.writeframes(self.trim(tuning).tobytes())
+
+
+	@property
+	def duration(self) -> int:
+		"""
+		In milliseconds
+		"""
+		return len(self._samples) * 1000 // self._sampleRate
+
+
+	@property
+	def sampleRate(self) -> int:
+		return self._sampleRate
+
+
+	def _framesDbfs(self, samples: np.ndarray) -> np.ndarray:
+		count = -(-len(samples) // self._frameLength)
+		padded = np.zeros(count * self._frameLength, np.float64)
+		padded[:len(samples)] = samples
+		power = np.square(padded).reshape(count, self._frameLength).sum(axis=1)
+
+		# The last frame may be shorter
+		lengths = np.full(count, self._frameLength)
+		if count:
+			lengths[-1] = len(samples) - (count - 1) * self._frameLength
+
+		rms = np.sqrt(power / lengths)
+		with np.errstate(divide='ignore'):
+			return 20 * np.log10(rms / 32768)
+
+
+	def _silence(self, loudest: np.ndarray, threshold: float) -> int:
+		# loudest holds the loudest frame so far, the first frame reaching the threshold ends the silence
+		frames = int(np.searchsorted(loudest, threshold, side='left'))
+		return min(frames * self.FRAME_MS, self.duration)
@@ -1,15 +1,13 @@
-import queue
-import wave
 from typing import Optional
 
-import io
 import pyaudio
-import struct
 from paho.mqtt.client import MQTTMessage
 
 from core.commons import constants
 from core.dialog.model.DialogSession import DialogSession
+from core.server.model.AudioFrame import AudioFrame
 from core.voice.model.WakewordEngine import WakewordEngine
+from core.voice.model.WakewordHost import WakewordHost
 
 try:
 	import pvporcupine
@@ -25,105 +23,96 @@ class PorcupineWakeword(WakewordEngine):
 			'pvporcupine==1.7.0'
 		}
 	}
+	KEYWORDS = ['porcupine', 'bumblebee', 'terminator', 'blueberry']
 
 	def __init__(self):
 		super().__init__()
 		self._working = self.ThreadManager.newEvent('ListenForWakeword')
-		self._buffer = queue.Queue()
 		self._hotwordThread = None
+		self._host: Optional[WakewordHost] = None
 
 		try:
-			self._handler = pvporcupine.create(keywords=['porcupine', 'bumblebee', 'terminator', 'blueberry'])
+			# Porcupine keeps a state per stream, each device gets its own handle
+			handler = pvporcupine.create(keywords=self.KEYWORDS)
+			self._host = WakewordHost(frameLength=handler.frame_length, detectorFactory=self._newHandler, sampleRate=handler.sample_rate)
+			self._handler = handler
 			with self.Commons.shutUpAlsaFFS():
 				self._audio = pyaudio.PyAudio()
 		except:
 			self._enabled = False
 
 
+	def _newHandler(self, _deviceUid: str):
+		if self._host and not self._host.detectors:
+			return self._handler
+
+		return pvporcupine.create(keywords=self.KEYWORDS)
+
+
 	def onBooted(self):
 		super().onBooted()
-		if self._enabled:
+		if self._enabled and self._host:
 			self._working.set()
 			self._hotwordThread = self.ThreadManager.newThread(name='HotwordThread', target=self.worker)
 
 
 	def onStop(self):
 		super().onStop()
-		if self._enabled:
+		if self._host:
 			self._working.clear()
-			self._buffer = queue.Queue()
+			self._host.wakeUp()
+			for handler in self._host.detectors.values():
+				if handler is not self._handler:
+					handler.delete()
+			self._host.clear()
 
 
 	def onHotwordToggleOff(self, deviceUid: str, session: DialogSession):
-		if self._enabled:
-			self._working.clear()
-			self._buffer = queue.Queue()
+		if self._enabled and self._host:
+			self._host.pause(deviceUid)
 
 
 	def onHotwordToggleOn(self, deviceUid: str, session: DialogSession):
-		if self._enabled:
-			self._working.set()
-			self._buffer = queue.Queue()
-			self._hotwordThread = self.ThreadManager.newThread(name='HotwordThread', target=self.worker)
+		if self._enabled and self._host:
+			self._host.resume(deviceUid)
+			if not self._working.is_set():
+				self._working.set()
+				self._hotwordThread = self.ThreadManager.newThread(name='HotwordThread', target=self.worker)
 
 
 	def onAudioFrame(self, message: MQTTMessage, deviceUid: str):
-		if not self.enabled or not self._working.is_set():
+		if not self.enabled or not self._host or not self._working.is_set():
 			return
 
-		with io.BytesIO(message.payload) as buffer:
-			try:
-				with wave.open(buffer, 'rb') as wav:
-					frame = wav.readframes(self.AudioServer.FRAMES_PER_BUFFER)
-					while frame:
-						self._buffer.put(frame)
-						frame = wav.readframes(self.AudioServer.FRAMES_PER_BUFFER)
+		try:
+			frame, audioFormat = AudioFrame.decode(message.payload)
+			if frame:
+				self._host.feed(deviceUid, frame, audioFormat)
 
-			except Exception as e:
-				self.logError(f'Error recording audio frame: {e}')
+		except Exception as e:
+			self.logError(f'Error recording audio frame: {e}')
 
 
 	def worker(self):
-		while True:
-			stream = self.audioStream()
-			for data in stream:
-				if not self._working.is_set():
-					break
-
-				pcm = struct.unpack_from('h' * self._handler.frame_length, data)
-				result = self._handler.process(pcm)
+		while self._working.is_set():
+			for deviceUid, samples in self._host.pending(timeout=0.5):
+				try:
+					result = self._host.detector(deviceUid).process(samples.tolist())
+				except Exception as e:
+					self.logError(f'Error processing audio of device **{deviceUid}**: {e}')
+					continue
+
 				if result is not None and result > -1:
-					self.logDebug('Detected wakeword')
+					self.logDebug(f'Detected wakeword on device **{deviceUid}**')
+					# Until the session ends and the hotword is toggled back on for this device
+					self._host.pause(deviceUid)
 					self.MqttManager.publish(
 						topic=constants.TOPIC_HOTWORD_DETECTED.format('default'),
 						payload={
-							'siteId': self.DeviceManager.getMainDevice().uid,
+							'siteId': deviceUid,
 							'modelId': f'porcupine_{result}',
 							'modelVersion': self._handler.version,
 							'modelType': 'universal',
 							'currentSensitivity': self.ConfigManager.getAliceConfigByName('wakewordSensitivity')
 						}
 					)
-					return
-
-
-	def audioStream(self) -> Optional[bytes]:
-		while self._working.is_set():
-			chunk = self._buffer.get()
-			if not chunk:
-				return
-
-			data = [chunk]
-			size = len(chunk)
-
-			while self._working and size < 1024:
-				try:
-					chunk = self._buffer.get(block=True)
-					if not chunk or not self._working:
-						return
-					size += len(chunk)
-					data.append(chunk)
-				except queue.Empty:
-					break
-
-			yield b''.join(data)
@@ -1,11 +1,11 @@
-import wave
-
-import io
 from paho.mqtt.client import MQTTMessage
 
 from core.commons import constants
+from core.device.model.DeviceAbility import DeviceAbility
 from core.dialog.model.DialogSession import DialogSession
+from core.server.model.AudioFrame import AudioFrame
 from core.voice.model.WakewordEngine import WakewordEngine
+from core.voice.model.WakewordHost import WakewordHost
 
 try:
 	from precise_runner import PreciseEngine, PreciseRunner, ReadWriteStream
@@ -22,48 +22,106 @@ class PreciseWakeword(WakewordEngine):
 		}
 	}
 
+	# Each runner is a precise-engine process of its own
+	MAX_RUNNERS = 4
+
 	def __init__(self):
 		super().__init__()
 		self._hotwordThread = None
+		self._booted = False
+		self._available = True
+
+		# Every device gets its own precise runner and stream, precise-engine processes one stream at a time
+		self._host = WakewordHost(frameLength=1, detectorFactory=self._newRunner, maxDetectors=self.MAX_RUNNERS)
 
 		try:
-			self._stream = ReadWriteStream()
-			self._handler = PreciseRunner(
-				PreciseEngine(
-					exe_file=f'{self.Commons.rootDir()}/venv/bin/precise-engine',
-					model_file=f'{self.Commons.rootDir()}/trained/hotwords/mycroft-precise/athena.pb'
-				),
-				sensitivity=self.ConfigManager.getAliceConfigByName('wakewordSensitivity'),
-				stream=self._stream,
-				on_activation=self.hotwordSpotted
-			)
-		except:
+			PreciseRunner
+		except NameError:
+			self._available = False
 			self._enabled = False
 
 
+	def _newRunner(self, deviceUid: str):
+		stream = ReadWriteStream()
+		runner = PreciseRunner(
+			PreciseEngine(
+				exe_file=f'{self.Commons.rootDir()}/venv/bin/precise-engine',
+				model_file=f'{self.Commons.rootDir()}/trained/hotwords/mycroft-precise/athena.pb'
+			),
+			sensitivity=self.ConfigManager.getAliceConfigByName('wakewordSensitivity'),
+			stream=stream,
+			on_activation=lambda: self.hotwordSpotted(deviceUid)
+		)
+
+		if self._booted:
+			runner.start()
+
+		return runner
+
+
 	def onBooted(self):
 		super().onBooted()
-		if self._enabled:
-			if not self._handler:
-				self.logWarning('Hotword engine failed to init')
-			else:
-				self._handler.start()
+		if not self._enabled or not self._available:
+			self.logWarning('Hotword engine failed to init')
+			return
+
+		self._booted = True
+		for runner in self._host.detectors.values():
+			runner.start()
+
+		# Starting an engine takes a while, never on the audio queue, frames of devices without runner are ignored
+		self.ThreadManager.submit('background', self.startRunners)
+
+
+	def startRunners(self):
+		"""
+		Starts a runner for the main unit and every known device capturing sound, up to MAX_RUNNERS
+		"""
+		mainDevice = self.DeviceManager.getMainDevice()
+		devices = [mainDevice] if mainDevice else list()
+		devices.extend(self.DeviceManager.getDevicesWithAbilities(abilities=[DeviceAbility.CAPTURE_SOUND], connectedOnly=False))
+
+		for device in devices:
+			self.addRunner(device.uid)
+
+
+	def addRunner(self, deviceUid: str):
+		if not self._booted or self._host.detector(deviceUid, create=False):
+			return
+
+		if not self._host.detector(deviceUid):
+			self.logWarning(f'Not listening for the wakeword on device **{deviceUid}**, already running {self.MAX_RUNNERS} precise engines')
+
+
+	def onDeviceHeartbeat(self, uid: str, deviceUid: str = None):
+		# Devices added after boot get their runner once they connect
+		if not self._booted or self._host.full or self._host.detector(uid, create=False):
+			return
+
+		device = self.DeviceManager.getDevice(uid=uid)
+		if device and device.hasAbilities([DeviceAbility.CAPTURE_SOUND]):
+			self.ThreadManager.submit('background', self.addRunner, uid)
 
 
 	def onStop(self):
 		super().onStop()
-		if self._handler:
-			self._handler.stop()
+		self._booted = False
+		for runner in self._host.detectors.values():
+			runner.stop()
+		self._host.clear()
 
 
-	def hotwordSpotted(self):
-		self.logDebug('Detected wakeword')
-		self._handler.pause()
+	def hotwordSpotted(self, deviceUid: str):
+		self.logDebug(f'Detected wakeword on device **{deviceUid}**')
+		self._host.pause(deviceUid)
+		runner = self._host.detector(deviceUid, create=False)
+		if runner:
+			runner.pause()
 
 		self.MqttManager.publish(
 			topic=constants.TOPIC_HOTWORD_DETECTED.format('default'),
 			payload={
-				'siteId'            : self.DeviceManager.getMainDevice().uid,
+				'siteId'            : deviceUid,
 				'modelId'           : f'precise_athena',
 				'modelVersion'      : '0.3.0',
 				'modelType'         : 'universal',
@@ -73,21 +131,33 @@ class PreciseWakeword(WakewordEngine):
 
 
 	def onHotwordToggleOn(self, deviceUid: str, session: DialogSession):
-		if self._enabled and self._handler:
-			self._handler.start()
+		if self._enabled and self._booted:
+			self._host.resume(deviceUid)
+			runner = self._host.detector(deviceUid, create=False)
+			if runner:
+				runner.play()
+
+
+	def onHotwordToggleOff(self, deviceUid: str, session: DialogSession):
+		if self._enabled and self._booted:
+			self._host.pause(deviceUid)
+			runner = self._host.detector(deviceUid, create=False)
+			if runner:
+				runner.pause()
 
 
 	def onAudioFrame(self, message: MQTTMessage, deviceUid: str):
-		if not self.enabled or not self._handler or self._handler.is_paused or self._stream is None:
+		if not self.enabled or not self._booted or self._host.isPaused(deviceUid):
 			return
 
-		with io.BytesIO(message.payload) as buffer:
-			try:
-				with wave.open(buffer, 'rb') as wav:
-					frame = wav.readframes(self.AudioServer.FRAMES_PER_BUFFER)
-					while frame:
-						self._stream.write(frame)
-						frame = wav.readframes(self.AudioServer.FRAMES_PER_BUFFER)
+		runner = self._host.detector(deviceUid, create=False)
+		if not runner:
+			return
+
+		try:
+			frame, _ = AudioFrame.decode(message.payload)
+			if frame:
+				runner.stream.write(frame.tobytes())
 
-			except Exception as e:
-				self.logError(f'Error recording audio frame: {e}')
+		except Exception as e:
+			self.logError(f'Error recording audio frame: {e}')
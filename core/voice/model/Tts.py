@@ -1,5 +1,6 @@
 import getpass
 import re
+import time
 import uuid
 from pathlib import Path
 from re import Match
@@ -7,8 +8,6 @@ from typing import Optional
 
 import hashlib
 import tempfile
-from pydub import AudioSegment
-from pydub.exceptions import CouldntDecodeError
 
 from core.base.model.ProjectAliceObject import ProjectAliceObject
 from core.commons import constants
@@ -30,6 +29,7 @@ class Tts(ProjectAliceObject):
 		self._supportedLangAndVoices = dict()
 		self._client = None
 		self._cacheRoot = self.TTS
+		self._synthesisStart = 0
 		self._user = user
 
 		self._lang = ''
@@ -156,6 +156,10 @@ class Tts(ProjectAliceObject):
 
 
 	def _speak(self, file: Path, session: DialogSession):
+		if self._synthesisStart:
+			self.MetricsManager.observe('alice_tts_synthesis_seconds', time.perf_counter() - self._synthesisStart, self.TTS.value)
+			self._synthesisStart = 0
+
 		self._speaking = True
 		session.lastWasSoundPlayOnly = False
 
@@ -166,13 +170,13 @@ class Tts(ProjectAliceObject):
 			deviceUid=session.deviceUid
 		)
 
-		try:
-			duration = round(len(AudioSegment.from_file(file)) / 1000, 2)
-		except CouldntDecodeError:
+		entry = self.TTSManager.ttsCache.register(file)
+		if not entry:
 			self.logError('Error decoding TTS file')
-			file.unlink()
+			self.TTSManager.ttsCache.remove(file)
 			self.onSay(session)
 		else:
+			duration = entry['duration']
 			self.DialogManager.increaseSessionTimeout(session=session, interval=duration + 0.2)
 			self.ThreadManager.doLater(interval=duration + 0.1, func=self._sayFinished, args=[session])
 
@@ -211,3 +215,6 @@ class Tts(ProjectAliceObject):
 		if self._text:
 			self._cacheFile = self.cacheDirectory() / (self._hash(text=self._text) + '.wav')
 			self.cacheDirectory().mkdir(parents=True, exist_ok=True)
+			cached = self.TTSManager.ttsCache.get(self._cacheFile)
+			# Subclasses synthesize the speech before speaking it, unless the file is there
+			self._synthesisStart = time.perf_counter() if not cached and self.MetricsManager.enabled and not self._cacheFile.exists() else 0
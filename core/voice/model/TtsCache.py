@@ -0,0 +1,235 @@
+import json
+import threading
+import time
+import wave
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class TtsCache:
+	"""
+	Keeps the generated speech files under a size budget, evicting the least recently used ones.
+	Files are content addressed by the Tts, this only indexes them in a sidecar file holding their size,
+	duration, sample rate and last use, so that playing a cached file never needs to decode it.
+	"""
+
+	INDEX_FILE = 'ttsCache.json'
+
+	def __init__(self, root: Path, directories: List[Path] = None, maxBytes: int = 0):
+		"""
+		:param root: Path, the index is stored here and files are indexed relative to it
+		:param directories: list of the directories holding speech files, indexed on load if unknown
+		:param maxBytes: int, the cache size budget, 0 for no limit
+		"""
+		self._root = root
+		self._directories = directories or list()
+		self._maxBytes = maxBytes
+		self._entries: Dict[str, dict] = OrderedDict()
+		self._size = 0
+		self._lock = threading.RLock()
+
+		self._hits = 0
+		self._misses = 0
+		self._evictions = 0
+
+
+	def load(self):
+		"""
+		Loads the index, forgetting files that do not exist anymore and indexing those it doesn't know yet
+		"""
+		with self._lock:
+			try:
+				entries = json.loads((self._root / self.INDEX_FILE).read_text())
+			except (OSError, ValueError):
+				entries = dict()
+
+			self._entries = OrderedDict()
+			self._size = 0
+			for key, entry in sorted(entries.items(), key=lambda item: item[1].get('lastUse', 0)):
+				if (self._root / key).exists():
+					self._add(key, entry)
+
+			for directory in self._directories:
+				for file in sorted(directory.glob('**/*.wav'), key=lambda file: file.stat().st_mtime):
+					key = self._key(file)
+					if key not in self._entries:
+						entry = self.readMetadata(file)
+						if entry:
+							entry['lastUse'] = file.stat().st_mtime
+							self._add(key, entry)
+
+			self.evict()
+			self.save()
+
+
+	def get(self, file: Path) -> Optional[dict]:
+		"""
+		Looks a speech file up and counts a hit or a miss
+		:param file: Path
+		:return: dict, the file metadata, None on miss
+		"""
+		with self._lock:
+			key = self._key(file)
+			entry = self._entries.get(key)
+			if entry and not file.exists():
+				self._remove(key)
+				entry = None
+
+			if not entry:
+				self._misses += 1
+				return None
+
+			self._hits += 1
+			self._touch(key)
+			return entry
+
+
+	def register(self, file: Path) -> Optional[dict]:
+		"""
+		Indexes a speech file, if it isn't yet, and returns its metadata
+		:param file: Path
+		:return: dict, None if the file isn't a readable wave file
+		"""
+		with self._lock:
+			key = self._key(file)
+			if key in self._entries and file.exists():
+				self._touch(key)
+				return self._entries[key]
+
+			self._remove(key)
+			entry = self.readMetadata(file)
+			if not entry:
+				return None
+
+			entry['lastUse'] = time.time()
+			self._add(key, entry)
+			self.evict(keep=key)
+			self.save()
+			return entry
+
+
+	def remove(self, file: Path):
+		with self._lock:
+			self._remove(self._key(file))
+			if file.exists():
+				file.unlink()
+			self.save()
+
+
+	def evict(self, keep: str = '') -> int:
+		"""
+		Deletes the least recently used files until the cache fits its budget
+		:param keep: str, key of an entry to never evict, the one about to be played
+		:return: int, the number of files deleted
+		"""
+		evicted = 0
+		with self._lock:
+			if not self._maxBytes:
+				return 0
+
+			for key in list(self._entries):
+				if self._size <= self._maxBytes:
+					break
+
+				if key == keep:
+					continue
+
+				self._remove(key)
+				file = self._root / key
+				if file.exists():
+					file.unlink()
+				evicted += 1
+
+			self._evictions += evicted
+
+		return evicted
+
+
+	def save(self):
+		with self._lock:
+			self._root.mkdir(parents=True, exist_ok=True)
+			(self._root / self.INDEX_FILE).write_text(json.dumps(self._entries))
+
+
+	@staticmethod
+	def readMetadata(file: Path) -> Optional[dict]:
+		"""
+		Reads a wave file header, not its content
+		:param file: Path
+		:return: dict, with size, duration in seconds and sample rate, None if not a readable wave file
+		"""
+		try:
+			size = file.stat().st_size
+			with wave.open(str(file), 'rb') as wav:
+				sampleRate = wav.getframerate()
+				frames = wav.getnframes()
+				frameSize = wav.getnchannels() * wav.getsampwidth()
+		except (OSError, EOFError, wave.Error):
+			return None
+
+		if not sampleRate or not frameSize:
+			return None
+
+		if not frames:
+			# Some writers leave the frame count empty when streaming, assume the usual 44 bytes header
+			frames = max(0, size - 44) // frameSize
+
+		return {
+			'size'      : size,
+			'duration'  : round(frames / sampleRate, 2),
+			'sampleRate': sampleRate
+		}
+
+
+	def _key(self, file: Path) -> str:
+		try:
+			return str(file.relative_to(self._root))
+		except ValueError:
+			return str(file)
+
+
+	def _add(self, key: str, entry: dict):
+		self._entries[key] = entry
+		self._size += entry.get('size', 0)
+
+
+	def _remove(self, key: str):
+		entry = self._entries.pop(key, None)
+		if entry:
+			self._size -= entry.get('size', 0)
+
+
+	def _touch(self, key: str):
+		self._entries[key]['lastUse'] = time.time()
+		self._entries.move_to_end(key)
+
+
+	@property
+	def maxBytes(self) -> int:
+		return self._maxBytes
+
+
+	@maxBytes.setter
+	def maxBytes(self, value: int):
+		with self._lock:
+			self._maxBytes = max(0, value)
+			if self.evict():
+				self.save()
+
+
+	@property
+	def size(self) -> int:
+		return self._size
+
+
+	@property
+	def stats(self) -> dict:
+		return {
+			'files'    : len(self._entries),
+			'bytes'    : self._size,
+			'maxBytes' : self._maxBytes,
+			'hits'     : self._hits,
+			'misses'   : self._misses,
+			'evictions': self._evictions
+		}
@@ -0,0 +1,228 @@
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.server.model.AudioFrame import AudioFormat
+
+
+class DeviceBuffer:
+	"""
+	Ring buffer of 16 bits mono samples for one device. When full, the oldest samples are dropped
+	"""
+
+	def __init__(self, capacity: int):
+		self._data = np.zeros(capacity, np.int16)
+		self._start = 0
+		self._size = 0
+		self.dropped = 0
+		self.paused = False
+
+
+	def write(self, samples: np.ndarray):
+		capacity = len(self._data)
+		count = len(samples)
+		if count >= capacity:
+			self.dropped += self._size + count - capacity
+			self._data[:] = samples[-capacity:]
+			self._start = 0
+			self._size = capacity
+			return
+
+		overflow = self._size + count - capacity
+		if overflow > 0:
+			self._start = (self._start + overflow) % capacity
+			self._size -= overflow
+			self.dropped += overflow
+
+		end = (self._start + self._size) % capacity
+		first = min(count, capacity - end)
+		self._data[end:end + first] = samples[:first]
+		self._data[:count - first] = samples[first:]
+		self._size += count
+
+
+	def read(self, count: int) -> Optional[np.ndarray]:
+		if self._size < count:
+			return None
+
+		capacity = len(self._data)
+		end = self._start + count
+		if end <= capacity:
+			samples = self._data[self._start:end].copy()
+		else:
+			samples = np.concatenate((self._data[self._start:], self._data[:end - capacity]))
+
+		self._start = end % capacity
+		self._size -= count
+		return samples
+
+
+	def clear(self):
+		self._start = 0
+		self._size = 0
+
+
+	@property
+	def size(self) -> int:
+		return self._size
+
+
+class WakewordHost:
+	"""
+	Lets one wakeword engine serve every satellite: each device gets its own audio buffer and its own detector,
+	created on demand, so that streams never mix and detections are attributed to the right device
+	"""
+
+	def __init__(self, frameLength: int, detectorFactory: Callable[[str], Any], sampleRate: int = 16000, bufferFrames: int = 32, maxDetectors: int = 0):
+		"""
+		:param frameLength: int, samples the detector processes at once
+		:param detectorFactory: callable, creating the detector of the device uid it's given
+		:param sampleRate: int, the sample rate the detector expects, frames at another rate are refused
+		:param bufferFrames: int, frames buffered per device before the oldest samples are dropped
+		:param maxDetectors: int, detectors created at most, 0 for no limit
+		"""
+		self._frameLength = frameLength
+		self._detectorFactory = detectorFactory
+		self._maxDetectors = maxDetectors
+		self._sampleRate = sampleRate
+		self._capacity = frameLength * bufferFrames
+		self._buffers: Dict[str, DeviceBuffer] = dict()
+		self._detectors: Dict[str, Any] = dict()
+		self._condition = threading.Condition()
+
+
+	def feed(self, deviceUid: str, pcm: memoryview, audioFormat: AudioFormat) -> bool:
+		"""
+		Buffers the samples of an audio frame, keeping the first channel only
+		:return: bool, False if the frame format can't be used or the device is paused
+		"""
+		if audioFormat.sampleWidth != 2 or audioFormat.sampleRate != self._sampleRate:
+			return False
+
+		samples = np.frombuffer(pcm, np.int16, count=len(pcm) // 2)
+		if audioFormat.channels > 1:
+			samples = samples[::audioFormat.channels]
+
+		with self._condition:
+			buffer = self._buffers.get(deviceUid, None)
+			if not buffer:
+				buffer = self._buffers[deviceUid] = DeviceBuffer(self._capacity)
+
+			if buffer.paused:
+				return False
+
+			buffer.write(samples)
+			if buffer.size >= self._frameLength:
+				self._condition.notify()
+
+		return True
+
+
+	def pending(self, timeout: float = None) -> List[Tuple[str, np.ndarray]]:
+		"""
+		Waits for at least one device to have a full frame, and takes one frame of every device that has one
+		:param timeout: float, seconds to wait at most
+		:return: list of device uid and samples tuples, empty on timeout
+		"""
+		with self._condition:
+			if not self._hasFrame():
+				self._condition.wait(timeout=timeout)
+
+			frames = list()
+			for deviceUid, buffer in self._buffers.items():
+				if buffer.paused:
+					continue
+
+				samples = buffer.read(self._frameLength)
+				if samples is not None:
+					frames.append((deviceUid, samples))
+
+			return frames
+
+
+	def detector(self, deviceUid: str, create: bool = True) -> Any:
+		"""
+		:param deviceUid: str
+		:param create: bool, whether to create the detector if the device has none yet
+		:return: the device detector, None if it has none and none could be created
+		"""
+		with self._condition:
+			detector = self._detectors.get(deviceUid, None)
+			if detector is None and create and not self.full:
+				detector = self._detectors[deviceUid] = self._detectorFactory(deviceUid)
+
+			return detector
+
+
+	def pause(self, deviceUid: str = None):
+		"""
+		Stops buffering a device, or all of them, dropping what was buffered
+		"""
+		with self._condition:
+			if deviceUid and deviceUid not in self._buffers:
+				self._buffers[deviceUid] = DeviceBuffer(self._capacity)
+
+			for buffer in self._select(deviceUid):
+				buffer.paused = True
+				buffer.clear()
+
+
+	def resume(self, deviceUid: str = None):
+		with self._condition:
+			if deviceUid and deviceUid not in self._buffers:
+				self._buffers[deviceUid] = DeviceBuffer(self._capacity)
+
+			for buffer in self._select(deviceUid):
+				buffer.paused = False
+
+
+	def isPaused(self, deviceUid: str) -> bool:
+		buffer = self._buffers.get(deviceUid, None)
+		return bool(buffer and buffer.paused)
+
+
+	def wakeUp(self):
+		"""
+		Releases a thread waiting for frames
+		"""
+		with self._condition:
+			self._condition.notify_all()
+
+
+	def clear(self):
+		"""
+		Forgets every device and detector
+		"""
+		with self._condition:
+			self._buffers.clear()
+			self._detectors.clear()
+			self._condition.notify_all()
+
+
+	@property
+	def full(self) -> bool:
+		return 0 < self._maxDetectors <= len(self._detectors)
+
+
+	@property
+	def detectors(self) -> Dict[str, Any]:
+		return dict(self._detectors)
+
+
+	@property
+	def stats(self) -> Dict[str, dict]:
+		with self._condition:
+			return {deviceUid: {'buffered': buffer.size, 'dropped': buffer.dropped, 'paused': buffer.paused} for deviceUid, buffer in self._buffers.items()}
+
+
+	def _select(self, deviceUid: Optional[str]) -> List[DeviceBuffer]:
+		if not deviceUid:
+			return list(self._buffers.values())
+
+		buffer = self._buffers.get(deviceUid, None)
+		return [buffer] if buffer else list()
+
+
+	def _hasFrame(self) -> bool:
+		return any(not buffer.paused and buffer.size >= self._frameLength for buffer in self._buffers.values())
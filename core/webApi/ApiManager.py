@@ -9,6 +9,7 @@ from core.base.model.Manager import Manager
 from core.webApi.model.DevicesApi import DevicesApi
 from core.webApi.model.DialogApi import DialogApi
 from core.webApi.model.LoginApi import LoginApi
+from core.webApi.model.MetricsApi import MetricsApi
 from core.webApi.model.MyHomeApi import MyHomeApi
 from core.webApi.model.SkillsApi import SkillsApi
 from core.webApi.model.TelemetryApi import TelemetryApi
@@ -19,11 +20,14 @@ from core.webApi.model.StateApi import StateApi
 
 
 class ApiManager(Manager):
+
+	START_DEPENDENCIES = ['UserManager']
+
 	app = Flask(__name__)
 	app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 	CORS(app, resources={r'/api/*': {'origins': '*'}})
 
-	_APIS = [UtilsApi, LoginApi, UsersApi, SkillsApi, DialogApi, TelemetryApi, WidgetsApi, StateApi, MyHomeApi, DevicesApi]
+	_APIS = [UtilsApi, LoginApi, UsersApi, SkillsApi, DialogApi, TelemetryApi, WidgetsApi, StateApi, MyHomeApi, DevicesApi, MetricsApi]
 
 
 	def __init__(self):
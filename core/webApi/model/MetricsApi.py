@@ -0,0 +1,27 @@
+from flask import Response
+from flask_classful import route
+
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+from core.webApi.model.Api import Api
+
+
+class MetricsApi(Api):
+	"""
+	Serves the metrics where Prometheus looks for them by default, with no authentication, as they hold no sensitive data
+	"""
+
+	route_base = '/'
+	# Served from the root, where the inherited methods must not become routes
+	excluded_methods = [name for name in dir(ProjectAliceObject) if not name.startswith('_')]
+
+
+	def __init__(self):
+		super().__init__()
+
+
+	@route('/metrics', methods=['GET'])
+	def metrics(self):
+		if not self.MetricsManager or not self.MetricsManager.enabled:
+			return Response('Metrics are disabled\n', status=404, mimetype='text/plain')
+
+		return Response(self.MetricsManager.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
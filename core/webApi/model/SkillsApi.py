@@ -140,6 +140,30 @@ class SkillsApi(Api):
 			return jsonify(success=False, message=str(e))
 
 
+	@route('/<skillName>/dialogTemplate/<lang>/')
+	@ApiAuthenticated
+	def getDialogTemplate(self, skillName: str, lang: str):
+		"""
+		The skill dialog template, read from the utterance cache so that every intent comes with its parsed utterance segments
+		"""
+		skill = self.SkillManager.getSkillInstance(skillName=skillName, silent=True)
+		if not skill:
+			return self.skillNotFound()
+
+		if lang not in self.LanguageManager.supportedLanguages:
+			return jsonify(success=False, reason='language not supported')
+
+		try:
+			data = self.DialogTemplateManager.utteranceCache.load(skillName=skillName, language=lang, file=skill.getResource(f'dialogTemplate/{lang}.json'))
+			if data is None:
+				return jsonify(success=False, reason='dialog template not found')
+
+			return jsonify(success=True, dialogTemplate=data)
+		except Exception as e:
+			self.logWarning(f'Failed fetching dialog template: {e}', printStack=True)
+			return jsonify(success=False, message=str(e))
+
+
 	@route('/<skillName>/toggleActiveState/')
 	@ApiAuthenticated
 	def toggleActiveState(self, skillName: str):
@@ -20,7 +20,7 @@ class UtilsApi(Api):
 	@ApiAuthenticated
 	def restart(self):
 		try:
-			self.ThreadManager.doLater(interval=2, func=self.ProjectAlice.doRestart)
+			self.ThreadManager.doLater(interval=2, func=self.ProjectAlice.doRestart, background=True)
 			return jsonify(success=True)
 		except Exception as e:
 			self.logError(f'Failed restarting Alice: {e}')
@@ -31,7 +31,7 @@ class UtilsApi(Api):
 	@ApiAuthenticated
 	def reboot(self):
 		try:
-			self.ThreadManager.doLater(interval=2, func=self.Commons.runRootSystemCommand, args=[['shutdown', '-r', 'now']])
+			self.ThreadManager.doLater(interval=2, func=self.Commons.runRootSystemCommand, args=[['shutdown', '-r', 'now']], background=True)
 			return jsonify(success=True)
 		except Exception as e:
 			self.logError(f'Failed rebooting device: {e}')
@@ -153,7 +153,7 @@ class UtilsApi(Api):
 	def wipeAll(self) -> dict:
 		try:
 			self.ProjectAlice.wipeAll()
-			self.ThreadManager.doLater(interval=2, func=self.ProjectAlice.doRestart)
+			self.ThreadManager.doLater(interval=2, func=self.ProjectAlice.doRestart, background=True)
 			return jsonify(success=True)
 		except Exception as e:
 			self.logError(f'Failed wiping system: {e}')
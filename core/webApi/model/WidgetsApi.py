@@ -1,4 +1,4 @@
-from flask import jsonify, request, send_from_directory
+from flask import Response, jsonify, request, send_from_directory
 from flask_classful import route
 
 from core.webApi.model.Api import Api
@@ -17,7 +17,7 @@ class WidgetsApi(Api):
 	def getWidgets(self):
 		try:
 			widgets = {widget.id: widget.toDict(self.UserManager.apiTokenValid(request.headers.get('auth', ''))) for widget in self.WidgetManager.widgets.values()}
-			return jsonify(success=True, widgets=widgets)
+			return self._conditional(jsonify(success=True, widgets=widgets))
 
 		except Exception as e:
 			self.logError(f'Failed retrieving widget instances: {e}')
@@ -44,7 +44,7 @@ class WidgetsApi(Api):
 	@route('/resources/<skillName>/<widgetName>.js/', methods=['GET'])
 	def getJS(self, skillName: str, widgetName: str):
 		try:
-			return send_from_directory(f'{self.Commons.rootDir()}/skills/{skillName}/widgets/js', f'{widgetName}.js')
+			return self._templateAsset(skillName, widgetName, 'js', 'application/javascript')
 		except Exception as e:
 			self.logError(f'Error fetching widget JS resource {e}')
 			return jsonify(success=False, message=str(e))
@@ -53,12 +53,35 @@ class WidgetsApi(Api):
 	@route('/resources/<skillName>/<widgetName>.css', methods=['GET'])
 	def getCSS(self, skillName: str, widgetName: str):
 		try:
-			return send_from_directory(f'{self.Commons.rootDir()}/skills/{skillName}/widgets/css', f'{widgetName}.css')
+			return self._templateAsset(skillName, widgetName, 'css', 'text/css')
 		except Exception as e:
 			self.logError(f'Error fetching widget CSS resource {e}')
 			return jsonify(success=False, message=str(e))
 
 
+	def _templateAsset(self, skillName: str, widgetName: str, kind: str, mimetype: str) -> Response:
+		asset = self.WidgetManager.getTemplateAsset(skillName, widgetName, kind)
+		if not asset:
+			return Response(status=404)
+
+		content, etag = asset
+		return self._conditional(Response(content, mimetype=mimetype), etag)
+
+
+	@staticmethod
+	def _conditional(response: Response, etag: str = None) -> Response:
+		"""
+		Tags the response and turns it into an empty 304 if the client already has it
+		"""
+		if etag:
+			response.set_etag(etag)
+		else:
+			response.add_etag()
+
+		response.cache_control.no_cache = True
+		return response.make_conditional(request.environ)
+
+
 	@route('/resources/img/<skillName>/<image>', methods=['GET'])
 	def getImage(self, skillName: str, image: str):
 		try:
@@ -88,6 +111,16 @@ class WidgetsApi(Api):
 			return jsonify(success=False, message=str(e))
 
 
+	@route('/pages/<pageId>/bundle/', methods=['GET'])
+	def getPageBundle(self, pageId: str):
+		try:
+			bundle = self.WidgetManager.getPageBundle(int(pageId), self.UserManager.apiTokenValid(request.headers.get('auth', '')))
+			return self._conditional(jsonify(success=True, **bundle))
+		except Exception as e:
+			self.logError(f'Failed retrieving widget page bundle: {e}')
+			return jsonify(success=False, message=str(e))
+
+
 	@route('/pages/<pageId>/', methods=['DELETE'])
 	@ApiAuthenticated
 	def removePage(self, pageId: str):
@@ -9,6 +9,9 @@ from core.base.model.Manager import Manager
 
 
 class NodeRedManager(Manager):
+
+	START_DEPENDENCIES = ['SkillManager']
+
 	PACKAGE_PATH = Path('../.node-red/package.json')
 	DEFAULT_NODES_ACTIVE = {
 		'node-red': [
@@ -8,6 +8,8 @@ from core.commons import constants
 
 class WebUIManager(Manager):
 
+	START_DEPENDENCIES = ['LanguageManager']
+
 	def onStart(self):
 		super().onStart()
 
@@ -1,14 +1,18 @@
 import importlib
 import sqlite3
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from core.base.model.Manager import Manager
 from core.webui.model.Widget import Widget
+from core.webui.model.WidgetAssets import WidgetAssets
 from core.webui.model.WidgetPage import WidgetPage
 
 
 class WidgetManager(Manager):
+
+	START_DEPENDENCIES = ['SkillManager', 'DeviceManager']
+
 	DEFAULT_ICON = 'fas fa-biohazard'
 
 	WIDGETS_TABLE = 'activeWidgets'
@@ -37,6 +41,7 @@ class WidgetManager(Manager):
 		self._widgets: Dict[int, Widget] = dict()
 		self._pages = dict()
 		self._widgetsByIndex = dict()
+		self._assets = WidgetAssets(self.Commons.rootDir())
 
 
 	def onStart(self):
@@ -247,7 +252,13 @@ class WidgetManager(Manager):
 		self._widgets.pop(widgetId, None)
 
 
+	def skillUpdated(self, skillName: str):
+		self._assets.invalidate(skillName)
+
+
 	def skillRemoved(self, skillName: str):
+		self._assets.invalidate(skillName)
+
 		# noinspection SqlResolve
 		self.DatabaseManager.delete(
 			tableName=self.WIDGETS_TABLE,
@@ -267,6 +278,10 @@ class WidgetManager(Manager):
 		self.skillRemoved(skillName)
 
 
+	def skillStopped(self, skillName: str):
+		self._assets.invalidate(skillName)
+
+
 	def getNextZIndex(self, pageId: int):
 		# Build a list of widgets on this page
 		widgets = list()
@@ -321,6 +336,49 @@ class WidgetManager(Manager):
 		return self._widgets.get(widgetId, None)
 
 
+	def getPageBundle(self, pageId: int, isAuth: bool = False) -> dict:
+		"""
+		Everything the interface needs to draw a page: its widgets and the scripts they use
+		:param pageId: int
+		:param isAuth: bool, whether the widget configs can be sent
+		:return: dict
+		"""
+		widgets = dict()
+		scripts = dict()
+		for widget in self._widgets.values():
+			if widget.page != pageId:
+				continue
+
+			widgets[widget.id] = widget.toDict(isAuth)
+			scripts.setdefault(f'{widget.skill}/{widget.name}', widget.js())
+
+		return {
+			'widgets': widgets,
+			'scripts': scripts
+		}
+
+
+	def getTemplateAsset(self, skillName: str, widgetName: str, kind: str) -> Optional[Tuple[str, str]]:
+		"""
+		The compiled script or style of a widget template, whether it has instances or not
+		:param skillName: str
+		:param widgetName: str
+		:param kind: str, 'css' or 'js'
+		:return: tuple of the asset and its etag, None if there's no such template
+		"""
+		if kind not in {'css', 'js'} or widgetName not in self._widgetTemplates.get(skillName, list()):
+			return None
+
+		file = Path(self.Commons.rootDir(), 'skills', skillName, 'widgets', Widget.ASSET_FILES[kind].format(widgetName))
+		compiler = Widget.compileCss if kind == 'css' else Widget.compileJs
+		return self._assets.get(skillName, widgetName, kind, [file], lambda: compiler(file))
+
+
+	@property
+	def assets(self) -> WidgetAssets:
+		return self._assets
+
+
 	@property
 	def widgetTemplates(self) -> dict:
 		return self._widgetTemplates
@@ -3,7 +3,7 @@ import json
 import re
 import sqlite3
 from pathlib import Path
-from typing import Dict, Match, Optional, Union
+from typing import Dict, Match, Optional, Tuple, Union
 
 import htmlmin as htmlmin
 from cssmin import cssmin
@@ -11,6 +11,7 @@ from jsmin import jsmin
 
 from core.base.model.AliceSkill import AliceSkill
 from core.base.model.ProjectAliceObject import ProjectAliceObject
+from core.webui.model.WidgetAssets import WidgetAssets
 from core.webui.model.WidgetSizes import WidgetSizes
 
 
@@ -18,6 +19,13 @@ class Widget(ProjectAliceObject):
 	DEFAULT_SIZE = WidgetSizes.w_small
 	DEFAULT_OPTIONS = dict()
 
+	ASSET_FILES = {
+		'icon': 'templates/{}.html',
+		'html': 'templates/{}.html',
+		'css' : 'css/{}.css',
+		'js'  : 'js/{}.js'
+	}
+
 	def __init__(self, data: Union[sqlite3.Row, dict]):
 		super().__init__()
 
@@ -65,9 +73,13 @@ class Widget(ProjectAliceObject):
 		self._id = wid
 
 
+	def languageFile(self) -> Path:
+		return self.getCurrentDir() / f'lang/{self.name}.lang.json'
+
+
 	def loadLanguageFile(self) -> Optional[Dict]:
 		try:
-			file = self.getCurrentDir() / f'lang/{self.name}.lang.json'
+			file = self.languageFile()
 			with file.open() as fp:
 				return json.load(fp)
 		except FileNotFoundError:
@@ -114,9 +126,49 @@ class Widget(ProjectAliceObject):
 		return Path(inspect.getfile(self.__class__)).parent
 
 
+	def assetFile(self, kind: str) -> Path:
+		return self.getCurrentDir() / self.ASSET_FILES[kind].format(self.name)
+
+
+	def asset(self, kind: str) -> Tuple[str, str]:
+		"""
+		Returns the compiled asset of the given kind, compiling it only if its source changed
+		:param kind: str, one of ASSET_FILES
+		:return: tuple of the asset and its etag
+		"""
+		file = self.assetFile(kind)
+		if kind == 'html':
+			return self.WidgetManager.assets.get(self._skill, self._name, kind, [file, self.languageFile()], lambda: self.compileHtml(file), language=self.LanguageManager.activeLanguage)
+
+		return self.WidgetManager.assets.get(self._skill, self._name, kind, [file], lambda: getattr(self, f'compile{kind.capitalize()}')(file))
+
+
 	def icon(self) -> str:
+		return self.asset('icon')[0]
+
+
+	def html(self) -> str:
+		return self.asset('html')[0]
+
+
+	def css(self) -> str:
+		return self.asset('css')[0]
+
+
+	def js(self) -> str:
+		return self.asset('js')[0]
+
+
+	@property
+	def etag(self) -> str:
+		"""
+		Changes whenever one of the widget assets does
+		"""
+		return WidgetAssets.etag(*(self.asset(kind)[1] for kind in self.ASSET_FILES))
+
+
+	def compileIcon(self, file: Path) -> str:
 		try:
-			file = Path(self.getCurrentDir(), f'templates/{self.name}.html')
 			content = cssmin(file.read_text())
 			header = re.search(r'<icon>(.*)</icon>', content)
 			if header:
@@ -128,9 +180,10 @@ class Widget(ProjectAliceObject):
 			return ''
 
 
-	def html(self) -> str:
+	def compileHtml(self, file: Path) -> str:
 		try:
-			file = Path(self.getCurrentDir(), f'templates/{self.name}.html')
+			# Compiling only happens when the template or the language file changed
+			self._lang = self.loadLanguageFile()
 			content = file.read_text()
 			content = re.sub(r'{{ lang\.([\w]*) }}', self.langReplace, content)
 			content = re.sub(r'<widget>(.*)</widget>', r'\1', content, flags=re.S)
@@ -151,20 +204,18 @@ class Widget(ProjectAliceObject):
 			return ''
 
 
-	def css(self) -> str:
+	@staticmethod
+	def compileCss(file: Path) -> str:
 		try:
-			file = Path(self.getCurrentDir(), f'css/{self.name}.css')
-			content = cssmin(file.read_text())
-			return content
+			return cssmin(file.read_text())
 		except:
 			return ''
 
 
-	def js(self) -> str:
+	@staticmethod
+	def compileJs(file: Path) -> str:
 		try:
-			file = Path(self.getCurrentDir(), f'js/{self.name}.js')
-			content = jsmin(file.read_text())
-			return content
+			return jsmin(file.read_text())
 		except:
 			return ''
 
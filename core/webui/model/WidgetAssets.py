@@ -0,0 +1,127 @@
+import hashlib
+import json
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class WidgetAssets:
+	"""
+	Compiled widget templates, styles and scripts, kept in memory and under var/cache/widgets.
+	An asset is only compiled again once one of its source files changed or for another language
+	"""
+
+	CACHE_PATH = Path('var/cache/widgets')
+
+	def __init__(self, rootDir: str):
+		self._cachePath = Path(rootDir, self.CACHE_PATH)
+		self._assets: Dict[Tuple[str, str, str, str], Tuple[list, str, str]] = dict()
+		self._lock = threading.Lock()
+		self._hits = 0
+		self._loaded = 0
+		self._compiled = 0
+
+
+	def get(self, skillName: str, widgetName: str, kind: str, sources: List[Path], compiler: Callable[[], str], language: str = '') -> Tuple[str, str]:
+		"""
+		Returns the compiled asset, compiling it only if its sources changed since it was cached
+		:param skillName: str
+		:param widgetName: str
+		:param kind: str, the kind of asset, ex. 'html' or 'js'
+		:param sources: list of the files the asset is made of
+		:param compiler: callable returning the compiled asset
+		:param language: str, for assets depending on the active language
+		:return: tuple of the asset and its etag
+		"""
+		key = (skillName, widgetName, kind, language)
+		signature = self.signature(sources)
+
+		with self._lock:
+			asset = self._assets.get(key, None)
+			if asset and asset[0] == signature:
+				self._hits += 1
+				return asset[1], asset[2]
+
+		file = self._cachePath / skillName / f'{widgetName}.{kind}{f".{language}" if language else ""}.json'
+		asset = self._read(file, signature)
+		compiled = not asset
+		if compiled:
+			content = compiler()
+			asset = (signature, content, self.etag(content))
+			self._write(file, asset)
+
+		with self._lock:
+			self._assets[key] = asset
+			if compiled:
+				self._compiled += 1
+			else:
+				self._loaded += 1
+
+		return asset[1], asset[2]
+
+
+	def invalidate(self, skillName: str = None):
+		"""
+		Forgets the assets of a skill, or all of them
+		"""
+		with self._lock:
+			for key in [key for key in self._assets if not skillName or key[0] == skillName]:
+				del self._assets[key]
+
+		shutil.rmtree(self._cachePath / skillName if skillName else self._cachePath, ignore_errors=True)
+
+
+	@staticmethod
+	def signature(sources: List[Path]) -> list:
+		signature = list()
+		for source in sources:
+			try:
+				stat = source.stat()
+				signature.append([str(source), stat.st_mtime_ns, stat.st_size])
+			except OSError:
+				signature.append([str(source), None])
+
+		return signature
+
+
+	@staticmethod
+	def etag(*contents: str) -> str:
+		digest = hashlib.sha1()
+		for content in contents:
+			digest.update(content.encode())
+			digest.update(b'\0')
+		return digest.hexdigest()
+
+
+	@property
+	def stats(self) -> dict:
+		with self._lock:
+			return {
+				'assets'  : len(self._assets),
+				'hits'    : self._hits,
+				'loaded'  : self._loaded,
+				'compiled': self._compiled
+			}
+
+
+	@staticmethod
+	def _read(file: Path, signature: list) -> Optional[Tuple[list, str, str]]:
+		try:
+			data = json.loads(file.read_text())
+		except (OSError, ValueError):
+			return None
+
+		if data.get('signature') != signature:
+			return None
+
+		return signature, data['content'], data['etag']
+
+
+	@staticmethod
+	def _write(file: Path, asset: Tuple[list, str, str]):
+		try:
+			file.parent.mkdir(parents=True, exist_ok=True)
+			file.write_text(json.dumps({'signature': asset[0], 'content': asset[1], 'etag': asset[2]}, ensure_ascii=False))
+		except OSError:
+			pass  # The memory cache still works without the disk one
@@ -0,0 +1,54 @@
+import threading
+import time
+from unittest import TestCase
+
+from core.asr.model.AsrPool import AsrPool
+
+
+class TestAsrPool(TestCase):
+
+	def test_acquire_release(self):
+		first, second = object(), object()
+		pool = AsrPool([first, second], maxWaiting=0)
+
+		self.assertIs(pool.acquire('kitchen'), first)
+		self.assertIs(pool.acquire('bedroom'), second)
+		self.assertIs(pool.engineFor('bedroom'), second)
+		self.assertEqual(pool.stats['busy'], 2)
+
+		# No free engine and no waiting allowed
+		self.assertIsNone(pool.acquire('garage'))
+		self.assertEqual(pool.stats['rejected'], 1)
+
+		pool.release(first)
+		pool.release(first)
+		self.assertIsNone(pool.engineFor('kitchen'))
+		self.assertIs(pool.acquire('garage'), first)
+
+
+	def test_waits_for_release(self):
+		engine = object()
+		pool = AsrPool([engine], maxWaiting=1, waitTimeout=5)
+		pool.acquire('kitchen')
+
+		acquired = list()
+		thread = threading.Thread(target=lambda: acquired.append(pool.acquire('bedroom')))
+		thread.start()
+
+		while not pool.stats['waiting']:
+			time.sleep(0.001)
+
+		# The queue is full
+		self.assertIsNone(pool.acquire('garage'))
+
+		pool.release(engine)
+		thread.join(timeout=5)
+		self.assertEqual(acquired, [engine])
+		self.assertIs(pool.engineFor('bedroom'), engine)
+
+
+	def test_wait_timeout(self):
+		pool = AsrPool([object()], maxWaiting=1, waitTimeout=0.01)
+		pool.acquire('kitchen')
+		self.assertIsNone(pool.acquire('bedroom'))
+		self.assertEqual(pool.stats['waiting'], 0)
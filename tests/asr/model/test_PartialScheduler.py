@@ -0,0 +1,56 @@
+import time
+from unittest import TestCase
+
+import numpy as np
+
+from core.asr.model.PartialScheduler import PartialScheduler
+
+
+# 100ms chunks of 16kHz 16 bits mono audio
+SILENCE = np.zeros(1600, np.int16).tobytes()
+SPEECH = (np.sin(np.arange(1600) / 5) * 8000).astype(np.int16).tobytes()
+
+
+class TestPartialScheduler(TestCase):
+
+	def test_interval(self):
+		scheduler = PartialScheduler(mode='interval', interval=0.5)
+		due = [scheduler.feed(SPEECH) for _ in range(20)]
+		self.assertEqual(due.count(True), 4)
+		self.assertTrue(due[4])
+		self.assertEqual(scheduler.stats['audioSeconds'], 2)
+
+
+	def test_off(self):
+		scheduler = PartialScheduler(mode='off')
+		self.assertFalse(any(scheduler.feed(SPEECH) for _ in range(20)))
+
+
+	def test_budget(self):
+		scheduler = PartialScheduler(mode='budget', interval=0.1, budget=0.1)
+		self.assertTrue(scheduler.feed(SPEECH))
+
+		# Decoding took way more than 10% of the 100ms of audio
+		with scheduler.measure():
+			time.sleep(0.05)
+
+		self.assertFalse(scheduler.feed(SPEECH))
+		self.assertFalse(scheduler.feed(SPEECH))
+
+
+	def test_pause(self):
+		scheduler = PartialScheduler(mode='pause')
+		self.assertFalse(scheduler.feed(SILENCE))
+		self.assertFalse(scheduler.feed(SPEECH))
+		self.assertFalse(scheduler.feed(SPEECH))
+		self.assertTrue(scheduler.feed(SILENCE))
+		self.assertFalse(scheduler.feed(SILENCE))
+
+
+	def test_changed(self):
+		scheduler = PartialScheduler()
+		self.assertFalse(scheduler.changed(''))
+		self.assertTrue(scheduler.changed('turn on'))
+		self.assertFalse(scheduler.changed('turn on'))
+		self.assertTrue(scheduler.changed('turn on the light'))
+		self.assertEqual(scheduler.stats['published'], 2)
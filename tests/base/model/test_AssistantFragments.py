@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from core.base.model.AssistantFragments import AssistantFragments
+
+
+class TestAssistantFragments(TestCase):
+
+	TEMPLATE = {
+		'skill'  : 'Lights',
+		'intents': [
+			{
+				'name'            : 'LightOn',
+				'enabledByDefault': True,
+				'slots'           : [
+					{'name': 'Location', 'type': 'Alice/Location', 'missingQuestion': '', 'required': False},
+					{'name': 'Other', 'type': 'Alice/Location', 'missingQuestion': '', 'required': False}
+				]
+			},
+			{
+				'name'            : 'LightOff',
+				'enabledByDefault': False,
+				'slots'           : [
+					{'name': 'Location', 'type': 'Alice/Location', 'missingQuestion': '', 'required': True}
+				]
+			}
+		]
+	}
+
+	def setUp(self):
+		self.tmp = tempfile.TemporaryDirectory()
+		self.template = Path(self.tmp.name, 'en.json')
+		self.template.write_text(json.dumps(self.TEMPLATE))
+		self.fragments = AssistantFragments(Path(self.tmp.name, 'cache'), lambda file: hashlib.blake2b(file.read_bytes()).hexdigest())
+
+
+	def tearDown(self):
+		self.tmp.cleanup()
+
+
+	def test_build(self):
+		intents = AssistantFragments.build(self.TEMPLATE, 'en')
+		self.assertEqual([intent['name'] for intent in intents], ['LightOn', 'LightOff'])
+		self.assertEqual(intents[0]['language'], 'en')
+		self.assertFalse(intents[1]['enabledByDefault'])
+
+		location, other = intents[0]['slots']
+		self.assertEqual(location['entityId'], other['entityId'])
+		self.assertNotEqual(location['id'], other['id'])
+		self.assertEqual(intents[1]['slots'][0]['id'], location['id'])
+		self.assertEqual(len(location['id']), 9)
+		self.assertTrue(location['entityId'].startswith('entity_'))
+
+		# Ids don't change from one build to another
+		self.assertEqual(AssistantFragments.build(self.TEMPLATE, 'en'), intents)
+
+
+	def test_load(self):
+		fragment = self.fragments.load('Lights', 'en', self.template)
+		self.assertEqual(fragment['intents'], AssistantFragments.build(self.TEMPLATE, 'en'))
+
+		# Untouched files are not even hashed
+		self.fragments._checksum = MagicMock(side_effect=self.fragments._checksum)
+		self.assertIs(self.fragments.load('Lights', 'en', self.template), fragment)
+		self.fragments._checksum.assert_not_called()
+
+		# Touched but unchanged, the fragment is kept
+		with patch.object(AssistantFragments, 'build') as build:
+			self.template.write_text(json.dumps(self.TEMPLATE))
+			os.utime(self.template, ns=(0, 1))
+			self.assertEqual(self.fragments.load('Lights', 'en', self.template)['intents'], fragment['intents'])
+			build.assert_not_called()
+
+		self.template.write_text(json.dumps({'intents': list()}))
+		self.assertEqual(self.fragments.load('Lights', 'en', self.template)['intents'], list())
+		self.assertIsNone(self.fragments.load('Lights', 'en', Path(self.tmp.name, 'missing.json')))
+
+
+	def test_disk_cache(self):
+		fragment = self.fragments.load('Lights', 'en', self.template)
+		other = AssistantFragments(Path(self.tmp.name, 'cache'), MagicMock())
+		self.assertEqual(other.load('Lights', 'en', self.template), fragment)
+		other._checksum.assert_not_called()
+
+
+	def test_assemble(self):
+		intents, duplicates = AssistantFragments.assemble({
+			'Lights': {'checksum': 'a', 'intents': [{'name': 'LightOn'}, {'name': 'LightOff'}]},
+			'Other' : {'checksum': 'b', 'intents': [{'name': 'LightOn', 'other': True}, {'name': 'Hello'}]}
+		})
+		self.assertEqual(intents, [{'name': 'LightOn'}, {'name': 'LightOff'}, {'name': 'Hello'}])
+		self.assertEqual(duplicates, ['LightOn'])
+
+
+	def test_signature(self):
+		first = AssistantFragments.signature({'Lights': {'checksum': 'a'}, 'Other': {'checksum': 'b'}})
+		self.assertEqual(first, AssistantFragments.signature({'Other': {'checksum': 'b'}, 'Lights': {'checksum': 'a'}}))
+		self.assertNotEqual(first, AssistantFragments.signature({'Lights': {'checksum': 'a'}, 'Other': {'checksum': 'c'}}))
+		self.assertNotEqual(first, AssistantFragments.signature({'Lights': {'checksum': 'a'}}))
+
+		self.assertEqual(self.fragments.readSignature('en'), '')
+		self.fragments.writeSignature('en', first)
+		self.assertEqual(self.fragments.readSignature('en'), first)
+		self.assertEqual(self.fragments.readSignature('de'), '')
+		self.fragments.writeSignature('en')
+		self.assertEqual(self.fragments.readSignature('en'), '')
+
+
+	def test_drop(self):
+		self.fragments.load('Lights', 'en', self.template)
+		self.fragments.drop('Lights')
+		self.assertFalse(list(Path(self.tmp.name, 'cache').glob('Lights_*.json')))
+		self.fragments.load('Lights', 'en', self.template)
+		self.fragments.drop()
+		self.assertFalse(Path(self.tmp.name, 'cache').exists())
@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+from core.base.model.EventRegistry import EventRegistry
+from core.base.model.ProjectAliceObject import ProjectAliceObject
+
+
+class Subscriber(ProjectAliceObject):
+
+	def __init__(self):
+		self.calls = list()
+
+
+	def onHotword(self, deviceUid: str, user: str = 'unknown'):
+		self.calls.append(('onHotword', deviceUid))
+
+
+	def onCustomEvent(self):
+		self.calls.append(('onCustomEvent', None))
+
+
+class Silent(ProjectAliceObject):
+
+	def __init__(self):
+		pass
+
+
+class CatchAll(ProjectAliceObject):
+
+	def __init__(self):
+		self.events = list()
+
+
+	def onEvent(self, event: str, **kwargs):
+		self.events.append(event)
+
+
+class TestEventRegistry(TestCase):
+
+	def test_index(self):
+		registry = EventRegistry()
+		subscriber = Subscriber()
+		registry.index({'Subscriber': subscriber, 'Silent': Silent(), 'Dead': None})
+
+		handlers = registry.handlers('onHotword')
+		self.assertEqual(len(handlers), 1)
+		name, instance, func, isFallback = handlers[0]
+		self.assertEqual(name, 'Subscriber')
+		self.assertIs(instance, subscriber)
+		self.assertFalse(isFallback)
+
+		func(deviceUid='default')
+		self.assertEqual(subscriber.calls, [('onHotword', 'default')])
+
+		self.assertEqual(len(registry.handlers('onCustomEvent')), 1)
+		self.assertEqual(registry.handlers('onSessionStarted'), list())
+		self.assertEqual(registry.handlers('onUnknownEvent'), list())
+
+
+	def test_fallback(self):
+		registry = EventRegistry(fallback='onEvent')
+		subscriber = Subscriber()
+		catchAll = CatchAll()
+		registry.index({'Subscriber': subscriber, 'CatchAll': catchAll})
+
+		self.assertEqual(
+			[(name, isFallback) for name, _, _, isFallback in registry.handlers('onHotword')],
+			[('Subscriber', False), ('CatchAll', True)]
+		)
+		self.assertEqual(
+			[(name, isFallback) for name, _, _, isFallback in registry.handlers('onSessionStarted')],
+			[('CatchAll', True)]
+		)
+
+
+	def test_reindex(self):
+		registry = EventRegistry()
+		registry.index({'Subscriber': Subscriber()})
+		self.assertEqual(len(registry.handlers('onHotword')), 1)
+
+		registry.index({'Silent': Silent()})
+		self.assertEqual(registry.handlers('onHotword'), list())
+
+		registry.index({'Subscriber': Subscriber()})
+		registry.clear()
+		self.assertEqual(registry.handlers('onHotword'), list())
+
+
+	def test_is_handler(self):
+		self.assertTrue(EventRegistry.isHandler(Subscriber, 'onHotword'))
+		self.assertFalse(EventRegistry.isHandler(Subscriber, 'onSessionStarted'))
+		self.assertFalse(EventRegistry.isHandler(Subscriber, 'onNotExisting'))
@@ -0,0 +1,72 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from core.base.model.AliceSkill import AliceSkill
+from core.base.model.IntentRouter import IntentRouter
+
+
+class Skill(AliceSkill):
+
+	# noinspection PyMissingConstructor
+	def __init__(self, name: str, intents: list):
+		self._name = name
+		self._active = True
+		self._supportedIntents = {intent: f'{name}:{intent}' for intent in intents}
+
+
+class CustomSkill(Skill):
+
+	def onMessageDispatch(self, session) -> bool:
+		return False
+
+
+class TestIntentRouter(TestCase):
+
+	def setUp(self):
+		self.skills = {
+			'First'  : Skill('First', ['hermes/intent/greet', 'hermes/intent/weather']),
+			'Second' : Skill('Second', ['hermes/intent/#', 'hermes/intent/greet']),
+			'Third'  : Skill('Third', ['hermes/+/weather', 'hermes/intent/weather/#']),
+			'Custom' : CustomSkill('Custom', ['hermes/intent/greet']),
+			'Nothing': Skill('Nothing', list())
+		}
+		self.router = IntentRouter(lambda: self.skills)
+
+
+	def route(self, topic: str) -> list:
+		return [(skillName, intent) for skillName, _, intent in self.router.route(topic)]
+
+
+	def test_route(self):
+		self.assertEqual(self.route('hermes/intent/greet'), [
+			('First', 'First:hermes/intent/greet'),
+			('Second', 'Second:hermes/intent/greet'),
+			('Custom', None)
+		])
+		self.assertEqual(self.route('hermes/intent/weather'), [
+			('First', 'First:hermes/intent/weather'),
+			('Second', 'Second:hermes/intent/#'),
+			('Third', 'Third:hermes/intent/weather/#'),
+			('Custom', None)
+		])
+		self.assertEqual(self.route('hermes/other/weather'), [('Third', 'Third:hermes/+/weather'), ('Custom', None)])
+		self.assertEqual(self.route('other/topic'), [('Custom', None)])
+
+
+	def test_same_as_filter_intent(self):
+		session = MagicMock()
+		for topic in ['hermes/intent/greet', 'hermes/intent/weather', 'hermes/intent', 'hermes/other/weather', 'hermes/intent/weather/today', 'nope']:
+			session.message.topic = topic
+			expected = [(skillName, skill.filterIntent(session)) for skillName, skill in self.skills.items() if IntentRouter.isRoutable(skill) and skill.filterIntent(session)]
+			routed = [(skillName, intent) for skillName, intent in self.route(topic) if intent]
+			self.assertEqual(routed, expected, topic)
+
+
+	def test_invalidate(self):
+		self.assertEqual(len(self.route('hermes/intent/greet')), 3)
+
+		self.skills.pop('First')
+		self.assertEqual(len(self.route('hermes/intent/greet')), 3)
+
+		self.router.invalidate()
+		self.assertEqual(len(self.route('hermes/intent/greet')), 2)
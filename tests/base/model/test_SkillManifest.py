@@ -0,0 +1,84 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from core.base.model.AliceSkill import AliceSkill
+from core.base.model.LazyAliceSkill import LazyAliceSkill
+from core.base.model.SkillManifest import SkillManifest
+
+
+class IntentsOnly(AliceSkill):
+
+	# noinspection PyMissingConstructor
+	def __init__(self, skillPath: Path):
+		self._name = skillPath.name
+		self._version = '1.0.0'
+		self._skillPath = skillPath
+		self._databaseSchema = {'things': ['id INTEGER PRIMARY KEY']}
+		self._supportedIntents = {'hermes/intent/greet': None, 'hermes/intent/weather': None}
+
+
+	def onMessage(self, session) -> bool:
+		return True
+
+
+class ListensToEvents(IntentsOnly):
+
+	def onFullHour(self):
+		pass
+
+
+class TestSkillManifest(TestCase):
+
+	def setUp(self):
+		self._tmpDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tmpDir.cleanup)
+
+		self.skillPath = Path(self._tmpDir.name, 'skills', 'IntentsOnly')
+		self.skillPath.mkdir(parents=True)
+		(self.skillPath / 'IntentsOnly.py').write_text('# skill')
+		(self.skillPath / 'IntentsOnly.install').write_text('{}')
+
+		self.manifests = SkillManifest(self._tmpDir.name)
+
+
+	def test_write_load(self):
+		written = self.manifests.write(IntentsOnly(self.skillPath))
+		self.assertEqual(written['intents'], ['hermes/intent/greet', 'hermes/intent/weather'])
+		self.assertEqual(written['tables'], ['things'])
+		self.assertFalse(written['eager'])
+
+		self.assertEqual(self.manifests.load('IntentsOnly', {'version': '1.0.0'}), written)
+		self.assertIsNone(self.manifests.load('IntentsOnly', {'version': '1.0.1'}))
+		self.assertIsNone(self.manifests.load('Unknown', {'version': '1.0.0'}))
+
+		(self.skillPath / 'IntentsOnly.py').write_text('# skill, updated')
+		self.assertIsNone(self.manifests.load('IntentsOnly', {'version': '1.0.0'}))
+
+		self.manifests.write(IntentsOnly(self.skillPath))
+		self.manifests.delete('IntentsOnly')
+		self.assertIsNone(self.manifests.load('IntentsOnly', {'version': '1.0.0'}))
+
+
+	def test_needs_eager_load(self):
+		self.assertFalse(SkillManifest.needsEagerLoad(IntentsOnly(self.skillPath)))
+		self.assertTrue(SkillManifest.needsEagerLoad(ListensToEvents(self.skillPath)))
+
+		(self.skillPath / 'widgets').mkdir()
+		self.assertTrue(SkillManifest.needsEagerLoad(IntentsOnly(self.skillPath)))
+
+
+	@mock.patch('core.base.model.LazyAliceSkill.LazyAliceSkill.SkillManager')
+	def test_lazy_skill(self, mockSkillManager):
+		real = IntentsOnly(self.skillPath)
+		mockSkillManager.loadLazySkill.return_value = real
+
+		lazy = LazyAliceSkill({'name': 'IntentsOnly', 'version': '1.0.0'}, self.manifests.write(real))
+		self.assertEqual(list(lazy.supportedIntents), ['hermes/intent/greet', 'hermes/intent/weather'])
+		mockSkillManager.loadLazySkill.assert_not_called()
+
+		self.assertEqual(lazy.databaseSchema, real.databaseSchema)
+		mockSkillManager.loadLazySkill.assert_called_once_with('IntentsOnly')
+
+		with self.assertRaises(AttributeError):
+			_ = lazy._notExisting
@@ -0,0 +1,79 @@
+import threading
+import time
+from unittest import TestCase
+
+from core.base.model.StartScheduler import StartScheduler
+
+
+class FakeManager:
+
+	def __init__(self, name: str, log: list, duration: float = 0, fail: bool = False):
+		self.name = name
+		self._log = log
+		self._duration = duration
+		self._fail = fail
+
+
+	def onStart(self):
+		self._log.append(('start', self.name))
+		time.sleep(self._duration)
+		if self._fail:
+			raise Exception(f'{self.name} failed')
+		self._log.append(('started', self.name))
+
+
+class TestStartScheduler(TestCase):
+
+	def test_dependencies_order(self):
+		log = list()
+		managers = {name: FakeManager(name, log) for name in ['A', 'B', 'C', 'D']}
+		dependencies = {'B': ['A'], 'C': ['A', 'B', 'Unknown'], 'D': list()}
+
+		timings = StartScheduler(managers, dependencies, workers=4).run()
+
+		self.assertEqual(set(timings), {'A', 'B', 'C', 'D'})
+		for name, after in [('B', 'A'), ('C', 'A'), ('C', 'B')]:
+			self.assertLess(log.index(('started', after)), log.index(('start', name)))
+
+
+	def test_concurrent(self):
+		log = list()
+		managers = {name: FakeManager(name, log, duration=0.2) for name in ['A', 'B', 'C']}
+
+		startTime = time.perf_counter()
+		StartScheduler(managers, dict(), workers=3).run()
+		self.assertLess(time.perf_counter() - startTime, 0.5)
+
+
+	def test_sequential(self):
+		log = list()
+		threads = set()
+		managers = {name: FakeManager(name, log) for name in ['A', 'B', 'C']}
+
+		StartScheduler(managers, dict(), workers=1).run(start=lambda manager: (threads.add(threading.current_thread()), manager.onStart()))
+		self.assertEqual([name for event, name in log if event == 'start'], ['A', 'B', 'C'])
+		self.assertEqual(len(threads), 1)
+
+
+	def test_failure(self):
+		log = list()
+		managers = {
+			'A': FakeManager('A', log, fail=True),
+			'B': FakeManager('B', log),
+			'C': FakeManager('C', log)
+		}
+
+		with self.assertRaises(Exception):
+			StartScheduler(managers, {'B': ['A']}, workers=2).run()
+
+		self.assertNotIn(('start', 'B'), log)
+
+
+	def test_circular(self):
+		log = list()
+		managers = {name: FakeManager(name, log) for name in ['A', 'B', 'C']}
+
+		with self.assertRaises(Exception):
+			StartScheduler(managers, {'A': ['B'], 'B': ['A']}).run()
+
+		self.assertEqual(log, list())
@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+from core.base.model.SuggestionIndex import SuggestionIndex
+
+
+class TestSuggestionIndex(TestCase):
+
+	def setUp(self):
+		self.index = SuggestionIndex({
+			'Weather' : ['What is the weather like today', 'Will it rain {tomorrow:=>when}?'],
+			'Calendar': ['Add a meeting to my calendar', 'What is on my agenda today'],
+			'Jokes'   : ['Tell me a joke', 'Make me laugh'],
+			'Empty'   : list()
+		})
+
+
+	def test_normalize(self):
+		self.assertEqual(SuggestionIndex.normalize('Will it rain {tomorrow:=>when}?'), 'will it rain tomorrow')
+		self.assertEqual(SuggestionIndex.normalize('  Hello,   WORLD! '), 'hello world')
+
+
+	def test_search(self):
+		self.assertEqual(len(self.index), 6)
+		self.assertEqual(self.index.search('what is the weather like today'), ['Weather'])
+		self.assertEqual(self.index.search('will it rain tomorrow'), ['Weather'])
+		self.assertEqual(self.index.search('tell me a jok'), ['Jokes'])
+		self.assertEqual(self.index.search('play some music'), list())
+		self.assertEqual(self.index.search(''), list())
+
+
+	def test_word_order(self):
+		self.assertEqual(self.index.search('a joke tell me'), ['Jokes'])
+		self.assertEqual(self.index.search('today what is on my agenda'), ['Calendar'])
+
+
+	def test_limit(self):
+		self.assertEqual(self.index.search('what is the weather', limit=0.9), list())
+		self.assertIn('Weather', self.index.search('what is the weather', limit=0.5))
+
+
+	def test_build_replaces(self):
+		self.index.build({'Music': ['Play some music']})
+		self.assertEqual(self.index.search('play some music'), ['Music'])
+		self.assertEqual(self.index.search('tell me a joke'), list())
+		self.assertEqual(SuggestionIndex().search('tell me a joke'), list())
@@ -0,0 +1,68 @@
+import json
+from unittest import TestCase, mock
+
+from paho.mqtt.client import MQTTMessage
+
+from core.commons import constants
+from core.commons.model.MqttEnvelope import MqttEnvelope
+
+
+class TestMqttEnvelope(TestCase):
+
+	@staticmethod
+	def intentMessage() -> MQTTMessage:
+		message = MQTTMessage(mid=3, topic=b'hermes/intent/lightOn')
+		message.qos = 1
+		message.payload = json.dumps({
+			'sessionId' : 'session',
+			'siteId'    : 'kitchen',
+			'customData': json.dumps({'origin': 'test'}),
+			'slots'     : [
+				{'slotName': 'location', 'entity': 'Location', 'rawValue': 'kitchen', 'value': {'value': 'kitchen'}, 'range': {'start': 0, 'end': 7}}
+			]
+		}).encode()
+		return message
+
+
+	def test_wrap(self):
+		message = self.intentMessage()
+		envelope = MqttEnvelope.wrap(message)
+
+		self.assertIsInstance(envelope, MQTTMessage)
+		self.assertEqual(envelope.topic, 'hermes/intent/lightOn')
+		self.assertEqual(envelope.payload, message.payload)
+		self.assertEqual(envelope.qos, 1)
+		self.assertEqual(envelope.mid, 3)
+		self.assertIs(MqttEnvelope.wrap(envelope), envelope)
+
+
+	def test_decodes_once(self):
+		envelope = MqttEnvelope.wrap(self.intentMessage())
+
+		with mock.patch('core.commons.model.MqttEnvelope.json.loads', wraps=json.loads) as loads:
+			self.assertEqual(envelope.sessionId, 'session')
+			self.assertEqual(envelope.deviceUid, 'kitchen')
+			self.assertEqual(envelope.slots, {'location': 'kitchen'})
+			self.assertEqual(envelope.slotsAsObjects['location'][0].rawValue, 'kitchen')
+			self.assertEqual(envelope.customData, {'origin': 'test'})
+			self.assertEqual(envelope.data['siteId'], 'kitchen')
+
+			# Once for the payload, once for the custom data
+			self.assertEqual(loads.call_count, 2)
+
+
+	def test_not_json(self):
+		message = MQTTMessage(topic=b'projectalice/devices/heartbeat')
+		message.payload = b'\x81'
+		envelope = MqttEnvelope.wrap(message)
+
+		self.assertEqual(envelope.data, {'heartbeat': b'\x81'})
+		self.assertIsNone(envelope.deviceUid)
+		self.assertFalse(envelope.sessionId)
+		self.assertEqual(envelope.slots, dict())
+		self.assertEqual(envelope.customData, dict())
+
+		message.payload = b'[1, 2]'
+		envelope = MqttEnvelope.wrap(message)
+		self.assertEqual(envelope.deviceUid, constants.UNKNOWN)
+		self.assertEqual(envelope.slotsAsObjects, dict())
@@ -0,0 +1,84 @@
+from unittest import TestCase
+
+from core.device.model.DeviceAbility import DeviceAbility
+from core.device.model.DeviceRegistry import DeviceRegistry
+
+
+class FakeDevice:
+
+	def __init__(self, deviceId: int, uid: str, location: int, skillName: str, deviceType: str, abilities: list, connected: bool = True):
+		self.id = deviceId
+		self.uid = uid
+		self.parentLocation = location
+		self.skillName = skillName
+		self.deviceType = deviceType
+		self.connected = connected
+		self.abilities = 0
+		for ability in abilities:
+			self.abilities |= ability.value
+
+
+	def getAbilities(self) -> int:
+		return self.abilities
+
+
+	def hasAbilities(self, abilities: list) -> bool:
+		check = 0
+		for ability in abilities:
+			check |= ability.value
+		return self.abilities & check == check
+
+
+class TestDeviceRegistry(TestCase):
+
+	def setUp(self):
+		self.registry = DeviceRegistry()
+		self.core = FakeDevice(1, 'core', 1, 'AliceCore', 'AliceCore', [DeviceAbility.IS_CORE, DeviceAbility.PLAY_SOUND])
+		self.satellite = FakeDevice(2, 'satellite', 2, 'AliceSatellite', 'AliceSatellite', [DeviceAbility.PLAY_SOUND, DeviceAbility.CAPTURE_SOUND])
+		self.plug = FakeDevice(3, 'plug', 2, 'Tasmota', 'Plug', list(), connected=False)
+		for device in (self.core, self.satellite, self.plug):
+			self.registry.add(device)
+
+
+	def test_get(self):
+		self.assertIs(self.registry.get(2), self.satellite)
+		self.assertIs(self.registry.getByUid('plug'), self.plug)
+		self.assertIsNone(self.registry.getByUid('unknown'))
+		self.assertIs(self.registry.mainDevice, self.core)
+
+
+	def test_query(self):
+		self.assertEqual(self.registry.query(locationId=2), [self.satellite])
+		self.assertEqual(self.registry.query(locationId=2, connectedOnly=False), [self.satellite, self.plug])
+		self.assertEqual(self.registry.query(abilities=[DeviceAbility.PLAY_SOUND]), [self.core, self.satellite])
+		self.assertEqual(self.registry.query(abilities=[DeviceAbility.PLAY_SOUND, DeviceAbility.CAPTURE_SOUND]), [self.satellite])
+		self.assertEqual(self.registry.query(skillName='Tasmota', connectedOnly=False), [self.plug])
+		self.assertEqual(self.registry.query(deviceType='Plug'), list())
+		self.assertEqual(self.registry.query(locationId=5), list())
+
+
+	def test_reindex(self):
+		self.plug.connected = True
+		self.plug.parentLocation = 1
+		self.plug.uid = 'newPlug'
+		self.registry.reindex(self.plug)
+
+		self.assertEqual(self.registry.query(locationId=1), [self.core, self.plug])
+		self.assertEqual(self.registry.query(locationId=2), [self.satellite])
+		self.assertIs(self.registry.getByUid('newPlug'), self.plug)
+		self.assertIsNone(self.registry.getByUid('plug'))
+
+		self.core.abilities = DeviceAbility.PLAY_SOUND.value
+		self.registry.reindex(self.core)
+		self.assertIsNone(self.registry.mainDevice)
+
+
+	def test_remove(self):
+		self.registry.remove(self.satellite)
+		self.assertIsNone(self.registry.get(2))
+		self.assertIsNone(self.registry.getByUid('satellite'))
+		self.assertEqual(self.registry.query(locationId=2, connectedOnly=False), [self.plug])
+
+		# Not registered devices are not indexed
+		self.registry.reindex(self.satellite)
+		self.assertEqual(self.registry.query(abilities=[DeviceAbility.CAPTURE_SOUND]), list())
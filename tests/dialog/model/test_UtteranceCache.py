@@ -0,0 +1,64 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from core.dialog.model.UtteranceCache import UtteranceCache
+
+
+class TestUtteranceCache(TestCase):
+
+	def setUp(self):
+		self._tmpDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tmpDir.cleanup)
+
+		self.templateFile = Path(self._tmpDir.name, 'en.json')
+		self.writeTemplate(['turn {on:=>state} the {kitchen:=>location} light', 'hello'])
+
+		self.checksum = mock.MagicMock(side_effect=lambda file: file.read_text())
+		self.cache = UtteranceCache(Path(self._tmpDir.name, 'cache'), self.checksum)
+
+
+	def writeTemplate(self, utterances: list):
+		self.templateFile.write_text(json.dumps({
+			'skill'  : 'Lights',
+			'intents': [{'name': 'turnOn', 'enabledByDefault': True, 'utterances': utterances, 'slots': list()}]
+		}))
+
+
+	def test_parse(self):
+		self.assertEqual(UtteranceCache.parse('hello'), [['hello']])
+		self.assertEqual(UtteranceCache.parse('I like {blue:=>color}'), [['I like '], ['blue', 'color'], ['']])
+		self.assertEqual(
+			UtteranceCache.parse('turn {on:=>state} the {kitchen:=>location} light'),
+			[['turn '], ['on', 'state'], [' the '], ['kitchen', 'location'], [' light']]
+		)
+
+
+	def test_clean(self):
+		self.assertEqual(UtteranceCache.clean(UtteranceCache.parse('turn {on:=>state} the {kitchen:=>location} light')), 'turn on the kitchen light')
+		self.assertEqual(UtteranceCache.clean(UtteranceCache.parse('hello')), 'hello')
+
+
+	def test_load(self):
+		self.assertIsNone(self.cache.load('Lights', 'de', Path(self._tmpDir.name, 'de.json')))
+
+		data = self.cache.load('Lights', 'en', self.templateFile)
+		self.assertEqual(data['intents'][0]['segments'][1], [['hello']])
+		self.assertTrue(Path(self._tmpDir.name, 'cache', 'Lights_en.json').exists())
+
+		# Unchanged file, the persisted parse is reused
+		with mock.patch.object(UtteranceCache, 'parse') as parse:
+			self.assertEqual(self.cache.load('Lights', 'en', self.templateFile), data)
+			parse.assert_not_called()
+
+		# Changed file, parsed again
+		self.writeTemplate(['bye {now:=>when}'])
+		data = self.cache.load('Lights', 'en', self.templateFile)
+		self.assertEqual(data['intents'][0]['segments'], [[['bye '], ['now', 'when'], ['']]])
+
+
+	def test_drop(self):
+		self.cache.load('Lights', 'en', self.templateFile)
+		self.cache.drop('Lights')
+		self.assertFalse(Path(self._tmpDir.name, 'cache', 'Lights_en.json').exists())
@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+from core.myHome.model.LocationIndex import LocationIndex
+
+
+class FakeLocation:
+
+	def __init__(self, locId: int, name: str, parentLocation: int = 0, synonyms: set = None):
+		self.id = locId
+		self.name = name
+		self.parentLocation = parentLocation
+		self.synonyms = synonyms or set()
+
+
+class TestLocationIndex(TestCase):
+
+	def setUp(self):
+		self.index = LocationIndex()
+		self.ground = FakeLocation(1, 'Ground floor', synonyms={'Downstairs'})
+		self.kitchen = FakeLocation(2, 'Kitchen', 1, {'Cooking room'})
+		self.living = FakeLocation(3, 'Living room', 1, {'Lounge', 'LOUNGE'})
+		self.pantry = FakeLocation(4, 'Pantry', 2)
+		self.first = FakeLocation(5, 'First floor', synonyms={'Upstairs'})
+		self.bedroom = FakeLocation(6, 'Bedroom', 5)
+		for location in (self.ground, self.kitchen, self.living, self.pantry, self.first, self.bedroom):
+			self.index.add(location)
+
+
+	def test_lookup(self):
+		self.assertIs(self.index.get(2), self.kitchen)
+		self.assertIs(self.index.getByName('kitchen'), self.kitchen)
+		self.assertIs(self.index.getByName('LIVING ROOM'), self.living)
+		self.assertIsNone(self.index.getByName('lounge'))
+		self.assertIs(self.index.getBySynonym('lounge'), self.living)
+		self.assertIs(self.index.getBySynonym('Upstairs'), self.first)
+		self.assertIsNone(self.index.getBySynonym('Attic'))
+
+
+	def test_hierarchy(self):
+		self.assertEqual(self.index.descendants(1), {2, 3, 4})
+		self.assertEqual(self.index.descendants(2), {4})
+		self.assertEqual(self.index.descendants(4), set())
+		self.assertEqual(self.index.descendants(0), {1, 2, 3, 4, 5, 6})
+		self.assertEqual(self.index.ancestors(4), [2, 1])
+		self.assertEqual(self.index.ancestors(1), list())
+
+
+	def test_reindex(self):
+		self.kitchen.name = 'Cuisine'
+		self.kitchen.synonyms = {'Kitchen'}
+		self.kitchen.parentLocation = 5
+		self.index.reindex(self.kitchen)
+
+		self.assertIsNone(self.index.getBySynonym('Cooking room'))
+		self.assertIs(self.index.getByName('cuisine'), self.kitchen)
+		self.assertIs(self.index.getBySynonym('kitchen'), self.kitchen)
+		self.assertIsNone(self.index.getByName('kitchen'))
+		self.assertEqual(self.index.descendants(1), {3})
+		self.assertEqual(self.index.descendants(5), {2, 4, 6})
+		self.assertEqual(self.index.ancestors(4), [2, 5])
+
+
+	def test_remove(self):
+		self.index.remove(3)
+		self.assertIsNone(self.index.get(3))
+		self.assertIsNone(self.index.getByName('Living room'))
+		self.assertIsNone(self.index.getBySynonym('Lounge'))
+		self.assertEqual(self.index.descendants(1), {2, 4})
+
+		# Not indexed anymore, so not reindexed either
+		self.index.reindex(self.living)
+		self.assertIsNone(self.index.getByName('Living room'))
+
+
+	def test_loop(self):
+		self.ground.parentLocation = 4
+		self.index.reindex(self.ground)
+		self.assertEqual(self.index.descendants(1), {2, 3, 4})
+		self.assertEqual(self.index.ancestors(4), [2, 1])
@@ -1,4 +1,27 @@
-from unittest import TestCase
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from core.nlu.model.SnipsNlu import SnipsNlu
+
+
+def skillTemplate(skillName: str, utterances: list) -> dict:
+	return {
+		'skill'    : skillName,
+		'slotTypes': [{
+			'name'                   : 'Color',
+			'automaticallyExtensible': False,
+			'matchingStrictness'     : None,
+			'useSynonyms'            : True,
+			'values'                 : [{'value': f'{skillName}Blue'}]
+		}],
+		'intents'  : [{
+			'name'      : f'{skillName}Intent',
+			'slots'     : [{'name': 'color', 'type': 'Color'}, {'name': 'number', 'type': 'snips/number'}],
+			'utterances': utterances
+		}]
+	}
 
 
 class TestSnipsNlu(TestCase):
@@ -11,8 +34,53 @@ class TestSnipsNlu(TestCase):
 		pass  # To be implemented or nothing to test()
 
 
-	def test_convert_dialog_template(self):
-		pass  # To be implemented or nothing to test()
+	@mock.patch('core.nlu.model.SnipsNlu.SnipsNlu.LanguageManager')
+	@mock.patch('core.nlu.model.SnipsNlu.SnipsNlu.Commons')
+	def test_convert_dialog_template(self, mockCommons, mockLanguageManager):
+		tmpDir = tempfile.TemporaryDirectory()
+		self.addCleanup(tmpDir.cleanup)
+		mockCommons.rootDir.return_value = tmpDir.name
+		mockLanguageManager.activeLanguage = 'en'
+		Path(tmpDir.name, 'var/cache/nlu/trainingData').mkdir(parents=True)
+
+		snipsNlu = SnipsNlu()
+		templates = [
+			skillTemplate('First', ['I like {blue:=>color}', 'give me {two:=>number}']),
+			skillTemplate('Second', ['I want {red:=>color}'])
+		]
+		dataFile = Path(tmpDir.name, 'data.json')
+		trainingFile = Path(tmpDir.name, 'var/cache/nlu/trainingData/en.json')
+
+		def convert() -> list:
+			dataFile.write_text(json.dumps(templates))
+			with mock.patch.object(snipsNlu, 'convertSkill', wraps=snipsNlu.convertSkill) as convertSkill:
+				snipsNlu.convertDialogTemplate(dataFile)
+				return [call[0][0]['skill'] for call in convertSkill.call_args_list]
+
+		self.assertEqual(convert(), ['First', 'Second'])
+		fullConversion = trainingFile.read_text()
+		data = json.loads(fullConversion)
+		self.assertEqual(list(data['intents']), ['FirstIntent', 'SecondIntent'])
+		self.assertEqual(data['entities']['Color']['data'], [{'value': 'SecondBlue', 'synonyms': list()}])
+		self.assertEqual(data['entities']['Color']['matching_strictness'], 1.0)
+		self.assertEqual(data['entities']['snips/number'], dict())
+		self.assertEqual(data['intents']['FirstIntent']['utterances'][0]['data'], [
+			{'text': 'I like '},
+			{'entity': 'Color', 'slot_name': 'color', 'text': 'blue'},
+			{'text': ''}
+		])
+
+		self.assertEqual(convert(), list())
+		self.assertEqual(trainingFile.read_text(), fullConversion)
+
+		templates[1]['intents'][0]['utterances'].append('I need {green:=>color}')
+		self.assertEqual(convert(), ['Second'])
+		self.assertEqual(len(json.loads(trainingFile.read_text())['intents']['SecondIntent']['utterances']), 2)
+
+		templates.pop(0)
+		self.assertEqual(convert(), list())
+		self.assertEqual(list(json.loads(trainingFile.read_text())['intents']), ['SecondIntent'])
+		self.assertFalse(Path(tmpDir.name, 'var/cache/nlu/trainingData/shards/en/First.json').exists())
 
 
 	def test_train(self):
@@ -0,0 +1,55 @@
+import io
+import wave
+from unittest import TestCase
+
+from core.server.model.AudioFrame import AudioFormat, AudioFrame
+
+
+class TestAudioFrame(TestCase):
+
+	PCM = bytes(range(256)) * 2 + bytes(128)
+
+
+	def test_raw_header(self):
+		header = AudioFrame.rawHeader(AudioFormat())
+		self.assertEqual(len(header), 12)
+		self.assertTrue(header.startswith(AudioFrame.RAW_MAGIC))
+
+
+	def test_decode_raw(self):
+		audioFormat = AudioFormat(sampleRate=8000, channels=2, sampleWidth=2)
+		pcm, decodedFormat = AudioFrame.decode(AudioFrame.rawHeader(audioFormat) + self.PCM)
+		self.assertIsInstance(pcm, memoryview)
+		self.assertEqual(pcm.tobytes(), self.PCM)
+		self.assertEqual(decodedFormat, audioFormat)
+
+
+	def test_decode_wav(self):
+		payload = AudioFrame.encodeWav(self.PCM, AudioFormat())
+		pcm, decodedFormat = AudioFrame.decode(bytearray(payload))
+		self.assertIsInstance(pcm, memoryview)
+		self.assertEqual(pcm.tobytes(), self.PCM)
+		self.assertEqual(decodedFormat, AudioFormat())
+
+
+	def test_decode_wav_non_canonical(self):
+		with io.BytesIO() as buffer:
+			with wave.open(buffer, 'wb') as wav:
+				wav.setnchannels(1)
+				wav.setsampwidth(2)
+				wav.setframerate(16000)
+				wav.writeframes(self.PCM)
+			payload = buffer.getvalue()
+
+		# Inject an extra chunk before the data chunk
+		payload = payload[:36] + b'LIST' + (4).to_bytes(4, 'little') + b'INFO' + payload[36:]
+		payload = payload[:4] + (len(payload) - 8).to_bytes(4, 'little') + payload[8:]
+
+		pcm, decodedFormat = AudioFrame.decode(payload)
+		self.assertEqual(pcm.tobytes(), self.PCM)
+		self.assertEqual(decodedFormat.sampleRate, 16000)
+
+
+	def test_decode_unknown(self):
+		with self.assertRaises(ValueError):
+			AudioFrame.decode(b'nope, not audio')
@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from core.util.model.AliceWatchers import AliceWatchers
+
+
+class TestAliceWatchers(TestCase):
+
+	def test_no_watchers(self):
+		watchers = AliceWatchers(onDemand=True)
+		self.assertEqual(watchers.maxVerbosity(), -1)
+		self.assertFalse(watchers.wants(0))
+
+
+	def test_always_on(self):
+		watchers = AliceWatchers()
+		self.assertTrue(watchers.wants(2))
+
+		watchers.onDemand = True
+		self.assertFalse(watchers.wants(0))
+
+
+	def test_verbosity(self):
+		watchers = AliceWatchers(ttl=30, onDemand=True)
+		watchers.subscribe('browser', verbosity=1)
+		self.assertTrue(watchers.wants(1))
+		self.assertFalse(watchers.wants(2))
+
+		watchers.subscribe('phone', verbosity=2)
+		self.assertTrue(watchers.wants(2))
+
+		watchers.unsubscribe('phone')
+		self.assertEqual(watchers.maxVerbosity(now=100), 1)
+		self.assertEqual(watchers.count, 1)
+
+
+	def test_expiry(self):
+		watchers = AliceWatchers(ttl=30, onDemand=True)
+		watchers.subscribe('browser', verbosity=2, now=100)
+		watchers.subscribe('phone', verbosity=1, now=120)
+		self.assertEqual(watchers.maxVerbosity(now=129), 2)
+
+		# The browser didn't renew its subscription
+		self.assertEqual(watchers.maxVerbosity(now=131), 1)
+
+		watchers.subscribe('phone', verbosity=1, now=145)
+		self.assertEqual(watchers.maxVerbosity(now=160), 1)
+		self.assertEqual(watchers.maxVerbosity(now=175), -1)
+		self.assertEqual(watchers.count, 0)
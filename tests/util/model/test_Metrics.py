@@ -0,0 +1,116 @@
+from unittest import TestCase
+
+from core.util.model.Metrics import Counter, Histogram, MetricsRegistry
+
+
+class TestMetrics(TestCase):
+
+	def setUp(self):
+		self.registry = MetricsRegistry()
+
+
+	def test_counter(self):
+		counter = self.registry.counter('alice_test_total', 'Test counter', ['kind'])
+		counter.inc('a')
+		counter.inc('a', amount=2)
+		counter.inc('b')
+		self.assertEqual(counter.value('a'), 3)
+		self.assertEqual(counter.value('b'), 1)
+		self.assertEqual(counter.value('c'), 0)
+
+		counter.set(10, 'a')
+		self.assertEqual(counter.value('a'), 10)
+
+
+	def test_register(self):
+		counter = self.registry.counter('alice_test_total', 'Test counter', ['kind'])
+		self.assertIs(self.registry.counter('alice_test_total', 'Test counter', ['kind']), counter)
+		self.assertIn('alice_test_total', self.registry)
+
+		with self.assertRaises(ValueError):
+			self.registry.gauge('alice_test_total', 'Test gauge', ['kind'])
+
+		with self.assertRaises(ValueError):
+			self.registry.counter('alice_test_total', 'Test counter', ['other'])
+
+
+	def test_histogram(self):
+		histogram = Histogram('alice_test_seconds', 'Test histogram', buckets=[0.1, 1, 10])
+		for value in (0.05, 0.1, 0.5, 5, 50):
+			histogram.observe(value)
+
+		samples = {(suffix, labels): value for suffix, labels, value in histogram.samples()}
+		self.assertEqual(samples[('_bucket', (('le', 0.1),))], 2)
+		self.assertEqual(samples[('_bucket', (('le', 1),))], 3)
+		self.assertEqual(samples[('_bucket', (('le', 10),))], 4)
+		self.assertEqual(samples[('_bucket', (('le', float('inf')),))], 5)
+		self.assertEqual(samples[('_count', ())], 5)
+		self.assertAlmostEqual(samples[('_sum', ())], 55.65)
+
+		summary = histogram.summary()['']
+		self.assertEqual(summary['count'], 5)
+		self.assertEqual(summary['max'], 50)
+		self.assertEqual(summary['p95'], 50)
+		self.assertAlmostEqual(summary['avg'], 11.13)
+
+
+	def test_quantile_capped_by_max(self):
+		histogram = Histogram('alice_test_seconds', 'Test histogram', buckets=[1, 10])
+		histogram.observe(0.2)
+		histogram.observe(0.3)
+		self.assertEqual(histogram.summary()['']['p95'], 0.3)
+
+
+	def test_render(self):
+		self.registry.counter('alice_test_total', 'Test "counter"\nsecond line', ['kind']).inc('say "hi"')
+		self.registry.histogram('alice_test_seconds', 'Test histogram', ['queue'], buckets=[0.5]).observe(0.25, 'dialog')
+		self.registry.gauge('alice_unused', 'Never set')
+
+		self.assertEqual(self.registry.render(), '\n'.join([
+			'# HELP alice_test_total Test "counter"\\nsecond line',
+			'# TYPE alice_test_total counter',
+			'alice_test_total{kind="say \\"hi\\""} 1',
+			'# HELP alice_test_seconds Test histogram',
+			'# TYPE alice_test_seconds histogram',
+			'alice_test_seconds_bucket{queue="dialog",le="0.5"} 1',
+			'alice_test_seconds_bucket{queue="dialog",le="+Inf"} 1',
+			'alice_test_seconds_sum{queue="dialog"} 0.25',
+			'alice_test_seconds_count{queue="dialog"} 1'
+		]) + '\n')
+
+
+	def test_summary(self):
+		self.registry.counter('alice_test_total', 'Test counter', ['cache', 'state']).inc('tts', 'hit')
+		self.registry.gauge('alice_test_depth', 'Test gauge').set(4)
+		self.registry.histogram('alice_test_seconds', 'Test histogram')
+
+		self.assertEqual(self.registry.summary(), {
+			'alice_test_total': {'tts,hit': 1},
+			'alice_test_depth': {'': 4}
+		})
+
+
+	def test_collectors(self):
+		counter = self.registry.counter('alice_test_total', 'Test counter')
+		errors = list()
+
+		def failing():
+			raise RuntimeError('collector failure')
+
+		self.registry.addCollector(lambda: counter.set(42))
+		self.registry.addCollector(failing)
+		self.registry.collect(onError=lambda collector, e: errors.append(e))
+
+		self.assertEqual(counter.value(), 42)
+		self.assertEqual(len(errors), 1)
+
+
+	def test_clear(self):
+		counter: Counter = self.registry.counter('alice_test_total', 'Test counter')
+		histogram = self.registry.histogram('alice_test_seconds', 'Test histogram')
+		counter.inc()
+		histogram.observe(1)
+
+		self.registry.clear()
+		self.assertEqual(self.registry.summary(), dict())
+		self.assertEqual(self.registry.render(), '\n')
@@ -1,15 +1,68 @@
-from unittest import TestCase
+import logging
+import time
+from unittest import TestCase, mock
+
+from core.commons import constants
+from core.util.model.MqttLoggingHandler import MqttLoggingHandler
 
 
 class TestMqttLoggingHandler(TestCase):
 
-	def test_emit(self):
-		pass  # To be implemented or nothing to test()
+	def setUp(self):
+		self.handler = MqttLoggingHandler()
+		self.logger = logging.getLogger('TestMqttLoggingHandler')
+		self.logger.propagate = False
+		self.logger.setLevel(logging.DEBUG)
+		self.logger.addHandler(self.handler)
+
+
+	def tearDown(self):
+		self.logger.removeHandler(self.handler)
+		self.handler.close()
+
+
+	def waitForHistory(self, count: int):
+		timeout = time.monotonic() + 2
+		while len(self.handler.history) < count and time.monotonic() < timeout:
+			time.sleep(0.001)
+
+
+	@mock.patch('core.util.model.MqttLoggingHandler.SuperManager')
+	def test_emit(self, mock_superManager):
+		mqttManager = mock_superManager.getInstance.return_value.mqttManager
+		mock_superManager.getInstance.return_value.configManager.getAliceConfigByName.return_value = False
+		self.logger.info('[Tester]     Hello')
+		self.logger.warning('No component')
+		self.waitForHistory(2)
+		self.handler.close()
+
+		self.assertEqual({call[1]['topic'] for call in mqttManager.publish.call_args_list}, {constants.TOPIC_SYSLOG})
+		published = [call[1]['payload'] for call in mqttManager.publish.call_args_list]
+		self.assertEqual([(log['component'], log['msg'], log['level']) for log in published], [('Tester', 'Hello', 'INFO'), (constants.UNKNOWN, 'No component', 'WARNING')])
+
+
+	@mock.patch('core.util.model.MqttLoggingHandler.SuperManager')
+	def test_emit_batched(self, mock_superManager):
+		mqttManager = mock_superManager.getInstance.return_value.mqttManager
+		mock_superManager.getInstance.return_value.configManager.getAliceConfigByName.return_value = True
+		self.logger.info('[Tester]     Hello')
+		self.logger.warning('No component')
+		self.waitForHistory(2)
+		self.handler.close()
 
+		published = [log for call in mqttManager.publish.call_args_list for log in call[1]['payload']['logs']]
+		self.assertEqual(mqttManager.publish.call_args[1]['topic'], constants.TOPIC_SYSLOG_BATCH)
+		self.assertEqual([(log['component'], log['msg'], log['level']) for log in published], [('Tester', 'Hello', 'INFO'), (constants.UNKNOWN, 'No component', 'WARNING')])
 
-	def test_save_to_history(self):
-		pass  # To be implemented or nothing to test()
 
+	@mock.patch('core.util.model.MqttLoggingHandler.SuperManager')
+	def test_history(self, mock_superManager):
+		mock_superManager.getInstance.return_value = None
+		for i in range(MqttLoggingHandler.HISTORY_SIZE + 10):
+			self.logger.debug(f'[Tester] {i}')
+		self.handler.close()
 
-	def test_history(self):
-		pass  # To be implemented or nothing to test()
+		history = self.handler.history
+		self.assertEqual(len(history), MqttLoggingHandler.HISTORY_SIZE)
+		self.assertEqual(history[0]['msg'], '10')
+		self.assertEqual(history[-1]['msg'], str(MqttLoggingHandler.HISTORY_SIZE + 9))
@@ -0,0 +1,90 @@
+import threading
+import time
+from unittest import TestCase
+
+from core.util.model.ThreadTimer import ThreadTimer
+from core.util.model.TimerScheduler import TimerScheduler
+
+
+class TestTimerScheduler(TestCase):
+
+	def setUp(self):
+		self.errors = list()
+		self.scheduler = TimerScheduler(onError=lambda timer, e: self.errors.append(e))
+		self.scheduler.start(workers=2)
+
+
+	def tearDown(self):
+		self.scheduler.stop()
+
+
+	def test_order(self):
+		calls = list()
+		done = threading.Event()
+		self.scheduler.schedule(ThreadTimer(callback=lambda: (calls.append('second'), done.set()), interval=0.05))
+		first = self.scheduler.schedule(ThreadTimer(callback=calls.append, args=['first'], interval=0.01))
+		self.assertTrue(first.is_alive())
+
+		self.assertTrue(done.wait(timeout=2))
+		self.assertEqual(calls, ['first', 'second'])
+		time.sleep(0.01)
+		self.assertFalse(first.is_alive())
+
+
+	def test_cancel(self):
+		calls = list()
+		timers = [self.scheduler.schedule(ThreadTimer(callback=calls.append, args=[i], interval=0.05)) for i in range(200)]
+		for timer in timers[:150]:
+			timer.cancel()
+
+		self.assertFalse(timers[0].is_alive())
+		self.assertEqual(self.scheduler.stats['pending'], 50)
+		# Canceled jobs got compacted away
+		self.assertLess(len(self.scheduler._heap), 200)
+
+		time.sleep(0.2)
+		self.assertEqual(sorted(calls), list(range(150, 200)))
+
+
+	def test_periodic(self):
+		calls = list()
+		timer = self.scheduler.schedule(ThreadTimer(callback=lambda: calls.append(1), interval=0.01, periodic=True))
+		time.sleep(0.1)
+		timer.cancel()
+		count = len(calls)
+		self.assertGreater(count, 2)
+
+		time.sleep(0.05)
+		self.assertEqual(len(calls), count)
+		self.assertFalse(timer.is_alive())
+
+
+	def test_errors(self):
+		done = threading.Event()
+
+		def fail():
+			done.set()
+			raise ValueError('failed')
+
+		self.scheduler.schedule(ThreadTimer(callback=fail, interval=0))
+		self.assertTrue(done.wait(timeout=2))
+		time.sleep(0.01)
+		self.assertEqual(len(self.errors), 1)
+		self.assertEqual(self.scheduler.stats['errors'], 1)
+
+
+	def test_single_thread(self):
+		before = threading.active_count()
+		for _ in range(100):
+			self.scheduler.schedule(ThreadTimer(callback=time.sleep, args=[0], interval=0.01))
+
+		# At most the two workers come on top of the scheduler
+		self.assertLessEqual(threading.active_count(), before + 2)
+
+
+	def test_stopped(self):
+		self.scheduler.stop()
+		timer = self.scheduler.schedule(ThreadTimer(callback=self.fail, interval=0))
+		self.assertTrue(timer.cancelled)
+		self.assertFalse(timer.is_alive())
+		self.assertEqual(self.scheduler.stats['pending'], 0)
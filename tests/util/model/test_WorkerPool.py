@@ -0,0 +1,67 @@
+import threading
+from unittest import TestCase
+
+from core.util.model.WorkerPool import QueueFull, WorkerPool
+
+
+class TestWorkerPool(TestCase):
+
+	def setUp(self):
+		self.errors = list()
+		self.pool = WorkerPool(queues={'dialog': (1, 2), 'background': (2, 0)}, onError=lambda queueName, func, e: self.errors.append(queueName))
+		self.pool.start()
+
+
+	def tearDown(self):
+		self.pool.stop()
+
+
+	def test_submit(self):
+		future = self.pool.submit('background', pow, 2, 10)
+		self.assertEqual(future.result(timeout=2), 1024)
+
+		with self.assertRaises(KeyError):
+			self.pool.submit('unknown', pow, 2, 10)
+
+
+	def test_order_and_priority(self):
+		calls = list()
+		started = threading.Event()
+		blocker = threading.Event()
+		self.pool.submit('dialog', lambda: (started.set(), blocker.wait(2)))
+		started.wait(2)
+		self.pool.submit('dialog', calls.append, 'late', priority=1)
+		last = self.pool.submit('dialog', calls.append, 'early', priority=0)
+
+		# Full
+		rejected = self.pool.submit('dialog', calls.append, 'dropped')
+		self.assertIsInstance(rejected.exception(timeout=0), QueueFull)
+
+		blocker.set()
+		last.result(timeout=2)
+		self.pool.submit('dialog', calls.append, 'after').result(timeout=2)
+		self.assertEqual(calls, ['early', 'late', 'after'])
+
+		stats = self.pool.stats['dialog']
+		self.assertEqual(stats['rejected'], 1)
+		self.assertEqual(stats['completed'], 4)
+		self.assertEqual(stats['depth'], 0)
+
+
+	def test_queues_are_independent(self):
+		blocker = threading.Event()
+		self.pool.submit('dialog', blocker.wait, 2)
+		self.assertEqual(self.pool.submit('background', sum, [1, 2]).result(timeout=2), 3)
+		blocker.set()
+
+
+	def test_errors(self):
+		future = self.pool.submit('background', int, 'notANumber')
+		self.assertIsInstance(future.exception(timeout=2), ValueError)
+		self.assertEqual(self.errors, ['background'])
+		self.assertEqual(self.pool.stats['background']['failed'], 1)
+
+
+	def test_stop(self):
+		self.pool.stop()
+		self.assertIsInstance(self.pool.submit('background', sum, [1]).exception(timeout=0), RuntimeError)
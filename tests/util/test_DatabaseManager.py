@@ -1,8 +1,37 @@
-from unittest import TestCase
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase, mock
+
+from core.util.DatabaseManager import DatabaseManager
+from core.util.model.DatabaseWrite import DatabaseWrite
 
 
 class TestDatabaseManager(TestCase):
 
+	def setUp(self):
+		self._tmpDir = tempfile.TemporaryDirectory()
+		patches = [
+			mock.patch('core.util.DatabaseManager.DatabaseManager.Commons'),
+			mock.patch('core.util.DatabaseManager.DatabaseManager.ConfigManager'),
+			mock.patch('core.util.DatabaseManager.DatabaseManager.MetricsManager'),
+			mock.patch('core.util.DatabaseManager.constants.DATABASE_FILE', str(Path(self._tmpDir.name, 'data.db')))
+		]
+		for patch in patches:
+			patch.start()
+			self.addCleanup(patch.stop)
+
+		self.configs = {'databaseProfiling': False, 'databaseSynchronous': 'NORMAL'}
+		self.databaseManager = DatabaseManager()
+		self.databaseManager.ConfigManager.getAliceConfigByName.side_effect = lambda name: self.configs.get(name, '')
+		self.databaseManager.initDB(schema={'things': ['id INTEGER PRIMARY KEY', 'name TEXT', 'value INTEGER']}, callerName='Test')
+
+
+	def tearDown(self):
+		self.databaseManager.closeConnections(force=True)
+		self._tmpDir.cleanup()
+
+
 	def test_on_start(self):
 		pass  # To be implemented or nothing to test()
 
@@ -12,7 +41,25 @@ class TestDatabaseManager(TestCase):
 
 
 	def test_get_connection(self):
-		pass  # To be implemented or nothing to test()
+		con = self.databaseManager.getConnection()
+		self.assertIs(con, self.databaseManager.getConnection())
+		self.assertEqual(con.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+		self.assertEqual(con.execute('PRAGMA synchronous').fetchone()[0], 1)
+
+		other = list()
+		thread = threading.Thread(target=lambda: other.append(self.databaseManager.getConnection()))
+		thread.start()
+		thread.join()
+		self.assertIsNot(other[0], con)
+
+		self.databaseManager.pruneConnections()
+		with self.assertRaises(Exception):
+			other[0].execute('SELECT 1')
+
+		self.configs['databaseSynchronous'] = 'FULL'
+		self.databaseManager.closeConnections()
+		con = self.databaseManager.getConnection()
+		self.assertEqual(con.execute('PRAGMA synchronous').fetchone()[0], 2)
 
 
 	def test_init_db(self):
@@ -28,15 +75,25 @@ class TestDatabaseManager(TestCase):
 
 
 	def test_insert(self):
-		pass  # To be implemented or nothing to test()
+		rowId = self.databaseManager.insert(tableName='things', callerName='Test', values={'name': 'first', 'value': 1})
+		self.assertEqual(rowId, 1)
+		self.assertEqual(self.databaseManager.insert(tableName='things', callerName='Test', values={'name': 'second', 'value': 2}), 2)
 
 
 	def test_update(self):
-		pass  # To be implemented or nothing to test()
+		self.databaseManager.insert(tableName='things', callerName='Test', values={'name': 'first', 'value': 1})
+		self.assertTrue(self.databaseManager.update(tableName='things', callerName='Test', values={'value': 5}, row=('name', 'first')))
+
+		row = self.databaseManager.fetch(tableName='things', query='SELECT * FROM :__table__ WHERE name = :name', callerName='Test', values={'name': 'first'})
+		self.assertEqual(row['value'], 5)
 
 
 	def test_fetch(self):
-		pass  # To be implemented or nothing to test()
+		self.databaseManager.insert(tableName='things', callerName='Test', values={'name': 'first', 'value': 1})
+		self.databaseManager.insert(tableName='things', callerName='Test', values={'name': 'second', 'value': 2})
+
+		rows = self.databaseManager.fetch(tableName='things', query='SELECT * FROM :__table__', callerName='Test', method='all')
+		self.assertEqual([row['name'] for row in rows], ['first', 'second'])
 
 
 	def test_purge(self):
@@ -44,7 +101,12 @@ class TestDatabaseManager(TestCase):
 
 
 	def test_delete(self):
-		pass  # To be implemented or nothing to test()
+		self.databaseManager.insert(tableName='things', callerName='Test', values={'name': 'first', 'value': 1})
+		self.databaseManager.insert(tableName='things', callerName='Test', values={'name': 'second', 'value': 2})
+		self.databaseManager.delete(tableName='things', callerName='Test', values={'name': 'first', 'value': 1})
+
+		rows = self.databaseManager.fetch(tableName='things', query='SELECT * FROM :__table__', callerName='Test', method='all')
+		self.assertEqual([row['name'] for row in rows], ['second'])
 
 
 	def test_prune(self):
@@ -52,4 +114,67 @@ class TestDatabaseManager(TestCase):
 
 
 	def test_basic_checks(self):
-		pass  # To be implemented or nothing to test()
+		self.assertEqual(self.databaseManager.basicChecks('things', 'SELECT * FROM :__table__', 'Test'), 'SELECT * FROM Test_things')
+		self.assertIsNone(self.databaseManager.basicChecks('things', 'SELECT * FROM Test_things', 'Test'))
+		self.assertIsNone(self.databaseManager.basicChecks('sqlite_master', 'SELECT * FROM :__table__', 'Test'))
+
+
+	def test_insert_later(self):
+		# Write behind disabled, the write happens right away
+		future = self.databaseManager.insertLater(tableName='things', callerName='Test', values={'name': 'first', 'value': 1})
+		self.assertTrue(future.done())
+		self.assertEqual(future.result(), 1)
+
+		self.startWriteBehind()
+		futures = [self.databaseManager.insertLater(tableName='things', callerName='Test', values={'name': f'row{i}', 'value': i}) for i in range(10)]
+		futures.append(self.databaseManager.replaceLater(tableName='things', callerName='Test', values={'id': 1, 'name': 'replaced', 'value': 0}))
+		futures.append(self.databaseManager.updateLater(tableName='things', callerName='Test', values={'value': 50}, row=('name', 'row5')))
+		self.databaseManager.stopWriteBehind()
+
+		self.assertEqual([future.result(timeout=1) for future in futures], [*range(2, 12), 1, True])
+		rows = self.databaseManager.fetch(tableName='things', query='SELECT * FROM :__table__', callerName='Test', method='all')
+		self.assertEqual(len(rows), 11)
+		self.assertEqual(rows[0]['name'], 'replaced')
+		self.assertEqual(rows[6]['value'], 50)
+
+
+	def test_insert_later_failure(self):
+		self.startWriteBehind()
+		good = self.databaseManager.insertLater(tableName='things', callerName='Test', values={'id': 1, 'name': 'first'})
+		bad = self.databaseManager.insertLater(tableName='things', callerName='Test', values={'id': 1, 'name': 'duplicate'})
+		self.databaseManager.stopWriteBehind()
+
+		self.assertEqual(good.result(timeout=1), 1)
+		with self.assertRaises(Exception):
+			bad.result(timeout=1)
+
+		rows = self.databaseManager.fetch(tableName='things', query='SELECT * FROM :__table__', callerName='Test', method='all')
+		self.assertEqual([row['name'] for row in rows], ['first'])
+
+
+	def test_write_after_stop(self):
+		self.startWriteBehind()
+		self.databaseManager.stopWriteBehind()
+
+		# Queued by a caller that saw write behind enabled just before it stopped
+		future = self.databaseManager._enqueueWrite(DatabaseWrite(tableName='things', callerName='Test', query='INSERT INTO Test_things (name) VALUES (:name)', values={'name': 'late'}, isInsert=True))
+		self.assertEqual(future.result(timeout=1), 1)
+
+		rows = self.databaseManager.fetch(tableName='things', query='SELECT * FROM :__table__', callerName='Test', method='all')
+		self.assertEqual([row['name'] for row in rows], ['late'])
+
+
+	def startWriteBehind(self):
+		def newThread(name, target):
+			thread = threading.Thread(name=name, target=target, daemon=True)
+			thread.start()
+			return thread
+
+		patch = mock.patch('core.util.DatabaseManager.DatabaseManager.ThreadManager')
+		patch.start()
+		self.addCleanup(patch.stop)
+		self.databaseManager.ThreadManager.newThread.side_effect = newThread
+
+		self.configs.update({'databaseWriteBehind': True, 'databaseWriteBehindRows': 5, 'databaseWriteBehindDelay': 50})
+		self.databaseManager.updateWriteBehind()
+		self.assertTrue(self.databaseManager.writeBehind)
@@ -39,7 +39,7 @@ class TestInternetManager(unittest.TestCase):
 		mock_instance.configManager.getAliceConfigByName.return_value = False
 		internetManager.checkOnlineState()
 
-		mock_requests.get.assert_called_once_with('https://clients3.google.com/generate_204')
+		mock_requests.get.assert_called_once_with('https://clients3.google.com/generate_204', timeout=InternetManager.CHECK_TIMEOUT)
 		mock_broadcast.assert_called_once_with(method='internetConnected', exceptions=['InternetManager'], propagateToSkills=True)
 		self.assertEqual(internetManager.online, True)
 		mock_broadcast.reset_mock()
@@ -47,7 +47,7 @@ class TestInternetManager(unittest.TestCase):
 
 		# when calling check online state a second time it does not broadcast again
 		internetManager.checkOnlineState()
-		mock_requests.get.assert_called_once_with('https://clients3.google.com/generate_204')
+		mock_requests.get.assert_called_once_with('https://clients3.google.com/generate_204', timeout=InternetManager.CHECK_TIMEOUT)
 		mock_broadcast.assert_not_called()
 		self.assertEqual(internetManager.online, True)
 		mock_broadcast.reset_mock()
@@ -61,7 +61,7 @@ class TestInternetManager(unittest.TestCase):
 
 		# when wrong status code is returned (and currently online)
 		internetManager.checkOnlineState()
-		mock_requests.get.assert_called_once_with('https://clients3.google.com/generate_204')
+		mock_requests.get.assert_called_once_with('https://clients3.google.com/generate_204', timeout=InternetManager.CHECK_TIMEOUT)
 		mock_broadcast.assert_called_once_with(method='internetLost', exceptions=['InternetManager'], propagateToSkills=True)
 		self.assertEqual(internetManager.online, False)
 		mock_broadcast.reset_mock()
@@ -69,7 +69,7 @@ class TestInternetManager(unittest.TestCase):
 
 		# when calling check online state a second time it does not broadcast again
 		internetManager.checkOnlineState()
-		mock_requests.get.assert_called_once_with('https://clients3.google.com/generate_204')
+		mock_requests.get.assert_called_once_with('https://clients3.google.com/generate_204', timeout=InternetManager.CHECK_TIMEOUT)
 		mock_broadcast.assert_not_called()
 		self.assertEqual(internetManager.online, False)
 		mock_broadcast.reset_mock()
@@ -87,7 +87,7 @@ class TestInternetManager(unittest.TestCase):
 		# request raises exception is the same as non 204 status code
 		mock_requests.get.side_effect = RequestException
 		internetManager.checkOnlineState()
-		mock_requests.get.assert_called_once_with('https://clients3.google.com/generate_204')
+		mock_requests.get.assert_called_once_with('https://clients3.google.com/generate_204', timeout=InternetManager.CHECK_TIMEOUT)
 		mock_broadcast.assert_called_once_with(method='internetLost', exceptions=['InternetManager'], propagateToSkills=True)
 		self.assertEqual(internetManager.online, False)
 
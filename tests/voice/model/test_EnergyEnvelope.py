@@ -0,0 +1,56 @@
+import tempfile
+import wave
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+
+from core.voice.model.EnergyEnvelope import EnergyEnvelope
+
+
+def sample(rate: int = 16000) -> np.ndarray:
+	# 300ms of near silence, 500ms of tone, 200ms of near silence
+	noise = np.random.default_rng(0).normal(0, 30, rate).astype(np.int16)
+	tone = (np.sin(np.arange(rate // 2) / 5) * 10000).astype(np.int16)
+	noise[rate * 3 // 10:rate * 8 // 10] = tone
+	return noise
+
+
+class TestEnergyEnvelope(TestCase):
+
+	def test_cut_points(self):
+		envelope = EnergyEnvelope(sample(), 16000)
+		self.assertEqual(envelope.duration, 1000)
+		self.assertEqual(envelope.cutPoints(), (300, 200))
+		self.assertEqual(len(envelope.trim()), 8000)
+
+		# Nothing is that loud
+		self.assertEqual(envelope.cutPoints(tuning=100), (1000, 1000))
+		self.assertEqual(len(envelope.trim(tuning=100)), 0)
+
+
+	def test_silence(self):
+		envelope = EnergyEnvelope(np.zeros(1600, np.int16), 16000)
+		self.assertEqual(envelope.cutPoints(), (0, 0))
+		self.assertEqual(len(EnergyEnvelope(np.zeros(0, np.int16), 16000).trim()), 0)
+
+
+	def test_from_file(self):
+		with tempfile.TemporaryDirectory() as directory:
+			file = Path(directory, 'raw.wav')
+			stereo = np.repeat(sample(32000), 2)
+			with wave.open(str(file), 'wb') as wav:
+				wav.setnchannels(2)
+				wav.setsampwidth(2)
+				wav.setframerate(32000)
+				wav.writeframes(stereo.tobytes())
+
+			envelope = EnergyEnvelope.fromFile(file, sampleRate=16000)
+			self.assertEqual(envelope.sampleRate, 16000)
+			self.assertEqual(envelope.duration, 1000)
+			self.assertEqual(envelope.cutPoints(), (300, 200))
+
+			trimmed = Path(directory, 'trimmed.wav')
+			envelope.save(trimmed)
+			with wave.open(str(trimmed), 'rb') as wav:
+				self.assertEqual((wav.getnchannels(), wav.getframerate(), wav.getnframes()), (1, 16000, 8000))
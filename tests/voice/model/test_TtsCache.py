@@ -0,0 +1,86 @@
+import tempfile
+import wave
+from pathlib import Path
+from unittest import TestCase
+
+from core.voice.model.TtsCache import TtsCache
+
+
+class TestTtsCache(TestCase):
+
+	def setUp(self):
+		self._tmpDir = tempfile.TemporaryDirectory()
+		self.addCleanup(self._tmpDir.cleanup)
+
+		self.root = Path(self._tmpDir.name)
+		self.speech = self.root / 'pico' / 'en-US' / 'male' / 'en-US'
+		self.speech.mkdir(parents=True)
+
+
+	def writeWave(self, name: str, seconds: float, sampleRate: int = 16000) -> Path:
+		file = self.speech / f'{name}.wav'
+		with wave.open(str(file), 'wb') as wav:
+			wav.setnchannels(1)
+			wav.setsampwidth(2)
+			wav.setframerate(sampleRate)
+			wav.writeframes(b'\x00\x00' * int(seconds * sampleRate))
+		return file
+
+
+	def test_read_metadata(self):
+		file = self.writeWave('a', 1.5, 22050)
+		metadata = TtsCache.readMetadata(file)
+		self.assertEqual(metadata['duration'], 1.5)
+		self.assertEqual(metadata['sampleRate'], 22050)
+		self.assertEqual(metadata['size'], file.stat().st_size)
+
+		broken = self.speech / 'broken.wav'
+		broken.write_bytes(b'not a wave')
+		self.assertIsNone(TtsCache.readMetadata(broken))
+
+
+	def test_get_and_register(self):
+		cache = TtsCache(root=self.root)
+		file = self.writeWave('a', 1)
+
+		self.assertIsNone(cache.get(file))
+		self.assertEqual(cache.register(file)['duration'], 1)
+		self.assertEqual(cache.get(file)['duration'], 1)
+		self.assertEqual(cache.stats['hits'], 1)
+		self.assertEqual(cache.stats['misses'], 1)
+
+		file.unlink()
+		self.assertIsNone(cache.get(file))
+		self.assertEqual(cache.stats['files'], 0)
+
+
+	def test_evict_least_recently_used(self):
+		cache = TtsCache(root=self.root)
+		first = self.writeWave('first', 1)
+		second = self.writeWave('second', 1)
+		third = self.writeWave('third', 1)
+
+		cache.register(first)
+		cache.register(second)
+		cache.get(first)
+
+		cache.maxBytes = first.stat().st_size * 2
+		cache.register(third)
+
+		self.assertTrue(first.exists())
+		self.assertFalse(second.exists())
+		self.assertTrue(third.exists())
+		self.assertEqual(cache.stats['evictions'], 1)
+		self.assertEqual(cache.size, first.stat().st_size * 2)
+
+
+	def test_load(self):
+		cache = TtsCache(root=self.root, directories=[self.root / 'pico'])
+		file = self.writeWave('a', 2)
+		cache.register(file)
+		self.writeWave('unknown', 1)
+
+		reloaded = TtsCache(root=self.root, directories=[self.root / 'pico'])
+		reloaded.load()
+		self.assertEqual(reloaded.stats['files'], 2)
+		self.assertEqual(reloaded.get(file)['duration'], 2)
@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+import numpy as np
+
+from core.server.model.AudioFrame import AudioFormat
+from core.voice.model.WakewordHost import DeviceBuffer, WakewordHost
+
+
+class TestWakewordHost(TestCase):
+
+	def setUp(self):
+		self.created = list()
+		self.host = WakewordHost(frameLength=4, detectorFactory=lambda uid: self.created.append(uid) or uid.upper(), bufferFrames=2)
+
+
+	def test_ring_buffer(self):
+		buffer = DeviceBuffer(6)
+		buffer.write(np.arange(4, dtype=np.int16))
+		self.assertEqual(buffer.read(3).tolist(), [0, 1, 2])
+		buffer.write(np.arange(4, 8, dtype=np.int16))
+		self.assertEqual(buffer.read(5).tolist(), [3, 4, 5, 6, 7])
+
+		# Oldest samples are dropped
+		buffer.write(np.arange(8, 16, dtype=np.int16))
+		self.assertEqual(buffer.dropped, 2)
+		self.assertIsNone(buffer.read(7))
+		self.assertEqual(buffer.read(6).tolist(), [10, 11, 12, 13, 14, 15])
+
+
+	def test_streams_per_device(self):
+		self.host.feed('kitchen', memoryview(np.arange(6, dtype=np.int16).tobytes()), AudioFormat())
+		self.host.feed('bedroom', memoryview(np.arange(100, 104, dtype=np.int16).tobytes()), AudioFormat())
+
+		frames = dict(self.host.pending(timeout=0))
+		self.assertEqual(frames['kitchen'].tolist(), [0, 1, 2, 3])
+		self.assertEqual(frames['bedroom'].tolist(), [100, 101, 102, 103])
+		self.assertEqual(self.host.pending(timeout=0), list())
+
+		self.assertEqual(self.host.detector('kitchen'), 'KITCHEN')
+		self.assertEqual(self.host.detector('kitchen'), 'KITCHEN')
+		self.assertEqual(self.created, ['kitchen'])
+
+
+	def test_detector_limit(self):
+		host = WakewordHost(frameLength=4, detectorFactory=lambda uid: self.created.append(uid) or uid.upper(), maxDetectors=1)
+		self.assertIsNone(host.detector('kitchen', create=False))
+		self.assertEqual(host.detector('kitchen'), 'KITCHEN')
+		self.assertTrue(host.full)
+		self.assertIsNone(host.detector('bedroom'))
+		self.assertEqual(host.detector('kitchen', create=False), 'KITCHEN')
+		self.assertEqual(self.created, ['kitchen'])
+
+
+	def test_formats(self):
+		stereo = np.repeat(np.arange(4, dtype=np.int16), 2)
+		self.assertTrue(self.host.feed('kitchen', memoryview(stereo.tobytes()), AudioFormat(channels=2)))
+		self.assertEqual(self.host.pending(timeout=0)[0][1].tolist(), [0, 1, 2, 3])
+
+		self.assertFalse(self.host.feed('kitchen', memoryview(stereo.tobytes()), AudioFormat(sampleRate=44100)))
+
+
+	def test_pause(self):
+		frame = memoryview(np.arange(4, dtype=np.int16).tobytes())
+		self.host.feed('kitchen', frame, AudioFormat())
+		self.host.pause('kitchen')
+		self.assertTrue(self.host.isPaused('kitchen'))
+		self.assertFalse(self.host.feed('kitchen', frame, AudioFormat()))
+		self.assertEqual(self.host.pending(timeout=0), list())
+
+		self.host.resume('kitchen')
+		self.host.feed('kitchen', frame, AudioFormat())
+		self.assertEqual(len(self.host.pending(timeout=0)), 1)
@@ -0,0 +1,78 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from core.webui.model.WidgetAssets import WidgetAssets
+
+
+class TestWidgetAssets(TestCase):
+
+	def setUp(self):
+		self.tmp = tempfile.TemporaryDirectory()
+		self.source = Path(self.tmp.name, 'widget.js')
+		self.source.write_text('var a = 1;')
+		self.assets = WidgetAssets(self.tmp.name)
+		self.compiler = MagicMock(side_effect=lambda: self.source.read_text().upper())
+
+
+	def tearDown(self):
+		self.tmp.cleanup()
+
+
+	def get(self, assets: WidgetAssets = None, language: str = ''):
+		return (assets or self.assets).get('Skill', 'Widget', 'js', [self.source], self.compiler, language=language)
+
+
+	def test_get(self):
+		content, etag = self.get()
+		self.assertEqual(content, 'VAR A = 1;')
+		self.assertEqual(etag, WidgetAssets.etag('VAR A = 1;'))
+		self.assertEqual(self.get(), (content, etag))
+		self.assertEqual(self.compiler.call_count, 1)
+		self.assertEqual(self.assets.stats, {'assets': 1, 'hits': 1, 'loaded': 0, 'compiled': 1})
+
+
+	def test_source_changed(self):
+		_, etag = self.get()
+		self.source.write_text('var b = 2;')
+		stat = self.source.stat()
+		os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+		content, newEtag = self.get()
+		self.assertEqual(content, 'VAR B = 2;')
+		self.assertNotEqual(etag, newEtag)
+		self.assertEqual(self.compiler.call_count, 2)
+
+
+	def test_language(self):
+		self.get(language='en')
+		self.get(language='de')
+		self.get(language='en')
+		self.assertEqual(self.compiler.call_count, 2)
+
+
+	def test_disk_cache(self):
+		self.get()
+		other = WidgetAssets(self.tmp.name)
+		self.assertEqual(self.get(other)[0], 'VAR A = 1;')
+		self.assertEqual(self.compiler.call_count, 1)
+		self.assertEqual(other.stats['loaded'], 1)
+
+
+	def test_invalidate(self):
+		self.get()
+		self.assets.invalidate('Skill')
+		self.assertFalse(Path(self.tmp.name, WidgetAssets.CACHE_PATH, 'Skill').exists())
+		self.get()
+		self.assertEqual(self.compiler.call_count, 2)
+
+
+	def test_missing_source(self):
+		self.source.unlink()
+		self.compiler.side_effect = lambda: ''
+		self.assertEqual(self.get()[0], '')
+		self.source.write_text('var c = 3;')
+		self.compiler.side_effect = lambda: 'compiled'
+		self.assertEqual(self.get()[0], 'compiled')
@@ -0,0 +1,32 @@
+from unittest import TestCase, mock
+from unittest.mock import MagicMock, PropertyMock
+
+from core.base.model.LazyAliceSkill import LazyAliceSkill
+from core.webui.WidgetManager import WidgetManager
+
+
+class TestWidgetManager(TestCase):
+
+	@mock.patch('core.base.model.LazyAliceSkill.LazyAliceSkill.SkillManager', new_callable=PropertyMock)
+	@mock.patch('core.webui.WidgetManager.WidgetManager.loadPages')
+	@mock.patch('core.webui.WidgetManager.WidgetManager.databaseFetch')
+	@mock.patch('core.webui.WidgetManager.WidgetManager._initDB')
+	@mock.patch('core.webui.WidgetManager.WidgetManager.SkillManager', new_callable=PropertyMock)
+	@mock.patch('core.webui.WidgetManager.WidgetManager.Commons', new_callable=PropertyMock)
+	@mock.patch('core.base.SuperManager.SuperManager')
+	def test_lazy_skills_stay_unloaded(self, _mockSuperManager, mockCommons, mockSkillManager, _mockInitDB, mockFetch, _mockLoadPages, mockLazySkillManager):
+		commons = MagicMock()
+		commons.getFunctionCaller.return_value = 'WidgetManager'
+		commons.rootDir.return_value = '/tmp'
+		mockCommons.return_value = commons
+		mockFetch.return_value = list()
+
+		skillManager = MagicMock()
+		mockSkillManager.return_value = skillManager
+		mockLazySkillManager.return_value = skillManager
+
+		lazy = LazyAliceSkill({'name': 'IntentsOnly', 'version': '1.0.0'}, {'intents': ['hermes/intent/greet']})
+		skillManager.allSkills = {'IntentsOnly': lazy}
+
+		WidgetManager().onStart()
+		skillManager.loadLazySkill.assert_not_called()